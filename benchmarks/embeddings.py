@@ -0,0 +1,45 @@
+"""
+Embedding alignment: re-scoring a known resume against new JDs with and without the vector index.
+
+    python -m benchmarks.embeddings
+
+"cold" embeds every resume line; "memory" and "mmap" reuse stored vectors (in-process LRU,
+then memory-mapped .npy from a fresh index), so only the requirements are embedded.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+
+from benchmarks.resume_index import REQUIREMENTS
+from benchmarks.synthetic import synthetic_resume_text
+from src.app.alignment.embeddings import HashingEmbedder, best_matching_lines
+from src.app.alignment.resume_index import ResumeIndex
+from src.helpers.vector_index import VectorIndex
+
+LINE_COUNTS = (100, 2_000, 20_000)
+QUERIES = [" ".join([r["requirement"], *r["keywords"]]) for r in REQUIREMENTS]
+
+
+def _score(store: VectorIndex, embedder: HashingEmbedder, index: ResumeIndex) -> float:
+    start = time.perf_counter()
+    chunks = store.get_or_embed("resume", lambda: embedder.embed(index.lines))
+    best_matching_lines(embedder.embed(QUERIES), chunks)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    embedder = HashingEmbedder()
+    print(f"{'lines':>6} {'cold ms':>9} {'memory ms':>10} {'mmap ms':>9} {'speedup':>8}")
+    for n in LINE_COUNTS:
+        index = ResumeIndex.build(synthetic_resume_text(n_lines=n))
+        with tempfile.TemporaryDirectory() as d:
+            t_cold = _score(VectorIndex(index_dir=d), embedder, index)
+            store = VectorIndex(index_dir=d)
+            t_mmap = _score(store, embedder, index)  # disk hit
+            t_memory = _score(store, embedder, index)  # LRU hit
+        print(f"{n:>6} {t_cold * 1e3:>9.1f} {t_memory * 1e3:>10.1f} {t_mmap * 1e3:>9.1f} {t_cold / t_mmap:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Local stand-in for the chat completions endpoint that injects latency and errors, so the
+retry / hedging / circuit-breaker layer can be exercised without network access or cost.
+
+    server = FakeOpenAIServer(FaultProfile(rate_limit_rate=0.2)).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    ...
+    server.stop()
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+@dataclass
+class FaultProfile:  # pylint: disable=too-many-instance-attributes
+    latency_seconds: float = 0.02
+    slow_rate: float = 0.0  # share of requests that take slow_latency_seconds instead
+    slow_latency_seconds: float = 1.0
+    rate_limit_rate: float = 0.0  # 429 with Retry-After
+    retry_after_seconds: float = 0.05
+    server_error_rate: float = 0.0  # 500
+    content: str = '{"requirements": []}'
+    prompt_tokens: int = 1200
+    completion_tokens: int = 300
+    seed: int = 0
+
+
+class FakeOpenAIServer:
+    def __init__(self, profile: Optional[FaultProfile] = None) -> None:
+        self.profile = profile or FaultProfile()
+        self.requests = 0
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> FakeOpenAIServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _next_fault(self) -> tuple[float, int]:
+        """(delay, status) for the next request; draws are serialized so runs are reproducible."""
+        p = self.profile
+        with self._lock:
+            self.requests += 1
+            r_status, r_slow = self._rng.random(), self._rng.random()
+        if r_status < p.rate_limit_rate:
+            return 0.0, 429
+        if r_status < p.rate_limit_rate + p.server_error_rate:
+            return p.latency_seconds, 500
+        return (p.slow_latency_seconds if r_slow < p.slow_rate else p.latency_seconds), 200
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+                delay, status = server._next_fault()  # pylint: disable=protected-access
+                time.sleep(delay)
+                p = server.profile
+                if status == 200:
+                    payload = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model", "gpt-4o-mini"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "finish_reason": "stop",
+                                "message": {"role": "assistant", "content": p.content},
+                            }
+                        ],
+                        "usage": {
+                            "prompt_tokens": p.prompt_tokens,
+                            "completion_tokens": p.completion_tokens,
+                            "total_tokens": p.prompt_tokens + p.completion_tokens,
+                        },
+                    }
+                else:
+                    payload = {"error": {"message": f"injected {status}", "type": "fake", "code": None}}
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                if status == 429:
+                    self.send_header("retry-after-ms", str(int(p.retry_after_seconds * 1000)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+                pass
+
+        return Handler
@@ -0,0 +1,91 @@
+"""
+Single-resume heatmap: the previous pyplot path (dpi=220, bbox_inches="tight") vs the Agg
+renderer at full resolution, low-DPI preview, SVG, and a render-cache hit.
+
+    python -m benchmarks.heatmap_render
+"""
+from __future__ import annotations
+
+import time
+from io import BytesIO
+from typing import Callable
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # pylint: disable=wrong-import-position
+
+from benchmarks.resume_index import REQUIREMENTS  # pylint: disable=wrong-import-position
+from benchmarks.synthetic import synthetic_resume_text  # pylint: disable=wrong-import-position
+from src.app.alignment.generate import (  # pylint: disable=wrong-import-position
+    RequirementMatch,
+    score_requirements_against_resume,
+)
+from src.app.alignment.heatmap import (  # pylint: disable=wrong-import-position
+    clear_heatmap_render_cache,
+    render_alignment_heatmap_png,
+    render_alignment_heatmap_svg,
+)
+
+REPEATS = 5
+
+
+def legacy_render(matches: list[RequirementMatch]) -> bytes:
+    labels = [m.requirement for m in matches]
+    fig, ax = plt.subplots(figsize=(8, max(3, 0.45 * len(labels))))
+    im = ax.imshow([[m.strength] for m in matches], aspect="auto")
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(labels, fontsize=9)
+    ax.set_xticks([0])
+    ax.set_xticklabels(["Alignment Strength"], fontsize=10)
+    for i, m in enumerate(matches):
+        ax.text(0, i, f"  {('Missing', 'Partial', 'Strong')[m.strength]}", va="center")
+    cbar = fig.colorbar(im, ax=ax, fraction=0.03, pad=0.02)
+    cbar.set_ticks([0, 1, 2])
+    cbar.set_ticklabels(["Missing", "Partial", "Strong"])
+    ax.set_title("Resume ↔ Job Description Alignment Heatmap", fontsize=12, pad=10)
+    buf = BytesIO()
+    plt.savefig(buf, format="png", bbox_inches="tight", dpi=220)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def _uncached(render: Callable[[list[RequirementMatch]], bytes]) -> Callable[[list[RequirementMatch]], bytes]:
+    def run(matches: list[RequirementMatch]) -> bytes:
+        clear_heatmap_render_cache()
+        return render(matches)
+
+    return run
+
+
+def _best_ms(render: Callable[[list[RequirementMatch]], bytes], matches: list[RequirementMatch]) -> tuple[float, int]:
+    best, size = float("inf"), 0
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        size = len(render(matches))
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3, size
+
+
+def main() -> None:
+    matches = score_requirements_against_resume(REQUIREMENTS, synthetic_resume_text(n_lines=200))
+
+    modes = [
+        ("pyplot dpi=220 tight", legacy_render),
+        ("agg full dpi=220", _uncached(render_alignment_heatmap_png)),
+        ("agg preview dpi=80", _uncached(lambda m: render_alignment_heatmap_png(m, preview=True))),
+        ("agg svg", _uncached(render_alignment_heatmap_svg)),
+        ("render-cache hit", render_alignment_heatmap_png),
+    ]
+    baseline = None
+    print(f"{'mode':<22} {'ms':>8} {'KiB':>7} {'speedup':>8}")
+    for name, render in modes:
+        if name == "render-cache hit":
+            render_alignment_heatmap_png(matches)
+        ms, size = _best_ms(render, matches)
+        baseline = baseline or ms
+        print(f"{name:<22} {ms:>8.2f} {size / 1024:>7.1f} {baseline / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
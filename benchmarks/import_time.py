@@ -0,0 +1,95 @@
+"""
+Start-up import cost of the app modules, measured with `python -X importtime` in a fresh
+interpreter (what a server boot or worker restart pays).
+
+    python -m benchmarks.import_time [--out import_time.json]
+
+"lazy" imports what main.py imports. "eager" also imports openai, matplotlib and pypdf up
+front, which is what the module-level imports used to cost before first use.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Optional, Sequence
+
+APP_MODULES = (
+    "streamlit",
+    "src.app.alignment.generate",
+    "src.app.alignment.heatmap",
+    "src.app.alignment.matrix",
+    "src.app.recruiter_prep.generate",
+    "src.helpers.pdf_extract",
+)
+DEFERRED_MODULES = (
+    "openai",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_agg",
+    "pypdf",
+)
+REPEATS = 5
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(modules: Sequence[str]) -> dict[str, float]:
+    """Total and per-package cumulative import time (ms) of a fresh interpreter importing modules."""
+    code = "; ".join(f"import {m}" for m in modules)
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-benchmark")}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, env=env,
+    )
+
+    total_us = 0
+    per_package: dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m or m.group(3) != " ":  # top-level imports only: their cumulative time includes children
+            continue
+        cumulative_us, name = int(m.group(2)), m.group(4)
+        total_us += cumulative_us
+        package = name.split(".")[0]
+        per_package[package] = per_package.get(package, 0.0) + cumulative_us / 1e3
+    return {"total": total_us / 1e3, **per_package}
+
+
+def best_of(modules: Sequence[str]) -> dict[str, float]:
+    runs = [measure(modules) for _ in range(REPEATS)]
+    return min(runs, key=lambda r: r["total"])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default=None, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    lazy = best_of(APP_MODULES)
+    eager = best_of((*APP_MODULES, *DEFERRED_MODULES))
+    report = {
+        "lazy_ms": round(lazy["total"], 1),
+        "eager_ms": round(eager["total"], 1),
+        "saved_ms": round(eager["total"] - lazy["total"], 1),
+        "deferred_ms": {
+            m.split(".", maxsplit=1)[0]: round(eager.get(m.split(".", maxsplit=1)[0], 0.0), 1)
+            for m in DEFERRED_MODULES
+        },
+        "loaded_at_startup": [m for m in ("openai", "matplotlib", "pypdf") if m in lazy],
+    }
+
+    print(f"{'startup':<8} {'ms':>9}")
+    print(f"{'eager':<8} {report['eager_ms']:>9.1f}")
+    print(f"{'lazy':<8} {report['lazy_ms']:>9.1f}")
+    print(f"saved {report['saved_ms']:.1f} ms; deferred to first use: {report['deferred_ms']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
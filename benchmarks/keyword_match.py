@@ -0,0 +1,67 @@
+"""
+Per-keyword re.search (previous scoring loop) vs the compiled KeywordMatcher.
+
+    python -m benchmarks.keyword_match
+"""
+from __future__ import annotations
+
+import random
+import re
+import time
+
+from benchmarks.synthetic import synthetic_resume_text
+from src.app.alignment.keyword_index import keyword_matcher, normalize_text
+
+KEYWORD_COUNTS = (10, 100, 1000)
+TEXT_SIZES = (1_000, 100_000, 1_000_000)
+
+_VOCAB = (
+    "python sql spark airflow kubernetes docker aws gcp terraform pytorch tensorflow go rust java c++ "
+    "react node graphql kafka redis postgres snowflake dbt looker tableau mlops llm rag nlp ci/cd"
+).split()
+
+
+def synthetic_keywords(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    out: list[str] = []
+    for i in range(n):
+        words = rng.sample(_VOCAB, rng.choice((1, 1, 2)))
+        out.append(" ".join(words) if i < len(_VOCAB) or rng.random() < 0.5 else f"{words[0]}{i}")
+    return out
+
+
+def matched_per_keyword_search(keywords: list[str], resume_norm: str) -> set[str]:
+    hits: set[str] = set()
+    for k in keywords:
+        k_norm = normalize_text(k)
+        pattern = r"\b" + re.escape(k_norm) + r"\b" if " " not in k_norm else re.escape(k_norm)
+        if re.search(pattern, resume_norm):
+            hits.add(k_norm)
+    return hits
+
+
+def matched_compiled(keywords: list[str], resume_norm: str) -> set[str]:
+    return keyword_matcher(keywords).matched(resume_norm)
+
+
+def timed(fn, *args) -> tuple[float, set[str]]:
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+def main() -> None:
+    base_text = normalize_text(synthetic_resume_text(n_lines=20_000))
+    print(f"{'keywords':>8} {'chars':>9} {'re.search ms':>13} {'compiled ms':>12} {'speedup':>8}")
+    for n_kw in KEYWORD_COUNTS:
+        keywords = synthetic_keywords(n_kw)
+        for size in TEXT_SIZES:
+            text = (base_text * (size // len(base_text) + 1))[:size]
+            t_old, old = timed(matched_per_keyword_search, keywords, text)
+            t_new, new = timed(matched_compiled, keywords, text)  # includes first-time compile
+            assert old == new, f"mismatch for {n_kw} keywords / {size} chars"
+            print(f"{n_kw:>8} {size:>9} {t_old * 1e3:>13.1f} {t_new * 1e3:>12.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Shortlist heatmap rendering: a new pyplot figure per render (bbox_inches="tight") vs the
+reused MatrixHeatmapRenderer, as the number of candidates grows.
+
+    python -m benchmarks.matrix_heatmap
+"""
+from __future__ import annotations
+
+import time
+from io import BytesIO
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # pylint: disable=wrong-import-position
+
+from benchmarks.resume_index import REQUIREMENTS  # pylint: disable=wrong-import-position
+from benchmarks.synthetic import synthetic_resume_text  # pylint: disable=wrong-import-position
+from src.app.alignment.heatmap import MatrixHeatmapRenderer  # pylint: disable=wrong-import-position
+from src.app.alignment.matrix import AlignmentMatrix, score_alignment_matrix  # pylint: disable=wrong-import-position
+
+CANDIDATE_COUNTS = (5, 50, 500)
+REPEATS = 3
+
+
+def pyplot_render(matrix: AlignmentMatrix) -> bytes:
+    fig, ax = plt.subplots(figsize=(8, max(3, 0.3 * len(matrix.candidates))))
+    ax.imshow(matrix.scores, aspect="auto", vmin=0.0, vmax=1.0)
+    ax.set_yticks(range(len(matrix.candidates)))
+    ax.set_yticklabels(matrix.candidates, fontsize=8)
+    ax.set_xticks(range(len(matrix.requirements)))
+    ax.set_xticklabels(matrix.requirements, rotation=45, ha="right", fontsize=8)
+    buf = BytesIO()
+    plt.savefig(buf, format="png", bbox_inches="tight", dpi=120)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def _best_ms(fn, matrix: AlignmentMatrix) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(matrix)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    renderer = MatrixHeatmapRenderer()
+    print(f"{'candidates':>10} {'score ms':>9} {'pyplot ms':>10} {'reused ms':>10} {'speedup':>8}")
+    for m in CANDIDATE_COUNTS:
+        resumes = [(f"candidate_{i:03d}", synthetic_resume_text(n_lines=40, seed=i)) for i in range(m)]
+        start = time.perf_counter()
+        matrix = score_alignment_matrix(REQUIREMENTS, resumes).sorted_by_total()
+        t_score = (time.perf_counter() - start) * 1e3
+
+        t_pyplot = _best_ms(pyplot_render, matrix)
+        t_reused = _best_ms(renderer.render_png, matrix)
+        print(f"{m:>10} {t_score:>9.1f} {t_pyplot:>10.1f} {t_reused:>10.1f} {t_pyplot / t_reused:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
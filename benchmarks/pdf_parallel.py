@@ -0,0 +1,36 @@
+"""
+Serial vs process-pool PDF extraction across page counts (no max_chars early exit).
+
+    python -m benchmarks.pdf_parallel
+"""
+from __future__ import annotations
+
+import os
+import time
+
+from benchmarks.synthetic import synthetic_pdf
+from src.helpers.pdf_extract import extract_text_from_pdf
+
+PAGE_COUNTS = (4, 16, 48, 96)
+NO_LIMIT = 10**9
+
+
+def timed(pdf: bytes, *, parallel: bool) -> tuple[float, str]:
+    start = time.perf_counter()
+    out = extract_text_from_pdf(pdf, NO_LIMIT, use_cache=False, parallel=parallel)
+    return time.perf_counter() - start, out
+
+
+def main() -> None:
+    print(f"cpus={os.cpu_count()}")
+    print(f"{'pages':>5} {'serial s':>9} {'parallel s':>11} {'speedup':>8}")
+    for n in PAGE_COUNTS:
+        pdf = synthetic_pdf(n)
+        t_serial, out_serial = timed(pdf, parallel=False)
+        t_parallel, out_parallel = timed(pdf, parallel=True)
+        assert out_serial == out_parallel, f"output mismatch at {n} pages"
+        print(f"{n:>5} {t_serial:>9.2f} {t_parallel:>11.2f} {t_serial / t_parallel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
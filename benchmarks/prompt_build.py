@@ -0,0 +1,86 @@
+"""
+Per-request prompt build time: rebuilding the static fragments on every request (dedent,
+json.dumps of the few-shot example, categories and schema hint) vs the template registry,
+where they are interned once and a request is a single join. Run across thread counts,
+since Streamlit builds prompts from one thread per session.
+
+    python -m benchmarks.prompt_build
+"""
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from benchmarks.synthetic import synthetic_resume_text
+from src.app.alignment.build_prompt import build_extract_requirements_prompts
+from src.app.recruiter_prep.build_prompt import CATEGORIES
+from src.app.recruiter_prep.generate import build_recruiter_prep_prompts
+from src.app.recruiter_prep.prompts.few_shot_example import recruiter_prep_one_item_example
+from src.app.recruiter_prep.prompts.prompt_guardrails import guardrail_system_instructions
+from src.app.recruiter_prep.prompts.system_prompts import SYSTEM_PROMPTS
+
+REQUESTS = 20_000
+THREADS = (1, 4, 16)
+KEY = "few_shot"
+JOB_TITLE = "Data Engineer"
+JOB_DESC = synthetic_resume_text(n_lines=30, seed=99)
+RESUME = synthetic_resume_text(n_lines=80)
+
+# The pre-registry fragment builders, without their memoization.
+_guardrails_uncached = guardrail_system_instructions.__wrapped__
+_example_uncached = recruiter_prep_one_item_example.__wrapped__
+
+
+def _legacy_build() -> tuple[str, str, str, str]:
+    system = (
+        f"{SYSTEM_PROMPTS[KEY]}\n\n{_guardrails_uncached()}\n\n## Example\n"
+        f"{_example_uncached()}\n\n## Required categories\n{json.dumps(list(CATEGORIES), indent=2)}"
+    )
+    user = f"## Context Inputs\n- Job Title: {JOB_TITLE}\n- Job Description: {JOB_DESC}\n\n\"\"\"{RESUME}\"\"\""
+    schema_hint: dict[str, Any] = {
+        "requirements": [{"requirement": "string (short)", "keywords": ["string", "string"]}]
+    }
+    req_user = f"Job Title: {JOB_TITLE}\n\"\"\"{JOB_DESC}\"\"\"\n{json.dumps(schema_hint, indent=2)}"
+    return system, user, "You extract structured hiring requirements.", req_user
+
+
+def _registry_build() -> tuple[str, str, str, str]:
+    system, user = build_recruiter_prep_prompts(
+        system_prompt_key=KEY,
+        job_title=JOB_TITLE,
+        job_desc=JOB_DESC,
+        level="Mid",
+        company_type="Startup",
+        resume_text=RESUME,
+    )
+    req_system, req_user = build_extract_requirements_prompts(job_title=JOB_TITLE, job_desc=JOB_DESC, max_items=10)
+    return system, user, req_system, req_user
+
+
+def _run(build: Callable[[], tuple[str, str, str, str]], threads: int) -> float:
+    """Wall-clock microseconds per request with REQUESTS builds spread over `threads` workers."""
+    per_worker = REQUESTS // threads
+
+    def worker() -> None:
+        for _ in range(per_worker):
+            build()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for f in [pool.submit(worker) for _ in range(threads)]:
+            f.result()
+    return (time.perf_counter() - start) / (per_worker * threads) * 1e6
+
+
+def main() -> None:
+    print(f"{'threads':>7} {'per-request us':>15} {'registry us':>12} {'speedup':>8}")
+    for threads in THREADS:
+        legacy = _run(_legacy_build, threads)
+        registry = _run(_registry_build, threads)
+        print(f"{threads:>7} {legacy:>15.1f} {registry:>12.1f} {legacy / registry:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Prompt strategy fan-out against the local fake server (fixed completion latency): wall time
+for all six SYSTEM_PROMPTS variants run one at a time vs concurrently.
+
+    python -m benchmarks.prompt_eval
+"""
+from __future__ import annotations
+
+import json
+import os
+
+from benchmarks.fake_openai import FakeOpenAIServer, FaultProfile
+from benchmarks.synthetic import synthetic_resume_text
+from src.app.recruiter_prep.build_prompt import CATEGORIES
+from src.app.recruiter_prep.evaluate import comparison_rows, evaluate_prompt_variants, format_markdown_table
+from src.helpers import openai_client
+
+LATENCY_SECONDS = 0.4
+MODELS = ("gpt-4o-mini", "gpt-4.1-nano")
+
+
+def _fake_output() -> str:
+    return json.dumps(
+        {
+            "questions": [
+                {"category": c, "question": "Q?", "intent": "I.", "answer": "A " * 60, "follow_up": "F?"}
+                for c in CATEGORIES
+            ]
+        }
+    )
+
+
+def main() -> None:
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+    server = FakeOpenAIServer(FaultProfile(latency_seconds=LATENCY_SECONDS, content=_fake_output())).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    openai_client.get_client.cache_clear()
+    openai_client.get_client()
+
+    kwargs = {
+        "temperature": 0.7,
+        "job_title": "Data Engineer",
+        "job_desc": synthetic_resume_text(n_lines=20, seed=7),
+        "level": "Mid",
+        "company_type": "Startup",
+        "resume_text": synthetic_resume_text(n_lines=60),
+    }
+    try:
+        print(f"{'models':>6} {'variants':>8} {'parallel':>8} {'wall s':>7} {'back-to-back s':>15}")
+        for models in (MODELS[:1], MODELS):
+            for parallel in (1, 6, 12):
+                run = evaluate_prompt_variants(models=models, max_parallel=parallel, **kwargs)
+                print(
+                    f"{len(models):>6} {len(run.results):>8} {parallel:>8} {run.wall_seconds:>7.2f} "
+                    f"{run.sequential_seconds:>15.2f}"
+                )
+        print()
+        print(format_markdown_table(comparison_rows(run.results)))
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
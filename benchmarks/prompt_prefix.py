@@ -0,0 +1,115 @@
+"""
+Provider prompt caching: how much of each recruiter-prep request is a prefix shared with
+every other request for the same strategy, before and after moving the static segments
+(base prompt, guardrails, few-shot example, categories) ahead of the job and resume.
+
+    python -m benchmarks.prompt_prefix
+
+Token counts are local estimates (tiktoken when installed). The provider caches prefixes of
+at least 1024 tokens in 128-token steps, so this models what a warm cache can bill at the
+cached-input rate. Latency needs live calls and isn't measured here.
+"""
+from __future__ import annotations
+
+import json
+import os
+
+from benchmarks.synthetic import synthetic_resume_text
+from src.app.pricing.calculate import estimate_cost
+from src.app.recruiter_prep.build_prompt import CATEGORIES
+from src.app.recruiter_prep.generate import build_recruiter_prep_prompts
+from src.app.recruiter_prep.prompts.few_shot_example import recruiter_prep_one_item_example
+from src.app.recruiter_prep.prompts.prompt_guardrails import guardrail_system_instructions
+from src.app.recruiter_prep.prompts.system_prompts import SYSTEM_PROMPTS
+from src.helpers.token_count import count_tokens
+
+MODEL = "gpt-4o-mini"
+N_REQUESTS = 5
+COMPLETION_TOKENS = 2_500
+_MIN_CACHED, _CACHE_STEP = 1024, 128
+
+
+def _legacy_prompts(key: str, job_title: str, job_desc: str, resume_text: str) -> tuple[str, str]:
+    """The layout before the static prefix: few-shot and job fields ahead of the categories."""
+    example = ""
+    if key == "few_shot":
+        example = (
+            "\nHere is an example of the expected JSON format and tone (1 item only):\n\n"
+            f"{recruiter_prep_one_item_example()}\n\nUse the same format and style for your output.\n"
+        )
+    user = f"""{example}
+You will generate EXACTLY 10 technical recruiter screen Q&A items.
+
+## Context Inputs
+- Job Title: {job_title}
+- Candidate Level: Mid
+- Company Type: Startup
+- Job Description: {job_desc}
+
+## Resume Evidence (source of truth)
+\"\"\"{resume_text}\"\"\"
+
+## Required categories
+Use each category exactly once, in this exact order:
+{json.dumps(list(CATEGORIES), indent=2)}
+""".strip()
+    return f"{SYSTEM_PROMPTS[key]}\n\n{guardrail_system_instructions()}", user
+
+
+def _current_prompts(key: str, job_title: str, job_desc: str, resume_text: str) -> tuple[str, str]:
+    return build_recruiter_prep_prompts(
+        system_prompt_key=key,
+        job_title=job_title,
+        job_desc=job_desc,
+        level="Mid",
+        company_type="Startup",
+        resume_text=resume_text,
+    )
+
+
+def _serialized(system_prompt: str, user_prompt: str) -> str:
+    return f"system\n{system_prompt}\nuser\n{user_prompt}"
+
+
+def _shared_prefix_tokens(requests: list[str]) -> int:
+    prefix = os.path.commonprefix(requests)
+    return count_tokens(prefix, MODEL)
+
+
+def _billable_cached(shared: int) -> int:
+    return 0 if shared < _MIN_CACHED else shared - (shared - _MIN_CACHED) % _CACHE_STEP
+
+
+def _job_desc(seed: int) -> str:
+    return "\n".join(f"- {line}" for line in synthetic_resume_text(n_lines=50, seed=1_000 + seed).splitlines())
+
+
+def main() -> None:
+    resumes = [synthetic_resume_text(n_lines=80, seed=i) for i in range(N_REQUESTS)]
+    scenarios = {
+        # Different postings: only the static segments can be shared.
+        "new JD each": [(f"Data Engineer {i}", _job_desc(i)) for i in range(N_REQUESTS)],
+        # Several candidates prepped for one posting: the job fields are shared too.
+        "same JD": [("Data Engineer", _job_desc(0))] * N_REQUESTS,
+    }
+
+    print(
+        f"{'scenario':<12} {'strategy':<22} {'layout':<7} {'prompt tok':>10} "
+        f"{'shared tok':>10} {'cacheable':>9} {'$/req warm':>11}"
+    )
+    for scenario, jobs in scenarios.items():
+        for key in SYSTEM_PROMPTS:
+            for label, build in (("legacy", _legacy_prompts), ("prefix", _current_prompts)):
+                requests = [_serialized(*build(key, t, d, r)) for (t, d), r in zip(jobs, resumes)]
+                prompt_tokens = count_tokens(requests[0], MODEL)
+                shared = _shared_prefix_tokens(requests)
+                cached = _billable_cached(shared)
+                cost = estimate_cost(MODEL, prompt_tokens, COMPLETION_TOKENS, cached_prompt_tokens=cached)
+                print(
+                    f"{scenario:<12} {key:<22} {label:<7} {prompt_tokens:>10} {shared:>10} {cached:>9} "
+                    f"{cost.total_cost_usd:>11.6f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Offline end-to-end benchmark: the full pipeline over a synthetic corpus, with recorded
+chat.completions responses replayed in place of call_open_ai (no network, no cost).
+
+    python -m benchmarks.replay [--pairs 24] [--workers 4] [--llm-latency-ms 800] [--out report.json]
+    python -m benchmarks.replay --baseline last_release.json --max-regression 0.25
+
+Per (resume, JD) pair: PDF extraction -> prompt build (requirements + budgeted recruiter prep)
+-> LLM (replayed, with simulated latency) -> parse/validate -> scoring -> heatmap. Reports
+per-stage p50/p95, end-to-end latency, throughput and peak RSS as JSON. With --baseline, stage
+p95s are compared and the exit code is 1 when any stage got slower than --max-regression.
+
+Fixtures live in benchmarks/fixtures/chat_completions.json, one list per request kind. To
+refresh them from the real API (needs OPENAI_API_KEY): python -m benchmarks.replay --record
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+from benchmarks.synthetic import synthetic_pdf, synthetic_resume_text
+from src.app.alignment.build_prompt import build_extract_requirements_prompts
+from src.app.alignment.generate import parse_requirements_content, score_requirements_against_resume
+from src.app.alignment.heatmap import clear_heatmap_render_cache, render_alignment_heatmap_png
+from src.app.pricing.calculate import cost_from_usage
+from src.app.recruiter_prep.generate import build_budgeted_recruiter_prep_prompts
+from src.app.recruiter_prep.repair import parse_recruiter_prep_output
+from src.app.settings import ALIGNMENT_MAX_ITEMS, ALIGNMENT_SCORING_MODES, ALIGNMENT_TEMPERATURE
+from src.helpers.pdf_extract import extract_text_from_pdf
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "chat_completions.json"
+STAGES = ("pdf_extract", "prompt_build", "llm", "parse_validate", "scoring", "heatmap")
+MODEL = "gpt-4o-mini"
+_REQUIREMENTS_SYSTEM_PROMPT = build_extract_requirements_prompts(job_title="", job_desc="", max_items=1)[0]
+
+
+def _kind(system_prompt: str) -> str:
+    return "requirements" if system_prompt == _REQUIREMENTS_SYSTEM_PROMPT else "recruiter_prep"
+
+
+class ReplayLLM:
+    """
+    Stand-in with call_open_ai's signature: returns a recorded ChatCompletion of the matching request kind
+    (picked by a hash of the user prompt, so a pair always gets the same fixture) after a
+    simulated latency drawn from a seeded log-normal around latency_ms.
+    """
+
+    def __init__(self, fixtures: dict[str, list[dict[str, Any]]], latency_ms: float = 0.0, jitter: float = 0.3,
+                 seed: int = 0) -> None:
+        from openai.types.chat import ChatCompletion
+
+        self._fixtures = {k: [ChatCompletion.model_validate(f) for f in v] for k, v in fixtures.items()}
+        self._latency_s = latency_ms / 1e3
+        self._jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, model: str, system_prompt: str, user_prompt: str, temperature: float, **_: Any) -> Any:
+        if self._latency_s > 0:
+            with self._lock:
+                factor = self._rng.lognormvariate(0.0, self._jitter) if self._jitter else 1.0
+            time.sleep(self._latency_s * factor)
+        return self.fixture_for(system_prompt, user_prompt)
+
+    def fixture_for(self, system_prompt: str, user_prompt: str) -> Any:
+        options = self._fixtures[_kind(system_prompt)]
+        digest = hashlib.blake2b(user_prompt.encode("utf-8"), digest_size=4).digest()
+        return options[int.from_bytes(digest, "little") % len(options)]
+
+
+@dataclass(frozen=True)
+class Pair:
+    name: str
+    job_title: str
+    job_desc: str
+    pdf_bytes: bytes
+
+
+def build_corpus(n_pairs: int, seed: int = 0) -> list[Pair]:
+    """Synthetic text PDFs of 1-3 pages against a handful of synthetic JDs."""
+    jds = [("Data Engineer", synthetic_resume_text(n_lines=25, seed=10_000 + seed + i)) for i in range(4)]
+    return [
+        Pair(
+            name=f"resume-{i:03d}",
+            job_title=jds[i % len(jds)][0],
+            job_desc=jds[i % len(jds)][1],
+            pdf_bytes=synthetic_pdf(n_pages=1 + i % 3, seed=seed + i),
+        )
+        for i in range(n_pairs)
+    ]
+
+
+def run_pair(pair: Pair, llm: Any, scoring_mode: str) -> dict[str, float]:
+    """Seconds spent in each stage for one pair, plus "total"."""
+    timings: dict[str, float] = defaultdict(float)
+
+    @contextlib.contextmanager
+    def stage(name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        timings[name] += time.perf_counter() - start
+
+    with stage("pdf_extract"):
+        resume_text = extract_text_from_pdf(pair.pdf_bytes, use_cache=False)
+
+    with stage("prompt_build"):
+        req_system, req_user = build_extract_requirements_prompts(
+            job_title=pair.job_title, job_desc=pair.job_desc, max_items=ALIGNMENT_MAX_ITEMS
+        )
+        prep = build_budgeted_recruiter_prep_prompts(
+            model=MODEL,
+            system_prompt_key="zero_shot_structured",
+            job_title=pair.job_title,
+            job_desc=pair.job_desc,
+            level="Mid",
+            company_type="Startup",
+            resume_text=resume_text,
+        )
+
+    with stage("llm"):
+        req_resp = llm(MODEL, req_system, req_user, ALIGNMENT_TEMPERATURE)
+        prep_resp = llm(MODEL, prep.system_prompt, prep.user_prompt, 0.7)
+
+    with stage("parse_validate"):
+        requirements = parse_requirements_content(req_resp.choices[0].message.content)
+        parse_recruiter_prep_output(prep_resp.choices[0].message.content)
+        cost_from_usage(MODEL, req_resp.usage)
+        cost_from_usage(MODEL, prep_resp.usage)
+
+    with stage("scoring"):
+        matches = score_requirements_against_resume(requirements, resume_text, mode=scoring_mode)
+
+    clear_heatmap_render_cache()  # pairs share requirements; measure a real render, not a cache hit
+    with stage("heatmap"):
+        render_alignment_heatmap_png(matches, preview=True)
+
+    timings["total"] = sum(timings.values())
+    return dict(timings)
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _summary(values: Sequence[float]) -> dict[str, float]:
+    return {
+        "n": len(values),
+        "p50_ms": round(_percentile(values, 0.5) * 1e3, 3),
+        "p95_ms": round(_percentile(values, 0.95) * 1e3, 3),
+        "mean_ms": round(sum(values) / len(values) * 1e3, 3) if values else 0.0,
+        "max_ms": round(max(values) * 1e3, 3) if values else 0.0,
+    }
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)  # bytes on macOS, KiB on Linux
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    *, pairs: int, workers: int, latency_ms: float, jitter: float, scoring_mode: str, seed: int = 0
+) -> dict[str, Any]:
+    corpus = build_corpus(pairs, seed=seed)
+    fixtures = json.loads(FIXTURES_PATH.read_text(encoding="utf-8"))
+    llm = ReplayLLM(fixtures, latency_ms=latency_ms, jitter=jitter, seed=seed)
+
+    run_pair(corpus[0], ReplayLLM(fixtures), scoring_mode)  # warm-up: lazy imports, first figure
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        per_pair = list(pool.map(lambda p: run_pair(p, llm, scoring_mode), corpus))
+    wall = time.perf_counter() - start
+
+    return {
+        "config": {
+            "pairs": pairs,
+            "workers": workers,
+            "llm_latency_ms": latency_ms,
+            "llm_jitter": jitter,
+            "scoring_mode": scoring_mode,
+            "seed": seed,
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "commit": _git_commit()},
+        "stages": {name: _summary([t.get(name, 0.0) for t in per_pair]) for name in STAGES},
+        "end_to_end": _summary([t["total"] for t in per_pair]),
+        "wall_seconds": round(wall, 3),
+        "throughput_pairs_per_sec": round(len(corpus) / wall, 2) if wall else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], max_regression: float, floor_ms: float = 1.0
+) -> list[str]:
+    """Stages whose p95 grew by more than max_regression (ignoring stages under floor_ms in both)."""
+    regressions = []
+    print(f"\n{'stage':<16} {'baseline p95':>13} {'p95':>9} {'change':>8}")
+    for name in (*STAGES, "end_to_end"):
+        old = (baseline["end_to_end"] if name == "end_to_end" else baseline["stages"].get(name, {})).get("p95_ms")
+        new = (report["end_to_end"] if name == "end_to_end" else report["stages"][name])["p95_ms"]
+        if not old:
+            continue
+        change = new / old - 1.0
+        flag = ""
+        if change > max_regression and max(old, new) >= floor_ms:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<16} {old:>13.2f} {new:>9.2f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def record(n_pairs: int) -> None:
+    """Capture real responses for a few corpus pairs into the fixtures file."""
+    from src.helpers.openai_client import call_open_ai
+
+    recorded: dict[str, list[dict[str, Any]]] = {"requirements": [], "recruiter_prep": []}
+
+    def recorder(model: str, system_prompt: str, user_prompt: str, temperature: float, **_: Any) -> Any:
+        resp = call_open_ai(model, system_prompt, user_prompt, temperature, use_cache=False)
+        recorded[_kind(system_prompt)].append(json.loads(resp.model_dump_json()))
+        return resp
+
+    for pair in build_corpus(n_pairs):
+        run_pair(pair, recorder, "keyword")
+    FIXTURES_PATH.write_text(json.dumps(recorded, indent=1) + "\n", encoding="utf-8")
+    print(f"Recorded {sum(len(v) for v in recorded.values())} responses to {FIXTURES_PATH}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline replay benchmark of the full pipeline.")
+    parser.add_argument("--pairs", type=int, default=24, help="(resume, JD) pairs in the corpus")
+    parser.add_argument("--workers", type=int, default=1, help="Pairs processed concurrently")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Median simulated completion latency")
+    parser.add_argument("--llm-jitter", type=float, default=0.3, help="Log-normal sigma of the simulated latency")
+    parser.add_argument("--scoring", default="keyword", choices=ALIGNMENT_SCORING_MODES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Write the report as JSON")
+    parser.add_argument("--baseline", default=None, help="Earlier report to compare stage p95s against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed p95 growth vs the baseline")
+    parser.add_argument("--record", action="store_true", help="Refresh fixtures from the real API instead")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record(n_pairs=2)
+        return 0
+
+    report = run_suite(
+        pairs=args.pairs,
+        workers=args.workers,
+        latency_ms=args.llm_latency_ms,
+        jitter=args.llm_jitter,
+        scoring_mode=args.scoring,
+        seed=args.seed,
+    )
+
+    print(f"{'stage':<16} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for name, s in (*report["stages"].items(), ("end_to_end", report["end_to_end"])):
+        print(f"{name:<16} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['mean_ms']:>9.2f}")
+    print(
+        f"{report['config']['pairs']} pairs in {report['wall_seconds']:.2f}s with {args.workers} worker(s): "
+        f"{report['throughput_pairs_per_sec']:.2f} pairs/sec, peak RSS {report['peak_rss_mb']} MB"
+    )
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.max_regression)
+        if regressions:
+            print(f"p95 regressed beyond {args.max_regression:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+call_open_ai against a local fake server that injects 429s, 500s and slow responses:
+success rate with and without retries, tail latency with and without hedging, and how fast
+an open circuit breaker fails.
+
+    python -m benchmarks.resilience
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_openai import FakeOpenAIServer, FaultProfile
+from src.helpers import openai_client
+from src.helpers.resilience import CircuitOpenError, HedgePolicy, ResilienceConfig, RetryPolicy
+
+MODEL = "gpt-4o-mini"
+CALLS = 200
+CONCURRENCY = 8
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _one_call(i: int) -> tuple[bool, float]:
+    start = time.perf_counter()
+    try:
+        openai_client.call_open_ai(MODEL, "system", f"request {i}", 0.0, use_cache=False)
+        return True, time.perf_counter() - start
+    except Exception:  # pylint: disable=broad-exception-caught
+        return False, time.perf_counter() - start
+
+
+def _run(profile: FaultProfile, config: ResilienceConfig) -> tuple[float, list[float], int, int]:
+    """(success rate, latencies of successful calls, server requests, tokens billed)."""
+    server = FakeOpenAIServer(profile).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    openai_client.get_client.cache_clear()
+    openai_client.get_client()  # import the SDK and build the client before timing
+    openai_client.configure_resilience(config)
+    try:
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+            results = list(pool.map(_one_call, range(CALLS)))
+        time.sleep(profile.slow_latency_seconds)  # let abandoned hedges land in the metrics
+    finally:
+        server.stop()
+    stats = openai_client.llm_call_stats().get(MODEL)
+    tokens = (stats.prompt_tokens + stats.completion_tokens) if stats else 0
+    ok = [lat for success, lat in results if success]
+    return len(ok) / len(results), ok, server.requests, tokens
+
+
+def main() -> None:
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+    openai_client.set_response_cache(None)
+
+    no_retry = ResilienceConfig(retry=RetryPolicy(max_attempts=1))
+    retry = ResilienceConfig(retry=RetryPolicy(max_attempts=4, base_delay=0.05, max_delay=0.5))
+    hedged = ResilienceConfig(retry=retry.retry, hedge=HedgePolicy(enabled=True, min_delay=0.05, min_samples=20))
+
+    flaky = FaultProfile(rate_limit_rate=0.15, server_error_rate=0.10)
+    slow_tail = FaultProfile(slow_rate=0.04, slow_latency_seconds=1.0)
+    scenarios = [
+        ("15% 429 + 10% 500", flaky, "no retries", no_retry),
+        ("15% 429 + 10% 500", flaky, "retries", retry),
+        ("4% slow (1s)", slow_tail, "retries", retry),
+        ("4% slow (1s)", slow_tail, "retries + hedge", hedged),
+    ]
+
+    print(
+        f"{'faults':<20} {'layer':<16} {'success':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'requests':>9} {'tokens':>8}"
+    )
+    for faults, profile, label, config in scenarios:
+        rate, lat, requests, tokens = _run(profile, config)
+        print(
+            f"{faults:<20} {label:<16} {rate:>7.0%} {_percentile(lat, 0.5) * 1e3:>8.0f} "
+            f"{_percentile(lat, 0.95) * 1e3:>8.0f} {_percentile(lat, 0.99) * 1e3:>8.0f} {requests:>9} {tokens:>8}"
+        )
+
+    # Breaker: every request fails; after the threshold the rest fail without a network round trip.
+    server = FakeOpenAIServer(FaultProfile(server_error_rate=1.0, latency_seconds=0.05)).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    openai_client.get_client.cache_clear()
+    openai_client.configure_resilience(ResilienceConfig(retry=RetryPolicy(max_attempts=1)))
+    rejected, start = 0, time.perf_counter()
+    for i in range(50):
+        try:
+            openai_client.call_open_ai(MODEL, "system", f"request {i}", 0.0, use_cache=False)
+        except CircuitOpenError:
+            rejected += 1
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+    server.stop()
+    print(
+        f"\nall-500 server: 50 calls in {time.perf_counter() - start:.2f}s, {server.requests} reached the server, "
+        f"{rejected} rejected by the open breaker ({openai_client.llm_breaker_state(MODEL)})"
+    )
+    openai_client.configure_resilience()
+
+
+if __name__ == "__main__":
+    main()
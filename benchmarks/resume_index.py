@@ -0,0 +1,91 @@
+"""
+Scoring + evidence lookup: previous per-requirement line rescans vs a shared ResumeIndex.
+
+    python -m benchmarks.resume_index
+"""
+from __future__ import annotations
+
+import re
+import time
+from typing import Any
+
+from benchmarks.synthetic import synthetic_resume_text
+from src.app.alignment.generate import score_requirements_against_resume
+from src.app.alignment.resume_index import ResumeIndex
+
+LINE_COUNTS = (100, 2_000, 20_000)
+
+REQUIREMENTS: list[dict[str, Any]] = [
+    {"requirement": f"Requirement {i}", "keywords": kws}
+    for i, kws in enumerate(
+        [
+            ["python", "sql"], ["kubernetes", "docker"], ["aws", "gcp"], ["terraform"],
+            ["pytorch", "tensorflow"], ["airflow", "spark"], ["dashboards", "metrics"],
+            ["mentored", "ownership"], ["golang", "rust"], ["graphql"], ["kafka", "redis"],
+            ["snowflake", "dbt"], ["reduced latency", "monitoring"],
+        ]
+    )
+]
+
+
+def legacy_normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def legacy_snippet(resume_text: str, hit_keywords: list[str], max_len: int = 180) -> str:
+    lines = [ln.strip() for ln in resume_text.splitlines() if ln.strip()]
+    hit_lower = [legacy_normalize(k) for k in hit_keywords]
+    for ln in lines:
+        if any(k in legacy_normalize(ln) for k in hit_lower):
+            return (ln[:max_len] + "…") if len(ln) > max_len else ln
+    text = resume_text.strip().replace("\n", " ")
+    if not text:
+        return "Not specified in resume"
+    return (text[:max_len] + "…") if len(text) > max_len else text
+
+
+def legacy_score(requirements: list[dict[str, Any]], resume_text: str) -> list[tuple[str, int, str]]:
+    resume_norm = legacy_normalize(resume_text)
+    out = []
+    for r in requirements:
+        req = str(r.get("requirement", "")).strip()
+        keywords = [str(k).strip() for k in r.get("keywords", []) if str(k).strip()]
+        if not req or not keywords:
+            continue
+        hits = []
+        for k in keywords:
+            k_norm = legacy_normalize(k)
+            pattern = r"\b" + re.escape(k_norm) + r"\b" if " " not in k_norm else re.escape(k_norm)
+            if re.search(pattern, resume_norm):
+                hits.append(k)
+        strength = 2 if len(hits) >= 2 else 1 if len(hits) == 1 else 0
+        out.append((req, strength, legacy_snippet(resume_text, hits) if hits else "Not specified in resume"))
+    return out
+
+
+def indexed_score(requirements: list[dict[str, Any]], resume_text: str) -> list[tuple[str, int, str]]:
+    index = ResumeIndex.build(resume_text)  # uncached, so build cost is included
+    matches = score_requirements_against_resume(requirements, resume_text, index=index)
+    return [(m.requirement, m.strength, m.evidence_snippet) for m in matches]
+
+
+def main() -> None:
+    print(f"{'lines':>6} {'legacy ms':>10} {'indexed ms':>11} {'speedup':>8}")
+    for n in LINE_COUNTS:
+        # Put the rarer hits at the end so the legacy scan walks most of the resume.
+        text = (
+            synthetic_resume_text(n_lines=n)
+            + "\nAlso wrote Golang services with Rust tooling, GraphQL APIs, Kafka and Snowflake/dbt."
+        )
+        start = time.perf_counter()
+        old = legacy_score(REQUIREMENTS, text)
+        t_old = time.perf_counter() - start
+        start = time.perf_counter()
+        new = indexed_score(REQUIREMENTS, text)
+        t_new = time.perf_counter() - start
+        assert old == new, f"mismatch at {n} lines"
+        print(f"{n:>6} {t_old * 1e3:>10.1f} {t_new * 1e3:>11.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import io
+import random
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+_WORDS = (
+    "python sql spark airflow kubernetes docker aws gcp terraform pytorch tensorflow "
+    "pipelines stakeholders shipped reduced latency improved revenue mentored designed "
+    "built scaled migrated automated dashboards experimentation metrics onboarding "
+    "collaborated cross-functional ownership reliability monitoring api services"
+).split()
+
+
+def synthetic_resume_lines(n_lines: int, seed: int = 0, words_per_line: int = 12) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "- " + " ".join(rng.choice(_WORDS) for _ in range(words_per_line)).capitalize()
+        for _ in range(n_lines)
+    ]
+
+
+def synthetic_resume_text(n_lines: int = 60, seed: int = 0) -> str:
+    return "\n".join(synthetic_resume_lines(n_lines, seed=seed))
+
+
+def synthetic_pdf(n_pages: int, lines_per_page: int = 40, seed: int = 0) -> bytes:
+    """Build a text-selectable PDF with matplotlib (no extra dependencies)."""
+    buf = io.BytesIO()
+    with PdfPages(buf) as pdf:
+        for p in range(n_pages):
+            fig = Figure(figsize=(8.5, 11))
+            lines = synthetic_resume_lines(lines_per_page, seed=seed * 10_000 + p)
+            for i, line in enumerate(lines):
+                fig.text(0.05, 0.97 - i * (0.94 / lines_per_page), line, fontsize=7)
+            pdf.savefig(fig)
+    return buf.getvalue()
@@ -1,20 +1,43 @@
 from __future__ import annotations
 
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Optional
+
 import streamlit as st
 
 from src.app.alignment.generate import (
-    extract_requirements_from_jd,
-    render_alignment_heatmap_png,
+    RequirementMatch,
+    extract_requirements_with_cost,
     score_requirements_against_resume,
 )
-from src.app.recruiter_prep.generate import generate_recruiter_prep
+from src.app.alignment.heatmap import (
+    render_alignment_heatmap_png,
+    render_alignment_heatmap_svg,
+    render_alignment_matrix_png,
+)
+from src.app.alignment.matrix import AlignmentMatrix, score_alignment_matrix
+from src.app.pricing.calculate import CostBreakdown, combine_costs
+from src.app.recruiter_prep.generate import (
+    GenerationResult,
+    generate_recruiter_prep,
+    stream_recruiter_prep,
+)
+from src.app.recruiter_prep.regenerate import ItemRegeneration, regenerate_recruiter_prep_item
+from src.app.recruiter_prep.evaluate import VariantResult, comparison_rows, iter_prompt_variants, sort_results
+from src.app.recruiter_prep.prompt_budget import PromptBudgetReport
+from src.app.recruiter_prep.schema import QAItem
 from src.helpers.pdf_extract import extract_text_from_pdf
+from src.helpers.tracing import Timings, collect_timings
 from src.app.settings import (
     ALLOWED_MODELS,
     ALLOWED_LEVELS,
     ALLOWED_COMPANY_TYPES,
     ALIGNMENT_TEMPERATURE,
     ALIGNMENT_MAX_ITEMS,
+    ALIGNMENT_SCORING_MODES,
 )
 from src.app.validation import validate_user_inputs_or_raise
 from src.app.recruiter_prep.prompts.system_prompts import SYSTEM_PROMPTS
@@ -22,6 +45,31 @@ from src.app.recruiter_prep.prompts.system_prompts import SYSTEM_PROMPTS
 # -----------------------------
 # Helpers
 # -----------------------------
+@dataclass(frozen=True)
+class AlignmentRun:
+    matches: list[RequirementMatch]
+    heatmap_png: bytes
+    cost: CostBreakdown
+
+
+@dataclass(frozen=True)
+class ShortlistRun:
+    matrix: AlignmentMatrix
+    heatmap_png: bytes
+    cost: CostBreakdown
+
+
+# The last Recruiter Q&As run is kept in session state so single items can be regenerated.
+LAST_GENERATION_KEY = "last_generation"
+
+
+@dataclass(frozen=True)
+class StoredGeneration:
+    result: GenerationResult
+    inputs: dict[str, Any]  # generate_recruiter_prep arguments of the original run
+    last_regeneration: Optional[ItemRegeneration] = None
+
+
 def validate_inputs_or_stop(
     *,
     job_title: str,
@@ -77,28 +125,134 @@ def get_resume_text_or_stop(resume_file) -> str:
             st.stop()
 
 
-def run_alignment(
-    *, model: str, job_title: str, job_description: str, resume_text: str
-) -> None:
-    with st.status("Generating alignment heatmap…", expanded=True) as status:
-        try:
-            requirements = extract_requirements_from_jd(
-                model=model,
-                temperature=ALIGNMENT_TEMPERATURE,
-                job_title=job_title,
-                job_desc=job_description,
-                max_items=ALIGNMENT_MAX_ITEMS,
-            )
-            matches = score_requirements_against_resume(requirements, resume_text)
-            heatmap_png = render_alignment_heatmap_png(matches)
-            status.update(label="Alignment done!", state="complete")
-        except Exception as e:
-            status.update(label="Alignment failed.", state="error")
-            st.exception(e)
+def get_resume_texts_or_stop(resume_files) -> list[tuple[str, str]]:
+    resumes: list[tuple[str, str]] = []
+    with st.status(f"Extracting {len(resume_files)} resumes…", expanded=False) as status:
+        for f in resume_files:
+            try:
+                text = extract_text_from_pdf(f.read())
+            except Exception as e:
+                st.warning(f"Skipping {f.name}: {e}")
+                continue
+            if not text.strip():
+                st.warning(f"Skipping {f.name}: no extractable text.")
+                continue
+            resumes.append((f.name, text))
+        if not resumes:
+            status.update(label="Resume extraction failed.", state="error")
+            st.error("Could not extract text from any of the PDFs.")
             st.stop()
+        status.update(label=f"{len(resumes)} resumes extracted.", state="complete")
+    return resumes
+
+
+def cost_caption(cost: CostBreakdown) -> str:
+    return (
+        f"Estimated API cost: ${cost.total_cost_usd:.6f} "
+        f"(input ${cost.input_cost_usd:.6f} + output ${cost.output_cost_usd:.6f}) • "
+        f"Tokens: prompt {cost.prompt_tokens}, completion {cost.completion_tokens}"
+        + (f" • Served from cache (saved ${cost.saved_cost_usd:.6f})" if cost.saved_cost_usd else "")
+        + (
+            f" • Prompt cache: {cost.cached_prompt_tokens} tokens (saved ${cost.prompt_cache_saved_usd:.6f})"
+            if cost.cached_prompt_tokens
+            else ""
+        )
+    )
+
+
+def _duration(seconds: float) -> str:
+    return f"{seconds:.2f}s" if seconds >= 1 else f"{seconds * 1000:.0f}ms"
+
+
+def timing_caption(timings: Optional[Timings]) -> str:
+    """Self time per pipeline stage (nested stages are not double-counted), plus wall time."""
+    if timings is None:
+        return ""
+    stages = [f"{t.name} {_duration(t.self_seconds)}" for t in timings.breakdown() if t.self_seconds >= 0.0005]
+    return "Timing: " + " • ".join(stages + [f"wall {_duration(timings.wall_seconds)}"])
+
+
+def repair_caption(result: GenerationResult) -> str:
+    parts = []
+    if result.repaired:
+        parts.append(f"Re-requested {len(result.repaired)} missing or invalid item(s): {', '.join(result.repaired)}")
+    if result.missing:
+        parts.append(f"Still missing: {', '.join(result.missing)}")
+    return " • ".join(parts)
+
+
+def regeneration_caption(regen: ItemRegeneration) -> str:
+    cost = regen.cost
+    return (
+        f"Regenerated “{regen.item.category}”: ${cost.total_cost_usd:.6f} "
+        f"(prompt {cost.prompt_tokens} tokens, {cost.cached_prompt_tokens} from prompt cache; "
+        f"completion {cost.completion_tokens}) vs ~${regen.full_run_cost.total_cost_usd:.6f} "
+        f"for all ten • saved ~${regen.saved_usd:.6f}"
+    )
+
+
+def budget_caption(report: Optional[PromptBudgetReport]) -> str:
+    if report is None:
+        return ""
+    parts = [
+        f"Prompt: ~{report.prompt_tokens} tokens (budget {report.budget_tokens}), "
+        f"pre-send estimate ${report.estimated_cost.total_cost_usd:.6f}"
+    ]
+    if report.resume_compressed:
+        parts.append(
+            f"resume compressed {report.resume_tokens_before} → {report.resume_tokens_after} tokens "
+            f"({report.sections_kept}/{report.sections_total} sections kept)"
+        )
+    if report.jd_truncated:
+        parts.append("job description truncated")
+    return " • ".join(parts)
+
+
+def compute_alignment(
+    *,
+    model: str,
+    job_title: str,
+    job_description: str,
+    resume_text: str,
+    scoring_mode: str = "keyword",
+) -> AlignmentRun:
+    extracted = extract_requirements_with_cost(
+        model=model,
+        temperature=ALIGNMENT_TEMPERATURE,
+        job_title=job_title,
+        job_desc=job_description,
+        max_items=ALIGNMENT_MAX_ITEMS,
+    )
+    matches = score_requirements_against_resume(
+        extracted.requirements, resume_text, mode=scoring_mode
+    )
+    # Inline preview only; full-resolution PNG and SVG are rendered when downloaded.
+    heatmap_png = render_alignment_heatmap_png(matches, preview=True)
+    return AlignmentRun(matches=matches, heatmap_png=heatmap_png, cost=extracted.cost)
 
+
+def render_alignment(alignment: AlignmentRun) -> None:
     st.subheader("Resume ↔ Job Description Alignment")
-    st.image(heatmap_png, use_container_width=True)
+    st.image(alignment.heatmap_png, use_container_width=True)
+
+    matches = alignment.matches
+    col_png, col_svg = st.columns(2)
+    with col_png:
+        st.download_button(
+            "Download heatmap (PNG, full resolution)",
+            data=lambda: render_alignment_heatmap_png(matches),
+            file_name="alignment_heatmap.png",
+            mime="image/png",
+            on_click="ignore",
+        )
+    with col_svg:
+        st.download_button(
+            "Download heatmap (SVG)",
+            data=lambda: render_alignment_heatmap_svg(matches),
+            file_name="alignment_heatmap.svg",
+            mime="image/svg+xml",
+            on_click="ignore",
+        )
 
     rows = [
         {
@@ -111,13 +265,139 @@ def run_alignment(
             ),
             "Evidence": m.evidence_snippet,
         }
-        for m in matches
+        for m in alignment.matches
     ]
 
     st.markdown("### Evidence table")
     st.dataframe(rows, width="stretch")
 
 
+def compute_shortlist(
+    *,
+    model: str,
+    job_title: str,
+    job_description: str,
+    resumes: list[tuple[str, str]],
+    scoring_mode: str = "keyword",
+    order: str = "Total score",
+) -> ShortlistRun:
+    extracted = extract_requirements_with_cost(
+        model=model,
+        temperature=ALIGNMENT_TEMPERATURE,
+        job_title=job_title,
+        job_desc=job_description,
+        max_items=ALIGNMENT_MAX_ITEMS,
+    )
+    matrix = score_alignment_matrix(extracted.requirements, resumes, mode=scoring_mode)
+    matrix = matrix.clustered() if order == "Cluster similar profiles" else matrix.sorted_by_total()
+    return ShortlistRun(matrix=matrix, heatmap_png=render_alignment_matrix_png(matrix), cost=extracted.cost)
+
+
+def render_shortlist(shortlist: ShortlistRun) -> None:
+    matrix = shortlist.matrix
+    st.subheader("Shortlist ↔ Job Description Alignment")
+    st.caption(cost_caption(shortlist.cost))
+    st.image(shortlist.heatmap_png, use_container_width=True)
+
+    rows = [
+        {
+            "Candidate": name,
+            "Total score": round(float(total), 2),
+            "Coverage": f"{coverage:.0%}",
+            "Strong": int((strengths == 2).sum()),
+            "Partial": int((strengths == 1).sum()),
+            "Missing": int((strengths == 0).sum()),
+        }
+        for name, total, coverage, strengths in zip(
+            matrix.candidates, matrix.totals, matrix.coverage, matrix.strengths
+        )
+    ]
+    st.markdown("### Candidates")
+    st.dataframe(rows, width="stretch")
+
+
+def run_shortlist(
+    *,
+    model: str,
+    job_title: str,
+    job_description: str,
+    resumes: list[tuple[str, str]],
+    scoring_mode: str = "keyword",
+    order: str = "Total score",
+) -> None:
+    with st.status(f"Scoring {len(resumes)} resumes…", expanded=True) as status:
+        try:
+            shortlist = compute_shortlist(
+                model=model,
+                job_title=job_title,
+                job_description=job_description,
+                resumes=resumes,
+                scoring_mode=scoring_mode,
+                order=order,
+            )
+            status.update(label="Shortlist scored!", state="complete")
+        except Exception as e:
+            status.update(label="Shortlist scoring failed.", state="error")
+            st.exception(e)
+            st.stop()
+
+    render_shortlist(shortlist)
+
+
+def render_qa_item(i: int, item: QAItem, cost: Optional[CostBreakdown] = None) -> None:
+    header = f"{i}. {item.category}: {item.question}"
+    with st.expander(header, expanded=(i == 1)):
+        st.markdown(f"**Intent:** {item.intent}")
+        st.markdown(f"**Recruiter-ready answer:** {item.answer}")
+        st.markdown(f"**Follow-up probe:** {item.follow_up}")
+        if cost is not None:
+            st.caption(
+                f"Tokens: prompt ~{cost.prompt_tokens}, completion ~{cost.completion_tokens} • "
+                f"${cost.total_cost_usd:.6f}"
+            )
+
+
+def render_generation(result: GenerationResult) -> None:
+    st.subheader("Results")
+    st.caption(cost_caption(result.cost))
+    if result.budget is not None:
+        st.caption(budget_caption(result.budget))
+    if result.repaired or result.missing:
+        st.caption(repair_caption(result))
+
+    for i, item in enumerate(result.output.questions, start=1):
+        render_qa_item(i, item, result.item_costs.get(item.category))
+
+
+def run_alignment(
+    *,
+    model: str,
+    job_title: str,
+    job_description: str,
+    resume_text: str,
+    scoring_mode: str = "keyword",
+    timings: Optional[Timings] = None,
+) -> None:
+    with st.status("Generating alignment heatmap…", expanded=True) as status:
+        try:
+            alignment = compute_alignment(
+                model=model,
+                job_title=job_title,
+                job_description=job_description,
+                resume_text=resume_text,
+                scoring_mode=scoring_mode,
+            )
+            status.update(label="Alignment done!", state="complete")
+        except Exception as e:
+            status.update(label="Alignment failed.", state="error")
+            st.exception(e)
+            st.stop()
+
+    render_alignment(alignment)
+    if timings is not None:
+        st.caption(timing_caption(timings))
+
+
 def run_generation(
     *,
     model: str,
@@ -128,10 +408,17 @@ def run_generation(
     level: str,
     company_type: str,
     resume_text: str,
+    timings: Optional[Timings] = None,
 ) -> None:
-    with st.status("Generating recruiter Q&As…", expanded=True) as status:
+    status_slot = st.container()
+    st.subheader("Results")
+    caption_slot = st.empty()
+    items_slot = st.container()
+
+    # Items are rendered as the model streams them, instead of after the full completion.
+    with status_slot, st.status("Generating recruiter Q&As…", expanded=False) as status:
         try:
-            result = generate_recruiter_prep(
+            stream = stream_recruiter_prep(
                 model=model,
                 system_prompt_key=prompt_key,
                 temperature=temperature,
@@ -141,28 +428,203 @@ def run_generation(
                 company_type=company_type,
                 resume_text=resume_text,
             )
+            caption_slot.caption(budget_caption(stream.budget))
+            for i, item in enumerate(stream, start=1):
+                with items_slot:
+                    render_qa_item(i, item)
+                status.update(label=f"Generating recruiter Q&As… ({i} ready)")
             status.update(label="Done!", state="complete")
         except Exception as e:
             status.update(label="Generation failed.", state="error")
             st.exception(e)
             st.stop()
 
-    prep = result.output
-    cost = result.cost
+    caption_slot.caption(
+        cost_caption(stream.result.cost)
+        + (f"  \n{budget_caption(stream.budget)}" if stream.budget else "")
+        + (f"  \n{repair_caption(stream.result)}" if stream.result.repaired or stream.result.missing else "")
+        + (f"  \n{timing_caption(timings)}" if timings is not None else "")
+    )
+    st.session_state[LAST_GENERATION_KEY] = StoredGeneration(
+        result=stream.result,
+        inputs={
+            "model": model,
+            "system_prompt_key": prompt_key,
+            "temperature": temperature,
+            "job_title": job_title,
+            "job_desc": job_description,
+            "level": level,
+            "company_type": company_type,
+            "resume_text": resume_text,
+        },
+    )
 
-    st.subheader("Results")
+
+def run_regenerate_panel(*, show_results: bool = True) -> None:
+    """
+    Regenerate one category of the stored run and merge it in. Results are drawn above the
+    controls, after a click is handled, so they show the merged output.
+    """
+    stored: Optional[StoredGeneration] = st.session_state.get(LAST_GENERATION_KEY)
+    if stored is None:
+        return
+
+    results_slot = st.container()
+    col_category, col_button = st.columns([3, 1], vertical_alignment="bottom")
+    category = col_category.selectbox(
+        "Regenerate one answer",
+        options=[q.category for q in stored.result.output.questions] + list(stored.result.missing),
+        help="Re-asks only this category, keeping the other answers. Costs about a tenth of a full run.",
+    )
+    if col_button.button("Regenerate", width="stretch"):
+        with st.spinner(f"Regenerating {category}…"):
+            try:
+                regen = regenerate_recruiter_prep_item(previous=stored.result, category=category, **stored.inputs)
+            except Exception as e:
+                st.exception(e)
+            else:
+                stored = StoredGeneration(result=regen.result, inputs=stored.inputs, last_regeneration=regen)
+                st.session_state[LAST_GENERATION_KEY] = stored
+                show_results = True
+
+    if show_results:
+        with results_slot:
+            render_generation(stored.result)
+            if stored.last_regeneration is not None:
+                st.caption(regeneration_caption(stored.last_regeneration))
+
+
+def run_both(
+    *,
+    model: str,
+    prompt_key: str,
+    temperature: float,
+    job_title: str,
+    job_description: str,
+    level: str,
+    company_type: str,
+    resume_text: str,
+    scoring_mode: str = "keyword",
+    timings: Optional[Timings] = None,
+) -> None:
+    """
+    Start both LLM round-trips at once and render each section as soon as it lands,
+    so wall time is roughly the slower of the two rather than their sum.
+    """
+    status_slot = st.container()
+    total_slot = st.empty()
+    # Fixed slots keep the page order stable regardless of which call finishes first.
+    alignment_slot = st.container()
+    generation_slot = st.container()
+
+    with status_slot, st.status("Generating alignment and recruiter Q&As…", expanded=True) as status:
+        # Worker threads only do the I/O + compute; all st.* calls stay on the script thread.
+        # Each runs in a copy of this context so its timing spans are collected.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = {
+                pool.submit(
+                    contextvars.copy_context().run,
+                    compute_alignment,
+                    model=model,
+                    job_title=job_title,
+                    job_description=job_description,
+                    resume_text=resume_text,
+                    scoring_mode=scoring_mode,
+                ): "alignment",
+                pool.submit(
+                    contextvars.copy_context().run,
+                    generate_recruiter_prep,
+                    model=model,
+                    system_prompt_key=prompt_key,
+                    temperature=temperature,
+                    job_title=job_title,
+                    job_desc=job_description,
+                    level=level,
+                    company_type=company_type,
+                    resume_text=resume_text,
+                ): "generation",
+            }
+
+            costs: list[CostBreakdown] = []
+            for fut in as_completed(futures):
+                kind = futures[fut]
+                try:
+                    value = fut.result()
+                except Exception as e:
+                    status.update(label=f"{kind.capitalize()} failed.", state="error")
+                    st.exception(e)
+                    st.stop()
+
+                costs.append(value.cost)
+                if kind == "alignment":
+                    with alignment_slot:
+                        render_alignment(value)
+                    status.update(label="Alignment done, waiting for recruiter Q&As…")
+                else:
+                    with generation_slot:
+                        render_generation(value)
+                    status.update(label="Recruiter Q&As done, waiting for alignment…")
+
+        status.update(label="Done!", state="complete", expanded=False)
+
+    total_slot.caption(
+        "Combined: "
+        + cost_caption(combine_costs(costs))
+        + (f"  \n{timing_caption(timings)}" if timings is not None else "")
+    )
+
+
+def run_prompt_comparison(
+    *,
+    models: list[str],
+    temperature: float,
+    job_title: str,
+    job_description: str,
+    level: str,
+    company_type: str,
+    resume_text: str,
+) -> None:
+    """Every prompt strategy on every selected model at once; the table fills in as variants land."""
+    n_variants = len(models) * len(SYSTEM_PROMPTS)
+    table_slot = st.empty()
+    results: list[VariantResult] = []
+
+    with st.status(f"Running {n_variants} prompt variants…", expanded=True) as status:
+        start = time.perf_counter()
+        for result in iter_prompt_variants(
+            models=models,
+            temperature=temperature,
+            job_title=job_title,
+            job_desc=job_description,
+            level=level,
+            company_type=company_type,
+            resume_text=resume_text,
+        ):
+            results.append(result)
+            table_slot.dataframe(comparison_rows(results), width="stretch", hide_index=True)
+            status.update(label=f"{len(results)}/{n_variants} variants done…")
+        wall = time.perf_counter() - start
+        failed = sum(1 for r in results if r.error)
+        status.update(
+            label=f"{n_variants} variants in {wall:.1f}s ({failed} failed)",
+            state="error" if failed == n_variants else "complete",
+            expanded=False,
+        )
+
+    back_to_back = sum(r.latency_seconds for r in results)
     st.caption(
-        f"Estimated API cost: ${cost.total_cost_usd:.6f} "
-        f"(input ${cost.input_cost_usd:.6f} + output ${cost.output_cost_usd:.6f}) • "
-        f"Tokens: prompt {cost.prompt_tokens}, completion {cost.completion_tokens}"
+        f"Wall time {wall:.1f}s vs {back_to_back:.1f}s back to back • Combined: "
+        + cost_caption(combine_costs([r.cost for r in results if r.cost is not None]))
     )
 
-    for i, item in enumerate(prep.questions, start=1):
-        header = f"{i}. {item.category}: {item.question}"
-        with st.expander(header, expanded=(i == 1)):
-            st.markdown(f"**Intent:** {item.intent}")
-            st.markdown(f"**Recruiter-ready answer:** {item.answer}")
-            st.markdown(f"**Follow-up probe:** {item.follow_up}")
+    ordered = sort_results(results)
+    tabs = st.tabs([f"{r.model} · {r.system_prompt_key}" for r in ordered])
+    for tab, variant in zip(tabs, ordered):
+        with tab:
+            if variant.result is None:
+                st.error(variant.error)
+            else:
+                render_generation(variant.result)
 
 
 # -----------------------------
@@ -213,7 +675,13 @@ with st.sidebar:
     st.header("Mode")
     mode = st.radio(
         "Choose what to generate",
-        options=["Recruiter Q&As", "Resume ↔ Job Description Alignment"],
+        options=[
+            "Recruiter Q&As",
+            "Resume ↔ Job Description Alignment",
+            "Both",
+            "Shortlist Comparison",
+            "Prompt Strategy Comparison",
+        ],
         index=0,
         label_visibility="collapsed",
     )
@@ -229,7 +697,19 @@ with st.sidebar:
         help="Choose the OpenAI model used for the selected mode.",
     )
 
-    if mode == "Recruiter Q&As":
+    compare_models = [model]
+    if mode == "Prompt Strategy Comparison":
+        compare_models = st.multiselect(
+            "Compare on models",
+            options=list(ALLOWED_MODELS),
+            default=[model],
+            help="Every system prompt strategy runs on each selected model, concurrently.",
+        )
+
+    # Alignment-only modes keep these defaults, so validation can run without branching.
+    temperature = ALIGNMENT_TEMPERATURE
+    prompt_key = list(SYSTEM_PROMPTS.keys())[0]
+    if mode in ("Recruiter Q&As", "Both", "Prompt Strategy Comparison"):
         temperature = st.slider(
             "Creativity (temperature)",
             min_value=0.0,
@@ -239,13 +719,20 @@ with st.sidebar:
             help="Higher = more creative variation. Lower = more consistent.",
         )
 
-        prompt_key = st.selectbox(
-            "System prompt strategy",
-            options=list(SYSTEM_PROMPTS.keys()),
-            index=0,
-            help="Internal prompt variants for experimentation/evaluation.",
+        if mode != "Prompt Strategy Comparison":
+            prompt_key = st.selectbox(
+                "System prompt strategy",
+                options=list(SYSTEM_PROMPTS.keys()),
+                index=0,
+                help="Internal prompt variants for experimentation/evaluation.",
+            )
+
+    if mode == "Both":
+        st.caption(
+            f"Alignment uses fixed settings: temperature `{ALIGNMENT_TEMPERATURE}`, "
+            f"max `{ALIGNMENT_MAX_ITEMS}` requirements."
         )
-    else:
+    elif mode not in ("Recruiter Q&As", "Prompt Strategy Comparison"):
         # Alignment settings shown as fixed values (not editable)
         st.subheader("Alignment Settings")
         st.markdown(
@@ -253,9 +740,26 @@ with st.sidebar:
             f"- **Max requirements extracted:** `{ALIGNMENT_MAX_ITEMS}`"
         )
         st.caption("These are fixed for stability and consistent results.")
-        # Keep these defined so validation can still run without branching complexity
-        temperature = ALIGNMENT_TEMPERATURE
-        prompt_key = list(SYSTEM_PROMPTS.keys())[0]
+
+    scoring_mode = "keyword"
+    if mode not in ("Recruiter Q&As", "Prompt Strategy Comparison"):
+        scoring_mode = st.selectbox(
+            "Alignment scoring",
+            options=list(ALIGNMENT_SCORING_MODES),
+            index=0,
+            help="keyword: exact keyword hits (Missing/Partial/Strong). "
+            "bm25: offline relevance ranking over resume lines; also catches partial phrasing. "
+            "embedding: local vector similarity, catches paraphrases; resume vectors are reused across JDs.",
+        )
+
+    matrix_order = "Total score"
+    if mode == "Shortlist Comparison":
+        matrix_order = st.radio(
+            "Heatmap order",
+            options=["Total score", "Cluster similar profiles"],
+            index=0,
+            help="Cluster places candidates (and requirements) with similar match patterns next to each other.",
+        )
 
     st.divider()
     st.markdown("**Security**")
@@ -296,10 +800,11 @@ with col_left:
 
 with col_right:
     st.subheader("Resume Upload")
+    shortlist_mode = mode == "Shortlist Comparison"
     resume_file = st.file_uploader(
-        "Upload Resume (PDF)",
+        "Upload Resumes (PDF)" if shortlist_mode else "Upload Resume (PDF)",
         type=["pdf"],
-        accept_multiple_files=False,
+        accept_multiple_files=shortlist_mode,
         help="We extract text from your PDF and use it as the source of truth.",
     )
 
@@ -314,14 +819,39 @@ with col_right:
 # -----------------------------
 st.divider()
 
-primary_label = (
-    "Generate 10 Recruiter Q&As"
-    if mode == "Recruiter Q&As"
-    else "Generate Resume ↔ Job Description Alignment Heatmap"
-)
+primary_label = {
+    "Recruiter Q&As": "Generate 10 Recruiter Q&As",
+    "Resume ↔ Job Description Alignment": "Generate Resume ↔ Job Description Alignment Heatmap",
+    "Both": "Generate Recruiter Q&As + Alignment Heatmap",
+    "Shortlist Comparison": "Compare Shortlist Against Job Description",
+    "Prompt Strategy Comparison": "Compare All Prompt Strategies",
+}[mode]
 run_clicked = st.button(primary_label, type="primary", use_container_width=True)
 
-if run_clicked:
+if run_clicked and shortlist_mode:
+    if not resume_file:
+        st.error("Please upload at least one resume PDF.")
+        st.stop()
+    for f in resume_file:
+        validate_inputs_or_stop(
+            job_title=job_title,
+            job_description=job_description,
+            level=level,
+            company_type=company_type,
+            model=model,
+            temperature=temperature,
+            resume_file=f,
+        )
+
+    run_shortlist(
+        model=model,
+        job_title=job_title,
+        job_description=job_description,
+        resumes=get_resume_texts_or_stop(resume_file),
+        scoring_mode=scoring_mode,
+        order=matrix_order,
+    )
+elif run_clicked:
     validate_inputs_or_stop(
         job_title=job_title,
         job_description=job_description,
@@ -332,23 +862,57 @@ if run_clicked:
         resume_file=resume_file,
     )
 
-    resume_text = get_resume_text_or_stop(resume_file)
+    # Per-stage timings from resume extraction onward, shown next to the cost caption.
+    with collect_timings() as timings:
+        resume_text = get_resume_text_or_stop(resume_file)
 
-    if mode == "Resume ↔ Job Description Alignment":
-        run_alignment(
-            model=model,
-            job_title=job_title,
-            job_description=job_description,
-            resume_text=resume_text,
-        )
-    else:
-        run_generation(
-            model=model,
-            prompt_key=prompt_key,
-            temperature=temperature,
-            job_title=job_title,
-            job_description=job_description,
-            level=level,
-            company_type=company_type,
-            resume_text=resume_text,
-        )
+        if mode == "Resume ↔ Job Description Alignment":
+            run_alignment(
+                model=model,
+                job_title=job_title,
+                job_description=job_description,
+                resume_text=resume_text,
+                scoring_mode=scoring_mode,
+                timings=timings,
+            )
+        elif mode == "Both":
+            run_both(
+                model=model,
+                prompt_key=prompt_key,
+                temperature=temperature,
+                job_title=job_title,
+                job_description=job_description,
+                level=level,
+                company_type=company_type,
+                resume_text=resume_text,
+                scoring_mode=scoring_mode,
+                timings=timings,
+            )
+        elif mode == "Prompt Strategy Comparison":
+            if not compare_models:
+                st.error("Please select at least one model to compare on.")
+                st.stop()
+            run_prompt_comparison(
+                models=compare_models,
+                temperature=temperature,
+                job_title=job_title,
+                job_description=job_description,
+                level=level,
+                company_type=company_type,
+                resume_text=resume_text,
+            )
+        else:
+            run_generation(
+                model=model,
+                prompt_key=prompt_key,
+                temperature=temperature,
+                job_title=job_title,
+                job_description=job_description,
+                level=level,
+                company_type=company_type,
+                resume_text=resume_text,
+                timings=timings,
+            )
+            run_regenerate_panel(show_results=False)
+elif mode == "Recruiter Q&As":
+    run_regenerate_panel()
@@ -0,0 +1,211 @@
+"""
+Headless batch scoring: rank a directory of resume PDFs against one job description.
+
+    python -m src.app.alignment.batch --title "ML Engineer" --jd jd.txt --resumes ./applicants --out ranked.csv
+
+Requirements are extracted from the JD once; resumes are extracted in a process pool and
+scored as each one finishes (one JSON line per resume on stdout). The ranked file is
+written at the end (.csv or .jsonl, by extension).
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+from src.app.alignment.generate import (
+    RequirementMatch,
+    extract_requirements_with_cost,
+    score_requirements_against_resume,
+)
+from src.app.alignment.heatmap import render_alignment_matrix_png
+from src.app.alignment.matrix import AlignmentMatrix
+from src.app.settings import (
+    ALIGNMENT_MAX_ITEMS,
+    ALIGNMENT_SCORING_MODES,
+    ALIGNMENT_TEMPERATURE,
+    ALLOWED_MODELS,
+)
+from src.helpers.pdf_extract import extract_text_from_pdf
+
+
+@dataclass(frozen=True)
+class ResumeScore:
+    path: str
+    score: int
+    max_score: int
+    matches: list[RequirementMatch] = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def coverage(self) -> float:
+        return self.score / self.max_score if self.max_score else 0.0
+
+    def to_row(self) -> dict[str, Any]:
+        return {
+            "file": os.path.basename(self.path),
+            "score": self.score,
+            "max_score": self.max_score,
+            "coverage": round(self.coverage, 4),
+            "strong": sum(1 for m in self.matches if m.strength == 2),
+            "partial": sum(1 for m in self.matches if m.strength == 1),
+            "missing": sum(1 for m in self.matches if m.strength == 0),
+            "missing_requirements": "; ".join(m.requirement for m in self.matches if m.strength == 0),
+            "error": self.error,
+        }
+
+
+@dataclass
+class BatchStats:
+    resumes: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def resumes_per_second(self) -> float:
+        return self.resumes / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def _extract_path(path: str) -> tuple[str, str, str]:
+    # Runs in a worker process; returns (path, text, error) so one bad PDF doesn't sink the batch.
+    try:
+        return path, extract_text_from_pdf(Path(path).read_bytes(), use_cache=False), ""
+    except Exception as e:
+        return path, "", f"{type(e).__name__}: {e}"
+
+
+def iter_resume_scores(
+    requirements: list[dict[str, Any]],
+    pdf_paths: Sequence[str],
+    *,
+    max_workers: Optional[int] = None,
+    stats: Optional[BatchStats] = None,
+    scoring_mode: str = "keyword",
+) -> Iterator[ResumeScore]:
+    """
+    Yield a ResumeScore per PDF in completion order (not input order).
+    Scoring is local; only PDF extraction is fanned out to worker processes.
+    """
+    stats = stats if stats is not None else BatchStats()
+    start = time.perf_counter()
+    max_score = 2 * sum(
+        1 for r in requirements
+        if str(r.get("requirement", "")).strip() and any(str(k).strip() for k in r.get("keywords", []))
+    )
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_extract_path, p) for p in pdf_paths]
+        for fut in as_completed(futures):
+            path, text, error = fut.result()
+            if not error and not text.strip():
+                error = "No extractable text"
+
+            if error:
+                result = ResumeScore(path=path, score=0, max_score=max_score, error=error)
+                stats.failed += 1
+            else:
+                matches = score_requirements_against_resume(requirements, text, mode=scoring_mode)
+                result = ResumeScore(
+                    path=path,
+                    score=sum(m.strength for m in matches),
+                    max_score=max_score,
+                    matches=matches,
+                )
+
+            stats.resumes += 1
+            stats.elapsed_seconds = time.perf_counter() - start
+            yield result
+
+
+def rank_scores(scores: Sequence[ResumeScore]) -> list[ResumeScore]:
+    # Failed extractions sink to the bottom; ties broken by file name for stable output.
+    return sorted(scores, key=lambda s: (bool(s.error), -s.score, os.path.basename(s.path)))
+
+
+def write_ranked(scores: Sequence[ResumeScore], out_path: str) -> None:
+    rows = [{"rank": i, **s.to_row()} for i, s in enumerate(rank_scores(scores), start=1)]
+    if out_path.endswith(".jsonl"):
+        with open(out_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+
+    fieldnames = ["rank", *ResumeScore(path="", score=0, max_score=0).to_row().keys()]
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_heatmap(scores: Sequence[ResumeScore], out_path: str) -> None:
+    scored = [s for s in rank_scores(scores) if not s.error]
+    matrix = AlignmentMatrix.from_matches([os.path.basename(s.path) for s in scored], [s.matches for s in scored])
+    Path(out_path).write_bytes(render_alignment_matrix_png(matrix))
+
+
+def find_pdfs(directory: str) -> list[str]:
+    return sorted(str(p) for p in Path(directory).rglob("*") if p.suffix.lower() == ".pdf")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rank resume PDFs against one job description.")
+    parser.add_argument("--title", required=True, help="Job title")
+    parser.add_argument("--jd", required=True, help="Path to a text file with the job description")
+    parser.add_argument("--resumes", required=True, help="Directory of resume PDFs (searched recursively)")
+    parser.add_argument("--out", required=True, help="Ranked output file (.csv or .jsonl)")
+    parser.add_argument("--model", default=ALLOWED_MODELS[0], choices=ALLOWED_MODELS)
+    parser.add_argument("--max-items", type=int, default=ALIGNMENT_MAX_ITEMS)
+    parser.add_argument("--scoring", default="keyword", choices=ALIGNMENT_SCORING_MODES)
+    parser.add_argument("--heatmap", default=None, help="Also write a candidates x requirements heatmap PNG")
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    pdfs = find_pdfs(args.resumes)
+    if not pdfs:
+        print(f"No PDFs found under {args.resumes}", file=sys.stderr)
+        return 1
+
+    extracted = extract_requirements_with_cost(
+        model=args.model,
+        temperature=ALIGNMENT_TEMPERATURE,
+        job_title=args.title,
+        job_desc=Path(args.jd).read_text(encoding="utf-8"),
+        max_items=args.max_items,
+    )
+    if not extracted.requirements:
+        print("No requirements could be extracted from the job description.", file=sys.stderr)
+        return 1
+    print(
+        f"Extracted {len(extracted.requirements)} requirements "
+        f"(${extracted.cost.total_cost_usd:.6f}); scoring {len(pdfs)} resumes…",
+        file=sys.stderr,
+    )
+
+    stats = BatchStats()
+    scores: list[ResumeScore] = []
+    for result in iter_resume_scores(
+        extracted.requirements, pdfs, max_workers=args.workers, stats=stats, scoring_mode=args.scoring
+    ):
+        scores.append(result)
+        print(json.dumps(result.to_row(), ensure_ascii=False), flush=True)
+
+    write_ranked(scores, args.out)
+    if args.heatmap:
+        write_heatmap(scores, args.heatmap)
+    print(
+        f"Scored {stats.resumes} resumes ({stats.failed} failed) in {stats.elapsed_seconds:.2f}s "
+        f"— {stats.resumes_per_second:.1f} resumes/sec. Ranked results: {args.out}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.app.settings import BM25_B, BM25_K1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Requirement phrasing is full of these; matching them says nothing about fit.
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it of on or our the to using we will with "
+    "you your experience years year strong ability knowledge skills plus".split()
+)
+
+
+def _stem(tok: str) -> str:
+    # Deliberately tiny: fold plurals and -ing/-ed so "pipelines" meets "pipeline", "mentored" meets "mentoring".
+    if len(tok) > 4 and tok.endswith("ies"):
+        return tok[:-3] + "y"
+    if len(tok) > 5 and tok.endswith("ing"):
+        return tok[:-3]
+    if len(tok) > 4 and tok.endswith("ed"):
+        return tok[:-2]
+    if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+        return tok[:-1]
+    return tok
+
+
+def tokenize(text_norm: str) -> list[str]:
+    return [_stem(t) for t in _TOKEN_RE.findall(text_norm) if t not in _STOPWORDS]
+
+
+@dataclass(frozen=True)
+class TermMatrix:
+    """
+    Sparse line x term frequency matrix in CSR form (indptr / indices / tf), one row per resume line.
+    Built once per resume; BM25 only ever densifies the handful of columns a query touches.
+    """
+
+    vocab: dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    tf: np.ndarray
+    doc_len: np.ndarray
+    df: np.ndarray
+
+    @classmethod
+    def build(cls, lines_norm: Sequence[str]) -> TermMatrix:
+        vocab: dict[str, int] = {}
+        indptr = [0]
+        indices: list[int] = []
+        tf: list[int] = []
+        doc_len: list[int] = []
+
+        for ln in lines_norm:
+            counts: dict[int, int] = {}
+            toks = tokenize(ln)
+            for tok in toks:
+                tid = vocab.setdefault(tok, len(vocab))
+                counts[tid] = counts.get(tid, 0) + 1
+            indices.extend(counts.keys())
+            tf.extend(counts.values())
+            indptr.append(len(indices))
+            doc_len.append(len(toks))
+
+        indices_arr = np.asarray(indices, dtype=np.int64)
+        return cls(
+            vocab=vocab,
+            indptr=np.asarray(indptr, dtype=np.int64),
+            indices=indices_arr,
+            tf=np.asarray(tf, dtype=np.float64),
+            doc_len=np.asarray(doc_len, dtype=np.float64),
+            df=np.bincount(indices_arr, minlength=len(vocab)).astype(np.float64),
+        )
+
+    @property
+    def n_lines(self) -> int:
+        return len(self.indptr) - 1
+
+    def dense_columns(self, term_ids: np.ndarray) -> np.ndarray:
+        """(n_lines, len(term_ids)) tf block for the requested terms."""
+        col_of = np.full(len(self.vocab), -1, dtype=np.int64)
+        col_of[term_ids] = np.arange(len(term_ids))
+        rows = np.repeat(np.arange(self.n_lines), np.diff(self.indptr))
+        cols = col_of[self.indices]
+        keep = cols >= 0
+
+        out = np.zeros((self.n_lines, len(term_ids)), dtype=np.float64)
+        out[rows[keep], cols[keep]] = self.tf[keep]
+        return out
+
+
+@dataclass(frozen=True)
+class Bm25Result:
+    scores: np.ndarray  # (n_queries,) best-line score normalized to [0, 1]
+    raw_scores: np.ndarray  # (n_queries,) best-line BM25 score
+    best_lines: np.ndarray  # (n_queries,) line index, -1 when nothing matched
+
+
+@dataclass(frozen=True)
+class _Prepared:
+    line_scores: np.ndarray  # (n_lines, n_queries) raw BM25
+    reference: np.ndarray  # (n_queries,) score of an average-length line containing every query term once
+
+
+def _prepare(terms: TermMatrix, queries: Sequence[str], k1: float, b: float) -> Optional[_Prepared]:
+    n_q = len(queries)
+    all_toks = [tokenize(q) for q in queries]
+    query_toks = [[t for t in toks if t in terms.vocab] for toks in all_toks]
+    term_ids = np.asarray(sorted({terms.vocab[t] for toks in query_toks for t in toks}), dtype=np.int64)
+
+    if n_q == 0 or terms.n_lines == 0 or len(term_ids) == 0:
+        return None
+
+    col = {int(tid): j for j, tid in enumerate(term_ids)}
+    q_matrix = np.zeros((len(term_ids), n_q))
+    for qi, toks in enumerate(query_toks):
+        for t in toks:
+            q_matrix[col[terms.vocab[t]], qi] += 1.0
+
+    n = terms.n_lines
+    df = terms.df[term_ids]
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+
+    tf = terms.dense_columns(term_ids)
+    avg_len = terms.doc_len.mean() or 1.0
+    norm = k1 * (1.0 - b + b * terms.doc_len / avg_len)
+    weights = np.divide(idf * tf * (k1 + 1.0), tf + norm[:, None], out=np.zeros_like(tf), where=tf > 0)
+
+    # With tf = 1 on an average-length line each term contributes exactly its idf.
+    # Query terms missing from the resume still count (at df = 0), so a requirement
+    # that only half-appears can't score near 1.
+    n_missing = np.asarray([len(a) - len(p) for a, p in zip(all_toks, query_toks)], dtype=np.float64)
+    idf_missing = np.log1p((n + 0.5) / 0.5)
+    return _Prepared(line_scores=weights @ q_matrix, reference=idf @ q_matrix + n_missing * idf_missing)
+
+
+def bm25_line_scores(
+    terms: TermMatrix,
+    queries: Sequence[str],
+    *,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+) -> np.ndarray:
+    """(n_lines, n_queries) raw BM25 score of every line (or section) for every query."""
+    prepared = _prepare(terms, queries, k1, b)
+    return prepared.line_scores if prepared is not None else np.zeros((terms.n_lines, len(queries)))
+
+
+def bm25_best_lines(
+    terms: TermMatrix,
+    queries: Sequence[str],
+    *,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+) -> Bm25Result:
+    """
+    Score every query against every line in one (lines x terms) @ (terms x queries) product.
+    The normalized score is relative to an average-length line containing every query term once.
+    """
+    n_q = len(queries)
+    prepared = _prepare(terms, queries, k1, b)
+    if prepared is None:
+        zeros = np.zeros(n_q)
+        return Bm25Result(scores=zeros, raw_scores=zeros, best_lines=np.full(n_q, -1))
+
+    best_lines = prepared.line_scores.argmax(axis=0)
+    raw = prepared.line_scores[best_lines, np.arange(n_q)]
+    reference = prepared.reference
+    scores = np.minimum(np.divide(raw, reference, out=np.zeros(n_q), where=reference > 0), 1.0)
+    best_lines = np.where(raw > 0, best_lines, -1)
+    return Bm25Result(scores=scores, raw_scores=raw, best_lines=best_lines)
@@ -1,44 +1,60 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from typing import Any
 
+from src.app.alignment.schema import RequirementsOutput
+from src.helpers.prompt_templates import register_template
+from src.helpers.structured_output import json_schema_response_format, strict_json_schema
 
-def build_extract_requirements_prompts(
-    *,
-    job_title: str,
-    job_desc: str,
-    max_items: int,
-) -> tuple[str, str]:
-    """
-    Returns (system_prompt, user_prompt) for extracting requirements from a JD.
-    Pure function: no I/O, no model calls.
-    """
-    system_prompt = (
-        "You extract structured hiring requirements from job descriptions. "
-        "Return ONLY valid JSON. No markdown."
-    )
+_SYSTEM_PROMPT = (
+    "You extract structured hiring requirements from job descriptions. "
+    "Return ONLY valid JSON. No markdown."
+)
 
-    schema_hint: dict[str, Any] = {
-        "requirements": [
-            {"requirement": "string (short)", "keywords": ["string", "string"]}
-        ]
-    }
+_SCHEMA_HINT: dict[str, Any] = {
+    "requirements": [
+        {"requirement": "string (short)", "keywords": ["string", "string"]}
+    ]
+}
 
-    user_prompt = f"""
-Extract the top {max_items} recruiter-relevant requirements from this job description.
+_USER_PROMPT = register_template(
+    "alignment.extract_requirements",
+    '''Extract the top {max_items} recruiter-relevant requirements from this job description.
 
 Job Title: {job_title}
 
 Job Description:
-\"\"\"{job_desc}\"\"\"
+"""{job_desc}"""
 
 Rules:
 - Output MUST be valid JSON only.
 - Output MUST match this schema:
-{json.dumps(schema_hint, indent=2)}
+{schema_hint}
 - Keep each "requirement" short (5–12 words).
-- "keywords" should be 2–5 concrete terms that can be searched in a resume.
-""".strip()
+- "keywords" should be 2–5 concrete terms that can be searched in a resume.''',
+    schema_hint=json.dumps(_SCHEMA_HINT, indent=2),
+)
+
+
+def build_extract_requirements_prompts(
+    *,
+    job_title: str,
+    job_desc: str,
+    max_items: int,
+) -> tuple[str, str]:
+    """
+    Returns (system_prompt, user_prompt) for extracting requirements from a JD.
+    Pure function: no I/O, no model calls.
+    """
+    user_prompt = _USER_PROMPT.render(max_items=max_items, job_title=job_title, job_desc=job_desc)
+    return _SYSTEM_PROMPT, user_prompt
+
 
-    return system_prompt, user_prompt
+@lru_cache(maxsize=16)
+def requirements_response_format(max_items: int) -> dict[str, Any]:
+    """Structured Outputs format derived from RequirementsOutput, capped at max_items. Treat as read-only."""
+    schema = strict_json_schema(RequirementsOutput)
+    schema["properties"]["requirements"]["maxItems"] = max_items
+    return json_schema_response_format("requirements", schema)
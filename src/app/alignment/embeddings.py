@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import warnings
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Protocol, Sequence
+
+import numpy as np
+
+from src.app.alignment.bm25 import tokenize
+from src.app.alignment.keyword_index import normalize_text
+from src.app.alignment.resume_index import ResumeIndex
+from src.app.settings import (
+    EMBEDDING_HASH_DIM,
+    EMBEDDING_INDEX_DIR,
+    EMBEDDING_INDEX_MAX_ENTRIES,
+    EMBEDDING_MODEL,
+)
+from src.helpers.vector_index import VectorIndex, VectorIndexStats
+
+
+class Embedder(Protocol):
+    name: str  # part of the index key, so vectors from different models never mix
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) float32, rows L2-normalized (all-zero rows stay zero)."""
+
+
+@lru_cache(maxsize=65_536)
+def _feature_slot(feature: str, dim: int) -> tuple[int, float]:
+    h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    # Signed hashing: collisions cancel out on average instead of piling up.
+    return h % dim, 1.0 if (h >> 63) else -1.0
+
+
+def _features(text: str) -> list[tuple[str, float]]:
+    toks = tokenize(normalize_text(text))
+    feats = [(f"w:{t}", 1.0) for t in toks]
+    feats += [(f"b:{a} {b}", 0.5) for a, b in zip(toks, toks[1:])]
+    # Character trigrams let "kubernetes"/"kube" or "analytics"/"analyst" share some mass.
+    for t in toks:
+        padded = f"<{t}>"
+        feats += [(f"c:{padded[i:i + 3]}", 0.15) for i in range(len(padded) - 2)]
+    return feats
+
+
+class HashingEmbedder:
+    """
+    Deterministic, dependency-free bag of stemmed words, bigrams and character trigrams
+    hashed into a fixed-size vector. Used when no local model is configured, and in benchmarks.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_HASH_DIM) -> None:
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: list[int] = []
+        cols: list[int] = []
+        vals: list[float] = []
+        for i, text in enumerate(texts):
+            for feature, weight in _features(text):
+                col, sign = _feature_slot(feature, self.dim)
+                rows.append(i)
+                cols.append(col)
+                vals.append(sign * weight)
+
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(out, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), vals)
+        return _l2_normalize(out)
+
+
+class SentenceTransformerEmbedder:
+    """CPU-only local model via sentence-transformers (optional dependency)."""
+
+    def __init__(self, model_name: str) -> None:
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.name = "st-" + model_name.replace("/", "_")
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def _l2_normalize(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> Embedder:
+    """EMBEDDING_MODEL when it can be loaded, otherwise the hashing vectorizer."""
+    if EMBEDDING_MODEL:
+        try:
+            return SentenceTransformerEmbedder(EMBEDDING_MODEL)
+        except ImportError:
+            warnings.warn(
+                "EMBEDDING_MODEL is set but sentence-transformers is not installed; "
+                "falling back to the hashing vectorizer.",
+                stacklevel=2,
+            )
+    return HashingEmbedder()
+
+
+_VECTOR_INDEX = VectorIndex(max_entries=EMBEDDING_INDEX_MAX_ENTRIES, index_dir=EMBEDDING_INDEX_DIR)
+
+
+def resume_chunk_vectors(index: ResumeIndex, embedder: Optional[Embedder] = None) -> np.ndarray:
+    """
+    (n_lines, dim) vectors for the resume's lines, one chunk per line so the best chunk
+    doubles as evidence. Stored by resume hash: scoring a known resume against a new JD
+    only embeds the requirements.
+    """
+    embedder = embedder if embedder is not None else get_embedder()
+    key = f"{hashlib.sha256(index.text.encode('utf-8')).hexdigest()}-{embedder.name}"
+    return _VECTOR_INDEX.get_or_embed(key, lambda: embedder.embed(index.lines))
+
+
+@dataclass(frozen=True)
+class SimilarityResult:
+    scores: np.ndarray  # (n_queries,) cosine similarity of the best line, clipped to [0, 1]
+    best_lines: np.ndarray  # (n_queries,) line index, -1 when nothing is similar
+
+
+def best_matching_lines(query_vectors: np.ndarray, chunk_vectors: np.ndarray) -> SimilarityResult:
+    """Cosine similarity of every query against every chunk in one (queries x dim) @ (dim x chunks) product."""
+    return best_matching_lines_many(query_vectors, [chunk_vectors])[0]
+
+
+def best_matching_lines_many(
+    query_vectors: np.ndarray, chunk_vectors: Sequence[np.ndarray]
+) -> list[SimilarityResult]:
+    """
+    best_matching_lines for several resumes at once: their chunks are stacked so every
+    (query, line) pair across the whole shortlist comes out of one matrix product.
+    """
+    n_q = len(query_vectors)
+    sizes = [len(c) for c in chunk_vectors]
+    if n_q == 0 or sum(sizes) == 0:
+        return [SimilarityResult(scores=np.zeros(n_q), best_lines=np.full(n_q, -1)) for _ in sizes]
+
+    sims = query_vectors @ np.concatenate([np.asarray(c) for c in chunk_vectors if len(c)]).T
+    results: list[SimilarityResult] = []
+    start = 0
+    for size in sizes:
+        if size == 0:
+            results.append(SimilarityResult(scores=np.zeros(n_q), best_lines=np.full(n_q, -1)))
+            continue
+        block = sims[:, start : start + size]
+        best_lines = block.argmax(axis=1)
+        scores = np.clip(block[np.arange(n_q), best_lines], 0.0, 1.0).astype(np.float64)
+        results.append(SimilarityResult(scores=scores, best_lines=np.where(scores > 0, best_lines, -1)))
+        start += size
+    return results
+
+
+def vector_index_stats() -> VectorIndexStats:
+    return _VECTOR_INDEX.stats
+
+
+def clear_vector_index() -> None:
+    _VECTOR_INDEX.clear()
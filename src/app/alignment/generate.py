@@ -1,15 +1,36 @@
 from __future__ import annotations
 
-import json
-import re
+import copy
+import hashlib
 from dataclasses import dataclass
-from io import BytesIO
-from typing import Any
+from typing import Any, Optional, Sequence
 
-import matplotlib.pyplot as plt
+from pydantic import ValidationError
 
-from src.helpers.openai_client import call_open_ai
-from src.app.alignment.build_prompt import build_extract_requirements_prompts
+from src.helpers.lru_cache import CacheStats, LRUCache
+from src.helpers.openai_client import call_open_ai, is_cached_response
+from src.app.alignment.bm25 import bm25_best_lines
+from src.app.alignment.embeddings import (
+    best_matching_lines,
+    best_matching_lines_many,
+    get_embedder,
+    resume_chunk_vectors,
+)
+from src.app.alignment.build_prompt import build_extract_requirements_prompts, requirements_response_format
+from src.app.alignment.keyword_index import KeywordMatcher, keyword_matcher, normalize_text
+from src.app.alignment.resume_index import ResumeIndex, resume_index
+from src.app.alignment.schema import Requirement, RequirementsOutput
+from src.app.pricing.calculate import CostBreakdown, cost_from_usage, estimate_cost
+from src.app.recruiter_prep.stream_parse import QuestionsArrayParser
+from src.helpers.tracing import span, traced
+from src.app.settings import (
+    ALIGNMENT_SCORING_MODES,
+    BM25_PARTIAL_THRESHOLD,
+    BM25_STRONG_THRESHOLD,
+    EMBEDDING_PARTIAL_THRESHOLD,
+    EMBEDDING_STRONG_THRESHOLD,
+    REQUIREMENTS_CACHE_MAX_ENTRIES,
+)
 
 
 @dataclass(frozen=True)
@@ -18,10 +39,34 @@ class RequirementMatch:
     keywords: list[str]
     strength: int  # 0=Missing, 1=Partial, 2=Strong
     evidence_snippet: str
+    score: float = 0.0  # continuous 0..1; keyword mode uses strength / 2
+
+
+@dataclass(frozen=True)
+class RequirementsResult:
+    requirements: list[dict[str, Any]]
+    cost: CostBreakdown
+
+
+@dataclass(frozen=True)
+class _CachedRequirements:
+    requirements: list[dict[str, Any]]
+    prompt_tokens: int
+    completion_tokens: int
+
+
+# Requirements depend only on the JD, so one extraction serves every resume scored against it.
+_REQUIREMENTS_CACHE: LRUCache[_CachedRequirements] = LRUCache(max_entries=REQUIREMENTS_CACHE_MAX_ENTRIES)
 
 
 def _normalize(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip().lower()
+    return normalize_text(text)
+
+
+def jd_fingerprint(job_title: str, job_desc: str) -> str:
+    """Whitespace- and case-insensitive identity of a JD."""
+    blob = f"{_normalize(job_title)}\x00{_normalize(job_desc)}".encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
 
 
 def extract_requirements_from_jd(
@@ -30,55 +75,168 @@ def extract_requirements_from_jd(
     job_title: str,
     job_desc: str,
     max_items: int = 10,
+    *,
+    use_cache: bool = True,
 ) -> list[dict[str, Any]]:
+    return extract_requirements_with_cost(
+        model=model,
+        temperature=temperature,
+        job_title=job_title,
+        job_desc=job_desc,
+        max_items=max_items,
+        use_cache=use_cache,
+    ).requirements
+
+
+@traced("alignment.requirements")
+def extract_requirements_with_cost(
+    model: str,
+    temperature: float,
+    job_title: str,
+    job_desc: str,
+    max_items: int = 10,
+    *,
+    use_cache: bool = True,
+) -> RequirementsResult:
+    cache_key = (model, round(float(temperature), 4), max_items, jd_fingerprint(job_title, job_desc))
+    if use_cache:
+        cached = _REQUIREMENTS_CACHE.get(cache_key)
+        if cached is not None:
+            return RequirementsResult(
+                requirements=copy.deepcopy(cached.requirements),
+                cost=estimate_cost(model, cached.prompt_tokens, cached.completion_tokens, cached=True),
+            )
+
     system_prompt, user_prompt = build_extract_requirements_prompts(
         job_title=job_title,
         job_desc=job_desc,
         max_items=max_items,
     )
 
-    resp = call_open_ai(
-        model=model,
-        system_prompt=system_prompt,
-        user_prompt=user_prompt,
-        temperature=temperature,
-    )
+    def extract(use_response_cache: bool) -> tuple[Any, list[dict[str, Any]]]:
+        resp = call_open_ai(
+            model=model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            use_cache=use_response_cache,
+            response_format=requirements_response_format(max_items),
+        )
+        with span("alignment.parse"):
+            return resp, parse_requirements_content(resp.choices[0].message.content)[:max_items]
+
+    resp, reqs = extract(use_response_cache=True)
+    if not reqs and is_cached_response(resp):
+        # The response cache replayed an empty extraction; ask the model again rather than repeat it.
+        resp, reqs = extract(use_response_cache=False)
 
-    data = json.loads(resp.choices[0].message.content)
-    reqs = data.get("requirements", [])
-    if not isinstance(reqs, list):
+    cost = cost_from_usage(model, resp.usage, cached=is_cached_response(resp))
+
+    # Only non-empty extractions are kept, so an empty one is retried on the next run.
+    if use_cache and reqs:
+        _REQUIREMENTS_CACHE.put(
+            cache_key,
+            _CachedRequirements(
+                requirements=copy.deepcopy(reqs),
+                prompt_tokens=cost.prompt_tokens,
+                completion_tokens=cost.completion_tokens,
+            ),
+        )
+    return RequirementsResult(requirements=reqs, cost=cost)
+
+
+def parse_requirements_content(content: Optional[str]) -> list[dict[str, Any]]:
+    """
+    Fast path: model_validate_json on the raw string. Otherwise keep each complete requirement
+    that validates on its own (truncated output, a malformed item) and drop the rest.
+    """
+    try:
+        return [r.model_dump() for r in RequirementsOutput.model_validate_json(content or "").requirements]
+    except ValidationError:
+        pass
+    try:
+        raw_items = QuestionsArrayParser(key="requirements").feed(content or "")
+    except ValueError:
         return []
-    return reqs[:max_items]
+    reqs = []
+    for raw in raw_items:
+        try:
+            reqs.append(Requirement.model_validate(raw).model_dump())
+        except ValidationError:
+            continue
+    return reqs
 
 
-def score_requirements_against_resume(
-    requirements: list[dict[str, Any]],
-    resume_text: str,
-) -> list[RequirementMatch]:
-    resume_norm = _normalize(resume_text)
+def requirements_cache_stats() -> CacheStats:
+    return _REQUIREMENTS_CACHE.stats
 
-    results: list[RequirementMatch] = []
+
+def clear_requirements_cache() -> None:
+    _REQUIREMENTS_CACHE.clear()
+
+
+def _parse_requirements(requirements: list[dict[str, Any]]) -> list[tuple[str, list[str]]]:
+    parsed: list[tuple[str, list[str]]] = []
     for r in requirements:
         req = str(r.get("requirement", "")).strip()
         kws = r.get("keywords", [])
         keywords = [str(k).strip() for k in kws if str(k).strip()]
         if not req or not keywords:
             continue
+        parsed.append((req, keywords))
+    return parsed
+
+
+def _clip(text: str, max_len: int) -> str:
+    return (text[:max_len] + "…") if len(text) > max_len else text
 
-        hits: list[str] = []
-        for k in keywords:
-            k_norm = _normalize(k)
-            pattern = (
-                r"\b" + re.escape(k_norm) + r"\b"
-                if " " not in k_norm
-                else re.escape(k_norm)
-            )
-            if re.search(pattern, resume_norm):
-                hits.append(k)
+
+@traced("alignment.score")
+def score_requirements_against_resume(
+    requirements: list[dict[str, Any]],
+    resume_text: str,
+    *,
+    index: Optional[ResumeIndex] = None,
+    mode: str = "keyword",
+) -> list[RequirementMatch]:
+    """
+    mode="keyword": 0/1/2 strength from exact keyword hits (the original behaviour).
+    mode="bm25": BM25 over resume lines; continuous score, best line as evidence, strength bucketed by threshold.
+    mode="embedding": same, using cosine similarity of local embeddings (see embeddings.get_embedder).
+    """
+    if mode not in ALIGNMENT_SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {mode}")
+
+    index = index if index is not None else resume_index(resume_text)
+    parsed = _parse_requirements(requirements)
+    if mode == "bm25":
+        return _score_bm25(parsed, index)
+    if mode == "embedding":
+        return _score_embedding(parsed, index)
+
+    return _score_keyword(parsed, index, resume_text, _keyword_matcher(parsed))
+
+
+def _keyword_matcher(parsed: list[tuple[str, list[str]]]) -> KeywordMatcher:
+    return keyword_matcher(k for _, keywords in parsed for k in keywords)
+
+
+def _score_keyword(
+    parsed: list[tuple[str, list[str]]],
+    index: ResumeIndex,
+    resume_text: str,
+    matcher: KeywordMatcher,
+) -> list[RequirementMatch]:
+    # One pass over the resume for every keyword of every requirement.
+    found = matcher.matched(index.norm)
+
+    results: list[RequirementMatch] = []
+    for req, keywords in parsed:
+        hits = [k for k in keywords if _normalize(k) in found]
 
         strength = 2 if len(hits) >= 2 else 1 if len(hits) == 1 else 0
         snippet = (
-            extract_evidence_snippet(resume_text, hits)
+            extract_evidence_snippet(resume_text, hits, index=index)
             if hits
             else "Not specified in resume"
         )
@@ -89,63 +247,112 @@ def score_requirements_against_resume(
                 keywords=keywords,
                 strength=strength,
                 evidence_snippet=snippet,
+                score=strength / 2,
             )
         )
 
     return results
 
 
-def extract_evidence_snippet(
-    resume_text: str, hit_keywords: list[str], max_len: int = 180
-) -> str:
-    lines = [ln.strip() for ln in resume_text.splitlines() if ln.strip()]
-    hit_lower = [_normalize(k) for k in hit_keywords]
+def score_requirements_against_resumes(
+    requirements: list[dict[str, Any]],
+    resume_texts: Sequence[str],
+    *,
+    mode: str = "keyword",
+) -> list[list[RequirementMatch]]:
+    """
+    Score many resumes against one set of requirements; one list of matches per resume, same order.
+    The requirements are parsed once for the whole batch. Keyword mode compiles one KeywordMatcher
+    and scans every resume with it; embedding mode embeds the requirements once and scores every
+    resume line in a single product. bm25 stays per resume (its idf is relative to each resume's lines).
+    """
+    if mode not in ALIGNMENT_SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {mode}")
 
-    for ln in lines:
-        ln_norm = _normalize(ln)
-        if any(k in ln_norm for k in hit_lower):
-            return (ln[:max_len] + "…") if len(ln) > max_len else ln
+    parsed = _parse_requirements(requirements)
+    indexes = [resume_index(text) for text in resume_texts]
+    if mode == "keyword":
+        matcher = _keyword_matcher(parsed)
+        return [_score_keyword(parsed, index, text, matcher) for index, text in zip(indexes, resume_texts)]
+    if mode == "bm25":
+        return [_score_bm25(parsed, index) for index in indexes]
 
-    text = resume_text.strip().replace("\n", " ")
-    if not text:
-        return "Not specified in resume"
-    return (text[:max_len] + "…") if len(text) > max_len else text
+    embedder = get_embedder()
+    chunks = [resume_chunk_vectors(index, embedder) for index in indexes]
+    queries = embedder.embed(_requirement_queries(parsed))
+
+    results: list[list[RequirementMatch]] = []
+    for index, sims in zip(indexes, best_matching_lines_many(queries, chunks)):
+        results.append(
+            _bucketed_matches(
+                parsed, index, sims.scores, sims.best_lines,
+                strong=EMBEDDING_STRONG_THRESHOLD, partial=EMBEDDING_PARTIAL_THRESHOLD,
+            )
+        )
+    return results
 
 
-def render_alignment_heatmap_png(matches: list[RequirementMatch]) -> bytes:
-    if not matches:
-        fig = plt.figure()
-        plt.text(0.1, 0.5, "No requirements to plot", fontsize=12)
-        plt.axis("off")
-        buf = BytesIO()
-        plt.savefig(buf, format="png", bbox_inches="tight", dpi=200)
-        plt.close(fig)
-        return buf.getvalue()
+def _requirement_queries(parsed: list[tuple[str, list[str]]]) -> list[str]:
+    return [_normalize(" ".join([req, *keywords])) for req, keywords in parsed]
 
-    labels = [m.requirement for m in matches]
-    data = [[m.strength] for m in matches]  # Nx1 “heatmap”
 
-    fig, ax = plt.subplots(figsize=(8, max(3, 0.45 * len(labels))))
-    im = ax.imshow(data, aspect="auto")
+def _score_bm25(parsed: list[tuple[str, list[str]]], index: ResumeIndex) -> list[RequirementMatch]:
+    bm25 = bm25_best_lines(index.terms, _requirement_queries(parsed))
+    return _bucketed_matches(
+        parsed, index, bm25.scores, bm25.best_lines,
+        strong=BM25_STRONG_THRESHOLD, partial=BM25_PARTIAL_THRESHOLD,
+    )
+
 
-    ax.set_yticks(range(len(labels)))
-    ax.set_yticklabels(labels, fontsize=9)
-    ax.set_xticks([0])
-    ax.set_xticklabels(["Alignment Strength"], fontsize=10)
+def _score_embedding(parsed: list[tuple[str, list[str]]], index: ResumeIndex) -> list[RequirementMatch]:
+    embedder = get_embedder()
+    chunks = resume_chunk_vectors(index, embedder)
+    sims = best_matching_lines(embedder.embed(_requirement_queries(parsed)), chunks)
+    return _bucketed_matches(
+        parsed, index, sims.scores, sims.best_lines,
+        strong=EMBEDDING_STRONG_THRESHOLD, partial=EMBEDDING_PARTIAL_THRESHOLD,
+    )
 
-    for i, m in enumerate(matches):
-        text = (
-            "Strong" if m.strength == 2 else "Partial" if m.strength == 1 else "Missing"
+
+def _bucketed_matches(
+    parsed: list[tuple[str, list[str]]],
+    index: ResumeIndex,
+    scores: Any,
+    best_lines: Any,
+    *,
+    strong: float,
+    partial: float,
+) -> list[RequirementMatch]:
+    results: list[RequirementMatch] = []
+    for (req, keywords), score, line in zip(parsed, scores, best_lines):
+        score = float(score)
+        strength = 2 if score >= strong else 1 if score >= partial else 0
+        results.append(
+            RequirementMatch(
+                requirement=req,
+                keywords=keywords,
+                strength=strength,
+                evidence_snippet=_clip(index.lines[line], 180) if line >= 0 else "Not specified in resume",
+                score=score,
+            )
         )
-        ax.text(0, i, f"  {text}", va="center")
+    return results
 
-    cbar = fig.colorbar(im, ax=ax, fraction=0.03, pad=0.02)
-    cbar.set_ticks([0, 1, 2])
-    cbar.set_ticklabels(["Missing", "Partial", "Strong"])
 
-    ax.set_title("Resume ↔ Job Description Alignment Heatmap", fontsize=12, pad=10)
+def extract_evidence_snippet(
+    resume_text: str,
+    hit_keywords: list[str],
+    max_len: int = 180,
+    *,
+    index: Optional[ResumeIndex] = None,
+) -> str:
+    index = index if index is not None else resume_index(resume_text)
+
+    line = index.first_line_containing(_normalize(k) for k in hit_keywords)
+    if line is not None:
+        return _clip(index.lines[line], max_len)
 
-    buf = BytesIO()
-    plt.savefig(buf, format="png", bbox_inches="tight", dpi=220)
-    plt.close(fig)
-    return buf.getvalue()
+    text = index.flat_text
+    if not text:
+        return "Not specified in resume"
+    return _clip(text, max_len)
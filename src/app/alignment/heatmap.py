@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from src.helpers.lru_cache import CacheStats, LRUCache
+from src.app.alignment.generate import RequirementMatch
+from src.app.alignment.matrix import AlignmentMatrix
+from src.helpers.tracing import traced
+from src.app.settings import (
+    ALIGNMENT_HEATMAP_DPI,
+    ALIGNMENT_HEATMAP_PREVIEW_DPI,
+    HEATMAP_RENDER_CACHE_MAX_ENTRIES,
+    MATRIX_HEATMAP_DPI,
+    MATRIX_HEATMAP_MAX_HEIGHT_IN,
+    MATRIX_HEATMAP_MAX_ROW_LABELS,
+)
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+_ROW_HEIGHT_IN = 0.3
+_COL_WIDTH_IN = 0.55
+_LABEL_CHAR_IN = 0.065  # approximate width of one 8pt tick-label character
+_MAX_LABEL_CHARS = 32
+_STRENGTH_LABELS = ("Missing", "Partial", "Strong")
+
+
+def _short(label: str) -> str:
+    return label if len(label) <= _MAX_LABEL_CHARS else label[: _MAX_LABEL_CHARS - 1] + "…"
+
+
+@dataclass(frozen=True)
+class _Layout:
+    size_in: tuple[float, float]
+    axes_rect: tuple[float, float, float, float]  # figure fractions
+    cbar_rect: tuple[float, float, float, float]
+    row_ticks: tuple[int, ...]
+    row_labels: tuple[str, ...]
+    col_labels: tuple[str, ...]
+
+
+@lru_cache(maxsize=64)
+def _layout(candidates: tuple[str, ...], requirements: tuple[str, ...]) -> _Layout:
+    """
+    Figure size, margins and tick labels for a matrix shape, computed from label lengths
+    instead of bbox_inches="tight" (which re-draws the figure to measure it).
+    """
+    m, n = len(candidates), len(requirements)
+    col_labels = tuple(_short(r) for r in requirements)
+    # Past MAX_ROW_LABELS rows only every k-th candidate is labelled, and the height stops growing.
+    step = max(1, -(-m // MATRIX_HEATMAP_MAX_ROW_LABELS))
+    row_ticks = tuple(range(0, m, step))
+    row_labels = tuple(_short(candidates[i]) for i in row_ticks)
+
+    left = 0.3 + _LABEL_CHAR_IN * max((len(s) for s in row_labels), default=0)
+    bottom = 0.3 + 0.7 * _LABEL_CHAR_IN * max((len(s) for s in col_labels), default=0)  # 45° labels
+    top, right = 0.5, 1.0
+    plot_w = max(3.0, _COL_WIDTH_IN * n)
+    plot_h = min(MATRIX_HEATMAP_MAX_HEIGHT_IN, max(1.5, _ROW_HEIGHT_IN * m))
+
+    width, height = left + plot_w + right, bottom + plot_h + top
+    return _Layout(
+        size_in=(width, height),
+        axes_rect=(left / width, bottom / height, plot_w / width, plot_h / height),
+        cbar_rect=((left + plot_w + 0.15) / width, bottom / height, 0.15 / width, plot_h / height),
+        row_ticks=row_ticks,
+        row_labels=row_labels,
+        col_labels=col_labels,
+    )
+
+
+class MatrixHeatmapRenderer:
+    """
+    Candidates x requirements heatmap on one long-lived Agg figure.
+    Each render swaps the image data and (only when the labels change) the tick layout,
+    so cost doesn't grow with the number of figures created. Renders are serialized by a lock.
+    """
+
+    def __init__(self, dpi: int = MATRIX_HEATMAP_DPI) -> None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.dpi = dpi
+        self._lock = threading.Lock()
+        self._fig = Figure()
+        FigureCanvasAgg(self._fig)
+        self._ax = self._fig.add_axes((0.0, 0.0, 1.0, 1.0))
+        self._cax = self._fig.add_axes((0.0, 0.0, 1.0, 1.0))
+        self._image = self._ax.imshow(
+            np.zeros((1, 1)), aspect="auto", interpolation="nearest", vmin=0.0, vmax=1.0, cmap="viridis"
+        )
+        cbar = self._fig.colorbar(self._image, cax=self._cax)
+        cbar.set_ticks([0.0, 0.5, 1.0])
+        cbar.set_ticklabels(["Missing", "Partial", "Strong"])
+        self._ax.set_title("Shortlist ↔ Job Description Alignment", fontsize=11, pad=8)
+        self._layout_key: tuple[tuple[str, ...], tuple[str, ...]] = ((), ())
+
+    def render_png(self, matrix: AlignmentMatrix) -> bytes:
+        m, n = matrix.scores.shape
+        with self._lock:
+            if (matrix.candidates, matrix.requirements) != self._layout_key:
+                self._apply_layout(_layout(matrix.candidates, matrix.requirements))
+                self._layout_key = (matrix.candidates, matrix.requirements)
+
+            self._image.set_data(matrix.scores if matrix.scores.size else np.zeros((1, 1)))
+            self._image.set_extent((-0.5, max(n, 1) - 0.5, max(m, 1) - 0.5, -0.5))
+            self._ax.set_xlim(-0.5, max(n, 1) - 0.5)
+            self._ax.set_ylim(max(m, 1) - 0.5, -0.5)
+
+            buf = BytesIO()
+            self._fig.savefig(buf, format="png", dpi=self.dpi)
+            return buf.getvalue()
+
+    def _apply_layout(self, layout: _Layout) -> None:
+        self._fig.set_size_inches(*layout.size_in)
+        self._ax.set_position(layout.axes_rect)
+        self._cax.set_position(layout.cbar_rect)
+        self._ax.set_xticks(range(len(layout.col_labels)))
+        self._ax.set_xticklabels(layout.col_labels, rotation=45, ha="right", fontsize=8)
+        self._ax.set_yticks(layout.row_ticks)
+        self._ax.set_yticklabels(layout.row_labels, fontsize=8)
+
+
+@lru_cache(maxsize=1)
+def _matrix_renderer() -> MatrixHeatmapRenderer:
+    # Built on first render, so importing this module doesn't load matplotlib.
+    return MatrixHeatmapRenderer()
+
+
+def render_alignment_matrix_png(matrix: AlignmentMatrix) -> bytes:
+    return _matrix_renderer().render_png(matrix)
+
+
+# -----------------------------
+# Single-resume heatmap
+# -----------------------------
+HEATMAP_FORMATS = ("png", "svg")
+
+# Keyed on exactly what ends up in the image, so Streamlit reruns and repeat downloads are free.
+_RENDER_CACHE: LRUCache[bytes] = LRUCache(max_entries=HEATMAP_RENDER_CACHE_MAX_ENTRIES)
+
+
+def _draw_column(labels: tuple[str, ...], strengths: tuple[int, ...]) -> Figure:
+    """
+    Nx1 strength column with requirement labels. Built on a standalone Agg figure (no pyplot
+    state), so concurrent sessions never share a figure. Margins come from label lengths
+    rather than bbox_inches="tight", which would draw everything twice.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+
+    if not labels:
+        fig.set_size_inches(4, 1.5)
+        fig.text(0.1, 0.5, "No requirements to plot", fontsize=12)
+        return fig
+
+    left = 0.3 + 0.063 * max(len(s) for s in labels)  # 9pt labels
+    plot_w, cbar_w = 2.5, 1.0
+    plot_h = max(3.0, 0.45 * len(labels))
+    bottom, top = 0.45, 0.5
+    width, height = left + plot_w + cbar_w, bottom + plot_h + top
+    fig.set_size_inches(width, height)
+
+    ax = fig.add_axes((left / width, bottom / height, plot_w / width, plot_h / height))
+    cax = fig.add_axes(((left + plot_w + 0.1) / width, bottom / height, 0.12 / width, plot_h / height))
+
+    im = ax.imshow([[s] for s in strengths], aspect="auto", vmin=0, vmax=2)
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(labels, fontsize=9)
+    ax.set_xticks([0])
+    ax.set_xticklabels(["Alignment Strength"], fontsize=10)
+    for i, strength in enumerate(strengths):
+        ax.text(0, i, f"  {_STRENGTH_LABELS[strength]}", va="center")
+
+    cbar = fig.colorbar(im, cax=cax)
+    cbar.set_ticks([0, 1, 2])
+    cbar.set_ticklabels(list(_STRENGTH_LABELS))
+
+    ax.set_title("Resume ↔ Job Description Alignment Heatmap", fontsize=12, pad=10)
+    return fig
+
+
+def render_alignment_heatmap(
+    matches: list[RequirementMatch], *, fmt: str = "png", dpi: Optional[int] = None
+) -> bytes:
+    """Render (or fetch from the render cache) the heatmap as PNG bytes at dpi, or as SVG."""
+    if fmt not in HEATMAP_FORMATS:
+        raise ValueError(f"Unknown heatmap format: {fmt}")
+    dpi = (dpi or ALIGNMENT_HEATMAP_DPI) if fmt == "png" else None
+
+    labels = tuple(m.requirement for m in matches)
+    strengths = tuple(int(m.strength) for m in matches)
+    key = (labels, strengths, fmt, dpi)
+    cached = _RENDER_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    buf = BytesIO()
+    _draw_column(labels, strengths).savefig(buf, format=fmt, dpi=dpi or "figure")
+    out = buf.getvalue()
+    _RENDER_CACHE.put(key, out)
+    return out
+
+
+@traced("alignment.heatmap")
+def render_alignment_heatmap_png(matches: list[RequirementMatch], *, preview: bool = False) -> bytes:
+    """Full-resolution PNG, or a small fast one for inline display when preview=True."""
+    return render_alignment_heatmap(
+        matches, fmt="png", dpi=ALIGNMENT_HEATMAP_PREVIEW_DPI if preview else ALIGNMENT_HEATMAP_DPI
+    )
+
+
+def render_alignment_heatmap_svg(matches: list[RequirementMatch]) -> bytes:
+    return render_alignment_heatmap(matches, fmt="svg")
+
+
+def heatmap_render_cache_stats() -> CacheStats:
+    return _RENDER_CACHE.stats
+
+
+def clear_heatmap_render_cache() -> None:
+    _RENDER_CACHE.clear()
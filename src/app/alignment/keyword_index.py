@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Iterable
+
+
+def normalize_text(text: str) -> str:
+    # Same result as re.sub(r"\s+", " ", text).strip().lower(); str.split uses the same whitespace set.
+    return " ".join(text.split()).lower()
+
+
+def _is_word_char(ch: str) -> bool:
+    # Same definition as the `\w` class for str patterns.
+    return ch.isalnum() or ch == "_"
+
+
+def _is_boundary(text: str, i: int) -> bool:
+    """True where `\\b` would match at index i."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
+def _trie_pattern(node: dict[str, Any]) -> str:
+    """
+    Regex for a character trie. Branches are factored by shared prefixes, so the engine
+    follows one path per position instead of trying every keyword.
+    """
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # A keyword ends here: the rest of the path is optional so the shorter match still counts.
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    """
+    Compiles a set of keywords into one pattern and scans normalized text in a single pass.
+    Matching semantics are the same as the per-keyword search it replaces:
+    single-word keywords need a `\\b` on both ends, multi-word keywords match as plain substrings.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: tuple[str, ...] = tuple(sorted({normalize_text(k) for k in keywords if normalize_text(k)}))
+        self._needs_boundary = {k: " " not in k for k in self.keywords}
+
+        trie: dict[str, Any] = {}
+        for k in self.keywords:
+            node = trie
+            for ch in k:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+
+        # Zero-width lookahead so every start offset is tried, including overlapping matches.
+        # The capture is the longest keyword at that offset; shorter ones are its prefixes.
+        self._pattern = re.compile(f"(?=({_trie_pattern(trie)}))") if self.keywords else None
+        self._prefixes = {
+            k: [p for p in self.keywords if k.startswith(p)] for k in self.keywords
+        }
+
+    def find_all(self, text_norm: str) -> dict[str, list[int]]:
+        """Normalized keyword -> start offsets of every hit in text_norm (which must already be normalized)."""
+        hits: dict[str, list[int]] = {}
+        if self._pattern is None:
+            return hits
+
+        for m in self._pattern.finditer(text_norm):
+            longest = m.group(1)
+            if not longest:
+                continue
+            start = m.start()
+            for k in self._prefixes[longest]:
+                if self._needs_boundary[k] and not (
+                    _is_boundary(text_norm, start) and _is_boundary(text_norm, start + len(k))
+                ):
+                    continue
+                hits.setdefault(k, []).append(start)
+        return hits
+
+    def matched(self, text_norm: str) -> set[str]:
+        return set(self.find_all(text_norm))
+
+
+@lru_cache(maxsize=64)
+def _compiled(keywords: tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def keyword_matcher(keywords: Iterable[str]) -> KeywordMatcher:
+    """Shared, cached matcher: scoring many resumes against one JD compiles its keywords once."""
+    return _compiled(tuple(sorted({normalize_text(k) for k in keywords})))
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+
+from src.app.alignment.generate import RequirementMatch, score_requirements_against_resumes
+
+
+@dataclass(frozen=True)
+class AlignmentMatrix:
+    """
+    Candidates x requirements alignment for a shortlist scored against one JD.
+    Row i, column j is candidate i's match for requirement j.
+    """
+
+    candidates: tuple[str, ...]
+    requirements: tuple[str, ...]
+    scores: np.ndarray  # (M, N) continuous 0..1
+    strengths: np.ndarray  # (M, N) 0=Missing, 1=Partial, 2=Strong
+    matches: tuple[tuple[RequirementMatch, ...], ...]
+
+    @classmethod
+    def from_matches(
+        cls, candidates: Sequence[str], matches: Sequence[Sequence[RequirementMatch]]
+    ) -> AlignmentMatrix:
+        # Every candidate is scored against the same parsed requirements, so columns line up.
+        requirements = tuple(m.requirement for m in matches[0]) if matches else ()
+        return cls(
+            candidates=tuple(candidates),
+            requirements=requirements,
+            scores=np.asarray([[m.score for m in row] for row in matches], dtype=np.float64).reshape(
+                len(candidates), len(requirements)
+            ),
+            strengths=np.asarray([[m.strength for m in row] for row in matches], dtype=np.int8).reshape(
+                len(candidates), len(requirements)
+            ),
+            matches=tuple(tuple(row) for row in matches),
+        )
+
+    @property
+    def totals(self) -> np.ndarray:
+        """(M,) sum of scores per candidate."""
+        return self.scores.sum(axis=1)
+
+    @property
+    def coverage(self) -> np.ndarray:
+        """(M,) strength points earned over points possible, per candidate."""
+        n = len(self.requirements)
+        return self.strengths.sum(axis=1) / (2 * n) if n else np.zeros(len(self.candidates))
+
+    def reordered(self, rows: Sequence[int], cols: Sequence[int]) -> AlignmentMatrix:
+        rows_arr = np.asarray(rows, dtype=np.int64)
+        cols_arr = np.asarray(cols, dtype=np.int64)
+        return AlignmentMatrix(
+            candidates=tuple(self.candidates[i] for i in rows_arr),
+            requirements=tuple(self.requirements[j] for j in cols_arr),
+            scores=self.scores[np.ix_(rows_arr, cols_arr)],
+            strengths=self.strengths[np.ix_(rows_arr, cols_arr)],
+            matches=tuple(tuple(self.matches[i][j] for j in cols_arr) for i in rows_arr),
+        )
+
+    def sorted_by_total(self) -> AlignmentMatrix:
+        """Best candidates first, best-covered requirements first (ties keep input order)."""
+        rows = np.argsort(-self.totals, kind="stable")
+        cols = np.argsort(-self.scores.sum(axis=0), kind="stable")
+        return self.reordered(rows, cols)
+
+    def clustered(self) -> AlignmentMatrix:
+        """
+        Candidates with similar profiles next to each other (and likewise requirements met by
+        the same candidates), starting from the highest total, so blocks show up in the heatmap.
+        """
+        rows = _seriate(self.scores, start=int(np.argmax(self.totals)) if len(self.candidates) else 0)
+        col_totals = self.scores.sum(axis=0)
+        cols = _seriate(self.scores.T, start=int(np.argmax(col_totals)) if len(self.requirements) else 0)
+        return self.reordered(rows, cols)
+
+
+def _seriate(vectors: np.ndarray, *, start: int) -> np.ndarray:
+    """Greedy nearest-neighbour ordering of row vectors (Euclidean), beginning at start."""
+    n = len(vectors)
+    if n <= 2:
+        return np.argsort(-vectors.sum(axis=1), kind="stable") if n else np.zeros(0, dtype=np.int64)
+
+    sq = (vectors**2).sum(axis=1)
+    dist = sq[:, None] + sq[None, :] - 2.0 * vectors @ vectors.T
+    visited = np.zeros(n, dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        d = np.where(visited, np.inf, dist[order[-1]])
+        nxt = int(np.argmin(d))
+        order.append(nxt)
+        visited[nxt] = True
+    return np.asarray(order, dtype=np.int64)
+
+
+def score_alignment_matrix(
+    requirements: list[dict[str, Any]],
+    resumes: Sequence[tuple[str, str]],
+    *,
+    mode: str = "keyword",
+) -> AlignmentMatrix:
+    """Score (name, resume_text) pairs against one requirement list into an M x N matrix."""
+    matches = score_requirements_against_resumes(requirements, [text for _, text in resumes], mode=mode)
+    return AlignmentMatrix.from_matches([name for name, _ in resumes], matches)
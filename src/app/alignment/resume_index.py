@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Iterable, Optional
+
+from src.app.alignment.bm25 import TermMatrix
+from src.app.alignment.keyword_index import normalize_text
+
+
+@dataclass(frozen=True)
+class ResumeIndex:
+    """
+    Per-resume preprocessing shared by scoring and evidence lookup, built once per resume.
+
+    norm is the normalized full text; it equals " ".join(lines_norm), so an offset into norm
+    maps back to its source line through line_starts.
+    """
+
+    text: str
+    lines: tuple[str, ...]  # stripped, non-empty original lines
+    lines_norm: tuple[str, ...]
+    line_starts: tuple[int, ...]  # offset of each normalized line within norm
+    norm: str
+
+    @classmethod
+    def build(cls, text: str) -> ResumeIndex:
+        lines = tuple(ln.strip() for ln in text.splitlines() if ln.strip())
+        lines_norm = tuple(normalize_text(ln) for ln in lines)
+
+        starts: list[int] = []
+        offset = 0
+        for ln in lines_norm:
+            starts.append(offset)
+            offset += len(ln) + 1
+
+        return cls(
+            text=text,
+            lines=lines,
+            lines_norm=lines_norm,
+            line_starts=tuple(starts),
+            norm=" ".join(lines_norm),
+        )
+
+    def line_at(self, offset: int) -> int:
+        """Index of the line containing norm[offset]."""
+        return bisect_right(self.line_starts, offset) - 1
+
+    @cached_property
+    def terms(self) -> TermMatrix:
+        """Line x term matrix for BM25 scoring (built on first use)."""
+        return TermMatrix.build(self.lines_norm)
+
+    @cached_property
+    def flat_text(self) -> str:
+        return self.text.strip().replace("\n", " ")
+
+    def first_line_containing(self, needles_norm: Iterable[str]) -> Optional[int]:
+        """
+        Earliest line whose normalized text contains any needle as a plain substring.
+        Searches norm directly and skips occurrences that straddle two lines.
+        """
+        best: Optional[int] = None
+        for k in needles_norm:
+            if not self.lines:
+                break
+            pos = self.norm.find(k)
+            while pos != -1:
+                line = self.line_at(pos)
+                if best is not None and line >= best:
+                    break
+                if pos + len(k) <= self.line_starts[line] + len(self.lines_norm[line]):
+                    best = line
+                    break
+                pos = self.norm.find(k, pos + 1)
+        return best
+
+
+@lru_cache(maxsize=16)
+def resume_index(text: str) -> ResumeIndex:
+    """Cached ResumeIndex.build; Streamlit reruns and multi-mode runs reuse the same index."""
+    return ResumeIndex.build(text)
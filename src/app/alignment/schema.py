@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class Requirement(BaseModel):
+    requirement: str
+    keywords: list[str]
+
+
+class RequirementsOutput(BaseModel):
+    requirements: list[Requirement]
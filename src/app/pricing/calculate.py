@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any
+
 from src.app.settings import ALLOWED_MODELS
 
 MODEL_PRICING_PER_1M: dict[str, tuple[float, float]] = {
@@ -10,6 +12,14 @@ MODEL_PRICING_PER_1M: dict[str, tuple[float, float]] = {
     "gpt-3.5-turbo": (0.50, 1.50),
 }
 
+# Input tokens served from the provider's prompt cache (a repeated prompt prefix).
+# Models without an entry bill cached tokens at the normal input price.
+MODEL_CACHED_INPUT_PRICING_PER_1M: dict[str, float] = {
+    "gpt-4.1-mini": 0.10,
+    "gpt-4o-mini": 0.075,
+    "gpt-4.1-nano": 0.025,
+}
+
 # Safety check: no drift allowed
 _missing_pricing = set(ALLOWED_MODELS) - set(MODEL_PRICING_PER_1M.keys())
 if _missing_pricing:
@@ -25,19 +35,44 @@ class CostBreakdown:
     input_cost_usd: float
     output_cost_usd: float
     total_cost_usd: float
+    saved_cost_usd: float = 0.0  # cost avoided because the response came from cache
+    cached_prompt_tokens: int = 0  # part of prompt_tokens read from the provider's prompt cache
+    prompt_cache_saved_usd: float = 0.0  # input cost avoided by cached_prompt_tokens
 
 
 def estimate_cost(
-    model: str, prompt_tokens: int, completion_tokens: int
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    *,
+    cached: bool = False,
+    cached_prompt_tokens: int = 0,
 ) -> CostBreakdown:
 
     if model not in MODEL_PRICING_PER_1M:
         raise ValueError(f"No pricing configured for model: {model}")
 
     in_price, out_price = MODEL_PRICING_PER_1M[model]
+    cached_in_price = MODEL_CACHED_INPUT_PRICING_PER_1M.get(model, in_price)
+    cached_prompt_tokens = min(cached_prompt_tokens, prompt_tokens)
 
-    input_cost = (prompt_tokens / 1_000_000) * in_price
+    input_cost = (
+        (prompt_tokens - cached_prompt_tokens) * in_price + cached_prompt_tokens * cached_in_price
+    ) / 1_000_000
     output_cost = (completion_tokens / 1_000_000) * out_price
+    prompt_cache_saved = cached_prompt_tokens * (in_price - cached_in_price) / 1_000_000
+
+    if cached:
+        # Usage is replayed from the original call; nothing is billed this time.
+        return CostBreakdown(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            input_cost_usd=0.0,
+            output_cost_usd=0.0,
+            total_cost_usd=0.0,
+            saved_cost_usd=input_cost + output_cost,
+            cached_prompt_tokens=cached_prompt_tokens,
+        )
 
     return CostBreakdown(
         prompt_tokens=prompt_tokens,
@@ -45,4 +80,43 @@ def estimate_cost(
         input_cost_usd=input_cost,
         output_cost_usd=output_cost,
         total_cost_usd=input_cost + output_cost,
+        cached_prompt_tokens=cached_prompt_tokens,
+        prompt_cache_saved_usd=prompt_cache_saved,
+    )
+
+
+def cost_from_usage(model: str, usage: Any, *, cached: bool = False) -> CostBreakdown:
+    """
+    estimate_cost from an API usage object (None counts as zero), including
+    prompt_tokens_details.cached_tokens when the provider reports a prompt-cache hit.
+    """
+    details = getattr(usage, "prompt_tokens_details", None)
+    return estimate_cost(
+        model,
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+        cached=cached,
+        cached_prompt_tokens=getattr(details, "cached_tokens", 0) or 0,
+    )
+
+
+def estimate_cache_savings(saved_tokens: dict[str, tuple[int, int]]) -> float:
+    """Dollars saved by cache hits, from per-model (prompt, completion) token totals."""
+    return sum(
+        estimate_cost(model, p, c).total_cost_usd
+        for model, (p, c) in saved_tokens.items()
+        if model in MODEL_PRICING_PER_1M
+    )
+
+
+def combine_costs(costs: list[CostBreakdown]) -> CostBreakdown:
+    return CostBreakdown(
+        prompt_tokens=sum(c.prompt_tokens for c in costs),
+        completion_tokens=sum(c.completion_tokens for c in costs),
+        input_cost_usd=sum(c.input_cost_usd for c in costs),
+        output_cost_usd=sum(c.output_cost_usd for c in costs),
+        total_cost_usd=sum(c.total_cost_usd for c in costs),
+        saved_cost_usd=sum(c.saved_cost_usd for c in costs),
+        cached_prompt_tokens=sum(c.cached_prompt_tokens for c in costs),
+        prompt_cache_saved_usd=sum(c.prompt_cache_saved_usd for c in costs),
     )
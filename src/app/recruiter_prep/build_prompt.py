@@ -1,9 +1,16 @@
 from __future__ import annotations
 
 import json
-from typing import Sequence
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Sequence
 
 from src.app.recruiter_prep.prompts.few_shot_example import recruiter_prep_one_item_example
+from src.app.recruiter_prep.prompts.prompt_guardrails import guardrail_system_instructions
+from src.app.recruiter_prep.prompts.system_prompts import SYSTEM_PROMPTS
+from src.app.recruiter_prep.schema import QAItem, RecruiterPrepOutput
+from src.helpers.prompt_templates import register_template
+from src.helpers.structured_output import json_schema_response_format, strict_json_schema
 
 CATEGORIES: Sequence[str] = [
     "Background walkthrough",
@@ -18,6 +25,60 @@ CATEGORIES: Sequence[str] = [
     "Logistics (compensation, location, timeline)",
 ]
 
+CATEGORIES_JSON = json.dumps(list(CATEGORIES), indent=2)
+
+FEW_SHOT_PROMPT_KEY = "few_shot"
+
+
+def _static_prefix(system_prompt_key: str) -> str:
+    """
+    Everything in a request that doesn't depend on the job or the resume, for one prompt strategy:
+    base + strategy prompt, guardrails, the few-shot example (few_shot only), the task and the categories.
+    """
+    parts = [SYSTEM_PROMPTS[system_prompt_key], guardrail_system_instructions()]
+    if system_prompt_key == FEW_SHOT_PROMPT_KEY:
+        parts.append(
+            "## Example\n"
+            "Here is an example of the expected JSON format and tone (1 item only):\n\n"
+            f"{recruiter_prep_one_item_example()}\n\n"
+            "Use the same format and style for your output."
+        )
+    parts.append(
+        "## Task\n"
+        "You will generate EXACTLY 10 technical recruiter screen Q&A items "
+        "from the job context and resume evidence in the user message.\n\n"
+        "## Required categories\n"
+        "Use each category exactly once, in this exact order:\n"
+        f"{CATEGORIES_JSON}"
+    )
+    return "\n\n".join(parts)
+
+
+# Built once at import: the system message is byte-identical across requests for a strategy,
+# and it leads the request, so the provider can serve it from its prompt-prefix cache.
+STATIC_PREFIXES: Mapping[str, str] = MappingProxyType({key: _static_prefix(key) for key in SYSTEM_PROMPTS})
+
+
+def recruiter_prep_system_prompt(system_prompt_key: str) -> str:
+    prefix = STATIC_PREFIXES.get(system_prompt_key)
+    if prefix is None:
+        raise ValueError(f"Unknown system_prompt_key: {system_prompt_key}")
+    return prefix
+
+
+_USER_PROMPT = register_template(
+    "recruiter_prep.user",
+    '''## Context Inputs
+- Job Title: {job_title}
+- Candidate Level: {level}
+- Company Type: {company_type}
+- Job Description: {job_desc}
+
+## Resume Evidence (source of truth)
+"""{resume_text}"""''',
+)
+
+
 def build_recruiter_prep_user_prompt(
     *,
     job_title: str,
@@ -25,31 +86,77 @@ def build_recruiter_prep_user_prompt(
     level: str,
     company_type: str,
     resume_text: str,
-    use_few_shot: bool,
 ) -> str:
-    example_block = ""
-    if use_few_shot:
-        example_block = f"""
-Here is an example of the expected JSON format and tone (1 item only):
+    """Only the per-request content, resume last (the most variable part)."""
+    return _USER_PROMPT.render(
+        job_title=job_title,
+        job_desc=job_desc,
+        level=level,
+        company_type=company_type,
+        resume_text=resume_text,
+    )
 
-{recruiter_prep_one_item_example()}
 
-Use the same format and style for your output.
-"""
+@lru_cache(maxsize=64)
+def recruiter_prep_response_format(categories: tuple[str, ...] = tuple(CATEGORIES)) -> dict[str, Any]:
+    """
+    Structured Outputs format derived from RecruiterPrepOutput: exactly one item per category,
+    with category restricted to the given names. Cached; treat the result as read-only.
+    """
+    schema = strict_json_schema(RecruiterPrepOutput)
+    schema["properties"]["questions"].update(minItems=len(categories), maxItems=len(categories))
+    schema["$defs"]["QAItem"]["properties"]["category"]["enum"] = list(categories)
+    return json_schema_response_format("recruiter_prep", schema)
 
-    return f"""{example_block}
-You will generate EXACTLY 10 technical recruiter screen Q&A items.
 
-## Context Inputs
-- Job Title: {job_title}
-- Candidate Level: {level}
-- Company Type: {company_type}
-- Job Description: {job_desc}
+_REPAIR_PROMPT = register_template(
+    "recruiter_prep.repair",
+    """{user_prompt}
 
-## Resume Evidence (source of truth)
-\"\"\"{resume_text}\"\"\"
+## Repair
+An earlier answer was missing these categories or had invalid items for them.
+Return ONLY these {count} items, one per category, in this order:
+{categories_json}""",
+)
+
+
+def build_recruiter_prep_repair_prompt(user_prompt: str, categories: Sequence[str]) -> str:
+    """The original user prompt plus a request for just the given categories (system prompt unchanged)."""
+    return _REPAIR_PROMPT.render(
+        user_prompt=user_prompt,
+        count=len(categories),
+        categories_json=json.dumps(list(categories), indent=2),
+    )
 
-## Required categories
-Use each category exactly once, in this exact order:
-{json.dumps(list(CATEGORIES), indent=2)}
-""".strip()
+
+_REGENERATE_PROMPT = register_template(
+    "recruiter_prep.regenerate",
+    """{user_prompt}
+
+## Regenerate one item
+These answers stay as they are. Keep the new item consistent with them and don't reuse their examples:
+{other_items_json}
+
+Replace the current "{category}" item with a new, stronger one (a different question and answer):
+{current_item_json}
+
+Return ONLY 1 item, for the category "{category}".""",
+)
+
+
+def build_recruiter_prep_regenerate_prompt(
+    user_prompt: str, category: str, current: Optional[QAItem], others: Sequence[QAItem]
+) -> str:
+    """
+    The original user prompt (so the provider's prompt cache still covers system + user) followed
+    by the other answers in compact form and the item to replace.
+    """
+    return _REGENERATE_PROMPT.render(
+        user_prompt=user_prompt,
+        category=category,
+        other_items_json=json.dumps(
+            [{"category": q.category, "question": q.question, "answer": q.answer} for q in others],
+            ensure_ascii=False,
+        ),
+        current_item_json=current.model_dump_json() if current is not None else "(none)",
+    )
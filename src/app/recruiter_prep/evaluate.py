@@ -0,0 +1,220 @@
+"""
+Prompt strategy evaluation: run every SYSTEM_PROMPTS variant (optionally on several models)
+against one job + resume concurrently and compare latency, tokens and cost side by side.
+
+    python -m src.app.recruiter_prep.evaluate --title "ML Engineer" --jd jd.txt --resume cv.pdf \\
+        --models gpt-4o-mini gpt-4.1-nano --out comparison.csv
+
+Variants run in a thread pool of PROMPT_EVAL_MAX_PARALLEL, so wall time is about one
+round-trip per batch of that size rather than one per variant. Their requests go through
+call_open_ai_pooled, so they share one connection pool and the LLM_MAX_IN_FLIGHT limit.
+Results are yielded as they land; the table is written at the end (.csv, .jsonl or .md,
+by extension).
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+from src.app.pricing.calculate import CostBreakdown, combine_costs
+from src.app.recruiter_prep.build_prompt import CATEGORIES
+from src.app.recruiter_prep.generate import GenerationResult, generate_recruiter_prep
+from src.app.recruiter_prep.prompts.system_prompts import SYSTEM_PROMPTS
+from src.app.settings import ALLOWED_COMPANY_TYPES, ALLOWED_LEVELS, ALLOWED_MODELS, PROMPT_EVAL_MAX_PARALLEL
+from src.helpers.pdf_extract import extract_text_from_pdf
+
+
+@dataclass(frozen=True)
+class VariantResult:
+    model: str
+    system_prompt_key: str
+    latency_seconds: float
+    result: Optional[GenerationResult] = None
+    error: str = ""
+
+    @property
+    def cost(self) -> Optional[CostBreakdown]:
+        return self.result.cost if self.result else None
+
+    def to_row(self) -> dict[str, Any]:
+        questions = self.result.output.questions if self.result else []
+        cost = self.cost
+        return {
+            "model": self.model,
+            "strategy": self.system_prompt_key,
+            "latency_s": round(self.latency_seconds, 3),
+            "prompt_tokens": cost.prompt_tokens if cost else 0,
+            "completion_tokens": cost.completion_tokens if cost else 0,
+            "cached_prompt_tokens": cost.cached_prompt_tokens if cost else 0,
+            "cost_usd": round(cost.total_cost_usd, 6) if cost else 0.0,
+            "items": len(questions),
+            "categories_in_order": [q.category for q in questions] == list(CATEGORIES),
+            "repaired_items": len(self.result.repaired) if self.result else 0,
+            "avg_answer_words": (
+                round(sum(len(q.answer.split()) for q in questions) / len(questions), 1) if questions else 0.0
+            ),
+            "error": self.error,
+        }
+
+
+@dataclass(frozen=True)
+class EvaluationRun:
+    results: tuple[VariantResult, ...]
+    wall_seconds: float
+
+    @property
+    def sequential_seconds(self) -> float:
+        """What the same calls would have taken back to back."""
+        return sum(r.latency_seconds for r in self.results)
+
+    @property
+    def total_cost(self) -> CostBreakdown:
+        return combine_costs([r.cost for r in self.results if r.cost is not None])
+
+
+def _run_variant(model: str, system_prompt_key: str, kwargs: dict[str, Any]) -> VariantResult:
+    # Runs in a worker thread; errors are captured so one failing variant doesn't sink the rest.
+    start = time.perf_counter()
+    try:
+        result = generate_recruiter_prep(model=model, system_prompt_key=system_prompt_key, pooled=True, **kwargs)
+        return VariantResult(model, system_prompt_key, time.perf_counter() - start, result=result)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return VariantResult(model, system_prompt_key, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+
+
+def iter_prompt_variants(
+    *,
+    models: Sequence[str],
+    temperature: float,
+    job_title: str,
+    job_desc: str,
+    level: str,
+    company_type: str,
+    resume_text: str,
+    system_prompt_keys: Optional[Sequence[str]] = None,
+    max_parallel: int = PROMPT_EVAL_MAX_PARALLEL,
+    use_cache: bool = False,
+) -> Iterator[VariantResult]:
+    """
+    Yield one VariantResult per (model, strategy) in completion order. The response cache is
+    bypassed by default so latencies are real round-trips.
+    """
+    keys = list(system_prompt_keys) if system_prompt_keys else list(SYSTEM_PROMPTS)
+    unknown = [k for k in keys if k not in SYSTEM_PROMPTS] + [m for m in models if m not in ALLOWED_MODELS]
+    if unknown:
+        raise ValueError(f"Unknown models or system_prompt_keys: {unknown}")
+
+    kwargs = {
+        "temperature": temperature,
+        "job_title": job_title,
+        "job_desc": job_desc,
+        "level": level,
+        "company_type": company_type,
+        "resume_text": resume_text,
+        "use_cache": use_cache,
+    }
+    jobs = [(m, k) for m in models for k in keys]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(jobs)))) as pool:
+        futures = [pool.submit(_run_variant, m, k, kwargs) for m, k in jobs]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def evaluate_prompt_variants(**kwargs: Any) -> EvaluationRun:
+    """iter_prompt_variants collected into a run, in (model, strategy) order."""
+    start = time.perf_counter()
+    results = list(iter_prompt_variants(**kwargs))
+    return EvaluationRun(results=tuple(sort_results(results)), wall_seconds=time.perf_counter() - start)
+
+
+def sort_results(results: Sequence[VariantResult]) -> list[VariantResult]:
+    model_order = {m: i for i, m in enumerate(ALLOWED_MODELS)}
+    key_order = {k: i for i, k in enumerate(SYSTEM_PROMPTS)}
+    return sorted(results, key=lambda r: (model_order.get(r.model, 99), key_order.get(r.system_prompt_key, 99)))
+
+
+def comparison_rows(results: Sequence[VariantResult]) -> list[dict[str, Any]]:
+    return [r.to_row() for r in sort_results(results)]
+
+
+def format_markdown_table(rows: Sequence[dict[str, Any]]) -> str:
+    if not rows:
+        return ""
+    headers = list(rows[0])
+    lines = ["| " + " | ".join(headers) + " |", "|" + "|".join("---" for _ in headers) + "|"]
+    lines += ["| " + " | ".join(str(row[h]) for h in headers) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def write_comparison(results: Sequence[VariantResult], out_path: str) -> None:
+    rows = comparison_rows(results)
+    if out_path.endswith(".jsonl"):
+        with open(out_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+    if out_path.endswith(".md"):
+        Path(out_path).write_text(format_markdown_table(rows) + "\n", encoding="utf-8")
+        return
+
+    fieldnames = list(VariantResult(model="", system_prompt_key="", latency_seconds=0.0).to_row())
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare recruiter-prep prompt strategies side by side.")
+    parser.add_argument("--title", required=True, help="Job title")
+    parser.add_argument("--jd", required=True, help="Path to a text file with the job description")
+    parser.add_argument("--resume", required=True, help="Resume PDF (or .txt)")
+    parser.add_argument("--out", default=None, help="Comparison table (.csv, .jsonl or .md)")
+    parser.add_argument("--models", nargs="+", default=[ALLOWED_MODELS[0]], choices=ALLOWED_MODELS)
+    parser.add_argument("--strategies", nargs="+", default=None, choices=list(SYSTEM_PROMPTS))
+    parser.add_argument("--level", default=ALLOWED_LEVELS[2], choices=ALLOWED_LEVELS)
+    parser.add_argument("--company-type", default=ALLOWED_COMPANY_TYPES[0], choices=ALLOWED_COMPANY_TYPES)
+    parser.add_argument("--temperature", type=float, default=0.7)
+    parser.add_argument("--parallel", type=int, default=PROMPT_EVAL_MAX_PARALLEL)
+    args = parser.parse_args(argv)
+
+    resume_path = Path(args.resume)
+    resume_text = (
+        extract_text_from_pdf(resume_path.read_bytes())
+        if resume_path.suffix.lower() == ".pdf"
+        else resume_path.read_text(encoding="utf-8")
+    )
+
+    run = evaluate_prompt_variants(
+        models=args.models,
+        system_prompt_keys=args.strategies,
+        temperature=args.temperature,
+        job_title=args.title,
+        job_desc=Path(args.jd).read_text(encoding="utf-8"),
+        level=args.level,
+        company_type=args.company_type,
+        resume_text=resume_text,
+        max_parallel=args.parallel,
+    )
+
+    print(format_markdown_table(comparison_rows(run.results)))
+    if args.out:
+        write_comparison(run.results, args.out)
+    failed = sum(1 for r in run.results if r.error)
+    print(
+        f"{len(run.results)} variants ({failed} failed) in {run.wall_seconds:.2f}s wall "
+        f"vs {run.sequential_seconds:.2f}s back to back • total ${run.total_cost.total_cost_usd:.6f}",
+        file=sys.stderr,
+    )
+    return 0 if failed < len(run.results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
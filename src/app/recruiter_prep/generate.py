@@ -1,64 +1,350 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import dataclasses
+import functools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Mapping, Optional
 
-from src.helpers.openai_client import call_open_ai
-from src.app.pricing.calculate import CostBreakdown, estimate_cost
-from src.app.recruiter_prep.prompts.prompt_guardrails import guardrail_system_instructions
-from src.app.recruiter_prep.prompts.system_prompts import SYSTEM_PROMPTS
-from src.app.recruiter_prep.build_prompt import build_recruiter_prep_user_prompt
-from src.app.recruiter_prep.schema import RecruiterPrepOutput
+from pydantic import ValidationError
+
+from src.helpers.openai_client import call_open_ai, call_open_ai_pooled, call_open_ai_stream, is_cached_response
+from src.app.pricing.calculate import CostBreakdown, combine_costs, cost_from_usage, estimate_cost
+from src.app.recruiter_prep.build_prompt import (
+    build_recruiter_prep_repair_prompt,
+    build_recruiter_prep_user_prompt,
+    recruiter_prep_response_format,
+    recruiter_prep_system_prompt,
+)
+from src.app.recruiter_prep.prompt_budget import BudgetedPrompts, PromptBudgetReport, fit_prompt_to_budget
+from src.app.recruiter_prep.repair import (
+    ParsedOutput,
+    collect_items,
+    merge_items,
+    parse_recruiter_prep_output,
+    response_content,
+)
+from src.app.recruiter_prep.schema import QAItem, RecruiterPrepOutput
+from src.app.recruiter_prep.stream_parse import QuestionsArrayParser
+from src.app.settings import PROMPT_INPUT_TOKEN_BUDGET, RECRUITER_PREP_REPAIR_ATTEMPTS
+from src.helpers.token_count import count_tokens
+from src.helpers.tracing import record_span, span, traced
 
 
 @dataclass(frozen=True)
 class GenerationResult:
     output: RecruiterPrepOutput
     cost: CostBreakdown
+    budget: Optional[PromptBudgetReport] = None  # pre-send token count and cost estimate
+    repaired: tuple[str, ...] = ()  # categories re-requested because they were missing or invalid
+    missing: tuple[str, ...] = ()  # categories still missing after repair
+    item_costs: Mapping[str, CostBreakdown] = field(default_factory=dict)  # per category, see allocate_item_costs
 
 
-def generate_recruiter_prep(
+def build_recruiter_prep_prompts(
     *,
-    model: str,
     system_prompt_key: str,
-    temperature: float,
     job_title: str,
     job_desc: str,
     level: str,
     company_type: str,
     resume_text: str,
-) -> GenerationResult:
-
-    system_prompt = SYSTEM_PROMPTS.get(system_prompt_key)
-    if not system_prompt:
-        raise ValueError(f"Unknown system_prompt_key: {system_prompt_key}")
-
-    use_few_shot = (system_prompt_key == "few_shot")
-
+) -> tuple[str, str]:
+    """
+    Returns (system_prompt, user_prompt) for the selected prompt strategy.
+    The system prompt is the strategy's precomputed static prefix; only the user prompt varies.
+    """
+    system_prompt = recruiter_prep_system_prompt(system_prompt_key)
     user_prompt = build_recruiter_prep_user_prompt(
         job_title=job_title,
         job_desc=job_desc,
         level=level,
         company_type=company_type,
         resume_text=resume_text,
-        use_few_shot=use_few_shot,
     )
+    return system_prompt, user_prompt
+
+
+def build_budgeted_recruiter_prep_prompts(
+    *,
+    model: str,
+    system_prompt_key: str,
+    job_title: str,
+    job_desc: str,
+    level: str,
+    company_type: str,
+    resume_text: str,
+    budget_tokens: int = PROMPT_INPUT_TOKEN_BUDGET,
+) -> BudgetedPrompts:
+    """build_recruiter_prep_prompts, with the resume (and if needed the JD) fitted to the model's input budget."""
+    def render(jd: str, resume: str) -> tuple[str, str]:
+        return build_recruiter_prep_prompts(
+            system_prompt_key=system_prompt_key,
+            job_title=job_title,
+            job_desc=jd,
+            level=level,
+            company_type=company_type,
+            resume_text=resume,
+        )
+
+    return fit_prompt_to_budget(
+        model=model,
+        render=render,
+        job_desc=job_desc,
+        resume_text=resume_text,
+        budget_tokens=budget_tokens,
+    )
+
+
+def allocate_item_costs(
+    model: str, output: RecruiterPrepOutput, cost: CostBreakdown, *, cached: bool = False
+) -> dict[str, CostBreakdown]:
+    """
+    Attribute a batch's usage to its items: the shared prompt evenly, completion tokens in
+    proportion to each item's own token count.
+    """
+    items = output.questions
+    if not items:
+        return {}
+    weights = [count_tokens(item.model_dump_json(), model) for item in items]
+    total = sum(weights) or 1
+    return {
+        item.category: estimate_cost(
+            model,
+            cost.prompt_tokens // len(items),
+            round(cost.completion_tokens * w / total),
+            cached=cached,
+            cached_prompt_tokens=cost.cached_prompt_tokens // len(items),
+        )
+        for item, w in zip(items, weights)
+    }
+
+
+def _repair_items(
+    categories: tuple[str, ...],
+    *,
+    model: str,
+    prompts: BudgetedPrompts,
+    temperature: float,
+    use_cache: bool = True,
+    pooled: bool = False,
+) -> tuple[Mapping[str, QAItem], CostBreakdown]:
+    """
+    Re-request only the given categories. The system prompt is unchanged, so its cached
+    prefix still applies; the schema only admits those categories.
+    """
+    call = call_open_ai_pooled if pooled else call_open_ai
+    with span("recruiter_prep.repair", categories=len(categories)):
+        resp = call(
+            model=model,
+            system_prompt=prompts.system_prompt,
+            user_prompt=build_recruiter_prep_repair_prompt(prompts.user_prompt, categories),
+            temperature=temperature,
+            use_cache=use_cache,
+            response_format=recruiter_prep_response_format(categories),
+        )
+        parsed = parse_recruiter_prep_output(response_content(resp), categories)
+    return parsed.items, cost_from_usage(model, resp.usage, cached=is_cached_response(resp))
+
+
+RepairFn = Callable[[tuple[str, ...]], tuple[Mapping[str, QAItem], CostBreakdown]]
+
+
+def _complete_output(parsed: ParsedOutput, cost: CostBreakdown, repair: RepairFn) -> GenerationResult:
+    """Fill missing categories via repair (up to RECRUITER_PREP_REPAIR_ATTEMPTS rounds) and merge in order."""
+    items = dict(parsed.items)
+    missing = parsed.missing
+    costs = [cost]
+    for _ in range(RECRUITER_PREP_REPAIR_ATTEMPTS):
+        if not missing:
+            break
+        repaired, repair_cost = repair(missing)
+        items.update(repaired)
+        costs.append(repair_cost)
+        missing = tuple(c for c in missing if c not in items)
+
+    if not items:
+        raise ValueError("The model returned no valid recruiter-prep items.")
+    return GenerationResult(
+        output=merge_items(items),
+        cost=combine_costs(costs),
+        repaired=tuple(c for c in parsed.missing if c in items),
+        missing=missing,
+    )
+
 
-    system_with_guardrails = f"{system_prompt}\n\n{guardrail_system_instructions()}"
+@traced("recruiter_prep.generate")
+def generate_recruiter_prep(
+    *,
+    model: str,
+    system_prompt_key: str,
+    temperature: float,
+    job_title: str,
+    job_desc: str,
+    level: str,
+    company_type: str,
+    resume_text: str,
+    use_cache: bool = True,
+    pooled: bool = False,
+) -> GenerationResult:
+    """
+    One non-streaming generation, with missing categories repaired. pooled=True sends the
+    requests through call_open_ai_pooled, for callers that fan out many generations at once.
+    """
+    call = call_open_ai_pooled if pooled else call_open_ai
+
+    with span("prompt.build"):
+        prompts = build_budgeted_recruiter_prep_prompts(
+            model=model,
+            system_prompt_key=system_prompt_key,
+            job_title=job_title,
+            job_desc=job_desc,
+            level=level,
+            company_type=company_type,
+            resume_text=resume_text,
+        )
 
-    resp = call_open_ai(
+    resp = call(
         model=model,
-        system_prompt=system_with_guardrails,
-        user_prompt=user_prompt,
+        system_prompt=prompts.system_prompt,
+        user_prompt=prompts.user_prompt,
         temperature=temperature,
+        use_cache=use_cache,
+        response_format=recruiter_prep_response_format(),
+    )
+
+    with span("recruiter_prep.parse"):
+        parsed = parse_recruiter_prep_output(response_content(resp))
+
+    cost = cost_from_usage(model, resp.usage, cached=is_cached_response(resp))
+    repair = functools.partial(
+        _repair_items, model=model, prompts=prompts, temperature=temperature, use_cache=use_cache, pooled=pooled
     )
+    result = _complete_output(parsed, cost, repair)
+    return dataclasses.replace(
+        result,
+        budget=prompts.report,
+        item_costs=allocate_item_costs(model, result.output, result.cost, cached=is_cached_response(resp)),
+    )
+
+
+class RecruiterPrepStream:
+    """
+    Iterate to receive each validated QAItem as soon as its JSON object closes. Items that fail
+    validation are skipped and re-requested once the stream ends; repaired items come last.
+    Once exhausted, .result holds the full validated output and cost (same as generate_recruiter_prep).
+    """
+
+    def __init__(
+        self,
+        model: str,
+        chunks,
+        budget: Optional[PromptBudgetReport] = None,
+        repair: Optional[RepairFn] = None,
+    ) -> None:
+        self.model = model
+        self.budget = budget
+        self.result: Optional[GenerationResult] = None
+        self._chunks = chunks
+        self._repair = repair
 
-    content = resp.choices[0].message.content
-    data = json.loads(content)
-    parsed = RecruiterPrepOutput.model_validate(data)
+    def __iter__(self) -> Iterator[QAItem]:
+        parser: Optional[QuestionsArrayParser] = QuestionsArrayParser()
+        text: list[str] = []
+        streamed: list[QAItem] = []
+        usage = None
+        # Time waiting on the network vs parsing is summed by hand: the caller runs between yields.
+        start = time.perf_counter()
+        waited = parsing = 0.0
+        chunks = iter(self._chunks)
 
-    prompt_tokens = getattr(resp.usage, "prompt_tokens", 0) or 0
-    completion_tokens = getattr(resp.usage, "completion_tokens", 0) or 0
-    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        while True:
+            t0 = time.perf_counter()
+            chunk = next(chunks, None)
+            t1 = time.perf_counter()
+            waited += t1 - t0
+            if chunk is None:
+                break
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            text.append(delta)
+            items = []
+            if parser is not None:
+                try:
+                    items = _valid_items(parser.feed(delta))
+                except ValueError:
+                    # Malformed JSON (possible in JSON mode): stop yielding item by item and
+                    # leave the rest to the salvage and repair below.
+                    parser = None
+            parsing += time.perf_counter() - t1
+            streamed.extend(items)
+            yield from items
 
-    return GenerationResult(output=parsed, cost=cost)
+        t0 = time.perf_counter()
+        parsed = parse_recruiter_prep_output("".join(text))
+        if parser is None:
+            # The full text no longer parses as a whole; keep what the caller has already seen.
+            parsed = collect_items([*streamed, *parsed.items.values()])
+        parsing += time.perf_counter() - t0
+        record_span("llm.stream", start, waited)
+        record_span("recruiter_prep.parse", start, parsing)
+
+        cost = cost_from_usage(self.model, usage)
+        if self._repair is None or not parsed.missing:
+            self.result = GenerationResult(output=merge_items(parsed.items), cost=cost, missing=parsed.missing)
+        else:
+            self.result = _complete_output(parsed, cost, self._repair)
+            yield from (item for item in self.result.output.questions if item.category in self.result.repaired)
+        self.result = dataclasses.replace(
+            self.result,
+            budget=self.budget,
+            item_costs=allocate_item_costs(self.model, self.result.output, self.result.cost),
+        )
+
+
+def _valid_items(raw_items: list[dict[str, Any]]) -> list[QAItem]:
+    items = []
+    for raw in raw_items:
+        try:
+            items.append(QAItem.model_validate(raw))
+        except ValidationError:
+            continue  # re-requested after the stream
+    return items
+
+
+def stream_recruiter_prep(
+    *,
+    model: str,
+    system_prompt_key: str,
+    temperature: float,
+    job_title: str,
+    job_desc: str,
+    level: str,
+    company_type: str,
+    resume_text: str,
+) -> RecruiterPrepStream:
+    with span("prompt.build"):
+        prompts = build_budgeted_recruiter_prep_prompts(
+            model=model,
+            system_prompt_key=system_prompt_key,
+            job_title=job_title,
+            job_desc=job_desc,
+            level=level,
+            company_type=company_type,
+            resume_text=resume_text,
+        )
+
+    chunks = call_open_ai_stream(
+        model=model,
+        system_prompt=prompts.system_prompt,
+        user_prompt=prompts.user_prompt,
+        temperature=temperature,
+        response_format=recruiter_prep_response_format(),
+    )
+    repair = functools.partial(_repair_items, model=model, prompts=prompts, temperature=temperature)
+    return RecruiterPrepStream(model, chunks, budget=prompts.report, repair=repair)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from src.app.alignment.bm25 import TermMatrix, bm25_line_scores
+from src.app.alignment.keyword_index import normalize_text
+from src.app.pricing.calculate import CostBreakdown, estimate_cost
+from src.app.settings import (
+    PROMPT_INPUT_TOKEN_BUDGET,
+    PROMPT_MIN_RESUME_SHARE,
+    RECRUITER_PREP_EXPECTED_COMPLETION_TOKENS,
+)
+from src.helpers.token_count import count_chat_tokens, count_tokens, truncate_to_tokens
+
+# (job_desc, resume_text) -> (system_prompt, user_prompt)
+PromptRenderer = Callable[[str, str], tuple[str, str]]
+
+_PAGE_MARKER_RE = re.compile(r"^(page\s*)?\d{1,3}(\s*(/|of)\s*\d{1,3})?$", re.IGNORECASE)
+_BOILERPLATE_RE = re.compile(
+    r"^(references (are )?available (up)?on request\.?|curriculum vitae|resume|confidential)$", re.IGNORECASE
+)
+_BULLET_RE = re.compile(r"^[-*•·▪◦–]\s")
+_HEADING_RE = re.compile(r"^[A-Z][A-Za-z&/ ,]{1,40}:?$")
+_HEADING_WORDS = frozenset(
+    "summary profile experience employment work history education skills projects certifications "
+    "publications awards leadership volunteer interests languages technical professional".split()
+)
+
+
+@dataclass(frozen=True)
+class PromptBudgetReport:
+    model: str
+    budget_tokens: int
+    prompt_tokens: int  # locally counted, as sent
+    resume_tokens_before: int
+    resume_tokens_after: int
+    sections_kept: int
+    sections_total: int
+    jd_truncated: bool
+    estimated_cost: CostBreakdown  # prompt_tokens plus the expected completion
+
+    @property
+    def resume_compressed(self) -> bool:
+        return self.resume_tokens_after < self.resume_tokens_before
+
+
+@dataclass(frozen=True)
+class BudgetedPrompts:
+    system_prompt: str
+    user_prompt: str
+    report: PromptBudgetReport
+
+
+def _page_furniture(lines: list[str]) -> set[str]:
+    """
+    Running headers/footers. Extracted pages are joined with a blank line, so furniture sits at
+    the edge of blank-line-separated blocks: a short, non-bullet line that is the first or last
+    line (page numbers aside) of two or more blocks and never appears anywhere else.
+    """
+    blocks: list[list[str]] = [[]]
+    for ln in lines:
+        if not ln:
+            if blocks[-1]:
+                blocks.append([])
+        elif not _PAGE_MARKER_RE.match(ln):
+            blocks[-1].append(ln)
+
+    at_edge: Counter[str] = Counter()
+    elsewhere: set[str] = set()
+    for block in blocks:
+        if block:
+            at_edge.update({block[0], block[-1]})
+            elsewhere.update(block[1:-1])
+    return {
+        ln
+        for ln, n in at_edge.items()
+        if n >= 2 and ln not in elsewhere and len(ln) <= 80 and not _BULLET_RE.match(ln)
+    }
+
+
+def clean_resume_text(text: str) -> str:
+    """
+    Collapse whitespace, drop page numbers and boilerplate lines, and keep only the first copy
+    of running headers/footers repeated on every PDF page (see _page_furniture). Other repeated
+    lines, e.g. the same job title under two employers, are content and stay.
+    """
+    lines = [" ".join(ln.split()) for ln in text.splitlines()]
+    furniture = _page_furniture(lines)
+
+    out: list[str] = []
+    seen: set[str] = set()
+    for ln in lines:
+        if not ln:
+            if out and out[-1]:
+                out.append("")
+            continue
+        if _PAGE_MARKER_RE.match(ln) or _BOILERPLATE_RE.match(ln):
+            continue
+        if ln in furniture:
+            if ln in seen:
+                continue
+            seen.add(ln)
+        out.append(ln)
+    return "\n".join(out).strip()
+
+
+def _is_heading(line: str) -> bool:
+    if not _HEADING_RE.match(line):
+        return False
+    words = line.rstrip(":").lower().replace("&", " ").replace("/", " ").split()
+    return line.isupper() or any(w in _HEADING_WORDS for w in words)
+
+
+def split_sections(text: str) -> list[str]:
+    """Split at heading lines ("EXPERIENCE", "Skills:", ...); the part before the first heading is its own section."""
+    sections: list[list[str]] = [[]]
+    for ln in text.splitlines():
+        if _is_heading(ln.strip()) and any(s.strip() for s in sections[-1]):
+            sections.append([])
+        sections[-1].append(ln)
+    return ["\n".join(s).strip() for s in sections if any(x.strip() for x in s)]
+
+
+def compress_resume(resume_text: str, job_desc: str, max_tokens: int, model: str) -> tuple[str, int, int]:
+    """
+    Keep the resume sections most relevant to the JD (BM25, sections as documents) until
+    max_tokens is spent. The opening section (name, contact, summary) is always kept and
+    sections stay in their original order. Returns (text, sections_kept, sections_total).
+    """
+    sections = split_sections(resume_text)
+    if not sections:
+        return "", 0, 0
+
+    sep_tokens = count_tokens("\n\n", model)
+    costs = [count_tokens(s, model) + sep_tokens for s in sections]
+    if sum(costs) <= max_tokens:
+        return resume_text, len(sections), len(sections)
+
+    terms = TermMatrix.build([normalize_text(s) for s in sections])
+    # Score per token so a long but thin section doesn't beat a short, dense one.
+    relevance = bm25_line_scores(terms, [normalize_text(job_desc)])[:, 0] / np.asarray(costs, dtype=np.float64)
+    order = [0, *sorted(range(1, len(sections)), key=lambda i: -relevance[i])]
+
+    kept: dict[int, str] = {}
+    remaining = max_tokens
+    for i in order:
+        if costs[i] <= remaining:
+            kept[i] = sections[i]
+            remaining -= costs[i]
+        elif remaining > 50 and relevance[i] > 0:
+            # Partially include the best section that doesn't fit, then stop.
+            kept[i] = truncate_to_tokens(sections[i], model, remaining - sep_tokens)
+            break
+
+    return "\n\n".join(kept[i] for i in sorted(kept)), len(kept), len(sections)
+
+
+def fit_prompt_to_budget(
+    *,
+    model: str,
+    render: PromptRenderer,
+    job_desc: str,
+    resume_text: str,
+    budget_tokens: int = PROMPT_INPUT_TOKEN_BUDGET,
+    expected_completion_tokens: int = RECRUITER_PREP_EXPECTED_COMPLETION_TOKENS,
+) -> BudgetedPrompts:
+    """
+    Render prompts whose locally counted input stays within budget_tokens. Prompts that already
+    fit are sent as rendered. Otherwise the resume is cleaned, then compressed to what's left
+    after the fixed prompt; the JD is only truncated if it would leave the resume less than
+    PROMPT_MIN_RESUME_SHARE of the budget.
+    """
+    resume_before = count_tokens(resume_text, model)
+    system_prompt, user_prompt = render(job_desc, resume_text)
+    prompt_tokens = count_chat_tokens(system_prompt, user_prompt, model)
+    resume, jd_truncated = resume_text, False
+    kept = total = len(split_sections(resume_text))
+
+    if prompt_tokens > budget_tokens:
+        job_desc, resume, jd_truncated, kept, total = _shrink_to_budget(
+            model=model, render=render, job_desc=job_desc, resume_text=resume_text, budget_tokens=budget_tokens
+        )
+        system_prompt, user_prompt = render(job_desc, resume)
+        prompt_tokens = count_chat_tokens(system_prompt, user_prompt, model)
+
+    return BudgetedPrompts(
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        report=PromptBudgetReport(
+            model=model,
+            budget_tokens=budget_tokens,
+            prompt_tokens=prompt_tokens,
+            resume_tokens_before=resume_before,
+            resume_tokens_after=count_tokens(resume, model) if resume is not resume_text else resume_before,
+            sections_kept=kept,
+            sections_total=total,
+            jd_truncated=jd_truncated,
+            estimated_cost=estimate_cost(model, prompt_tokens, expected_completion_tokens),
+        ),
+    )
+
+
+def _shrink_to_budget(
+    *, model: str, render: PromptRenderer, job_desc: str, resume_text: str, budget_tokens: int
+) -> tuple[str, str, bool, int, int]:
+    """(job_desc, resume, jd_truncated, sections_kept, sections_total) for a prompt that's over budget."""
+    resume = clean_resume_text(resume_text)
+    fixed = count_chat_tokens(*render(job_desc, ""), model)
+    min_resume = int(budget_tokens * PROMPT_MIN_RESUME_SHARE)
+    jd_truncated = False
+    if fixed > budget_tokens - min_resume:
+        jd_tokens = count_tokens(job_desc, model)
+        job_desc = truncate_to_tokens(job_desc, model, jd_tokens - (fixed - (budget_tokens - min_resume)))
+        jd_truncated = True
+        fixed = count_chat_tokens(*render(job_desc, ""), model)
+
+    resume, kept, total = compress_resume(resume, job_desc, max(0, budget_tokens - fixed), model)
+    return job_desc, resume, jd_truncated, kept, total
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1)
 def recruiter_prep_one_item_example() -> str:
     """
     Generic example that demonstrates schema + style.
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from textwrap import dedent
 
 
+@lru_cache(maxsize=1)
 def guardrail_system_instructions() -> str:
     """
     Global system guardrails that should apply regardless of prompt technique.
@@ -24,7 +24,7 @@ def with_base(addon: str) -> str:
 SYSTEM_PROMPTS: dict[str, str] = {
     "zero_shot_structured": with_base(""),
     "few_shot": with_base("""
-Follow the pattern implied by an example in the user message, then produce the full required output.
+Follow the pattern implied by the example below, then produce the full required output.
 Be consistent with the example’s tone, formatting, and level of detail"""),
     "reasoning_hidden": with_base("""
 Think step-by-step privately to ensure accuracy and relevance.
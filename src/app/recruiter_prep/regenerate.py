@@ -0,0 +1,114 @@
+"""
+Regenerate one Q&A category of an existing result instead of all ten.
+
+The request repeats the original system and user prompt byte for byte, so the provider serves
+that prefix from its prompt cache, and appends the other answers (question + answer only) plus
+the item to replace. The schema admits exactly one item of that category, so the completion is
+about a tenth of a full run.
+"""
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+
+from src.app.pricing.calculate import CostBreakdown, combine_costs, cost_from_usage, estimate_cost
+from src.app.recruiter_prep.build_prompt import (
+    CATEGORIES,
+    build_recruiter_prep_regenerate_prompt,
+    recruiter_prep_response_format,
+)
+from src.app.recruiter_prep.generate import GenerationResult, build_budgeted_recruiter_prep_prompts
+from src.app.recruiter_prep.repair import merge_items, parse_recruiter_prep_output, response_content
+from src.app.recruiter_prep.schema import QAItem
+from src.helpers.openai_client import call_open_ai, is_cached_response
+from src.helpers.token_count import count_tokens
+from src.helpers.tracing import span, traced
+
+
+@dataclass(frozen=True)
+class ItemRegeneration:
+    result: GenerationResult  # merged output; cost and item_costs include this call
+    item: QAItem
+    cost: CostBreakdown  # this call only
+    full_run_cost: CostBreakdown  # estimate for regenerating all ten instead
+
+    @property
+    def saved_usd(self) -> float:
+        return max(0.0, self.full_run_cost.total_cost_usd - self.cost.total_cost_usd)
+
+
+@traced("recruiter_prep.regenerate")
+def regenerate_recruiter_prep_item(
+    *,
+    previous: GenerationResult,
+    category: str,
+    model: str,
+    system_prompt_key: str,
+    temperature: float,
+    job_title: str,
+    job_desc: str,
+    level: str,
+    company_type: str,
+    resume_text: str,
+    use_cache: bool = False,
+) -> ItemRegeneration:
+    """
+    Pass the same job/resume inputs as the original run so the prompt prefix matches.
+    The response cache is bypassed by default: asking again should give a new answer.
+    """
+    if category not in CATEGORIES:
+        raise ValueError(f"Unknown category: {category}")
+
+    items = {q.category: q for q in previous.output.questions}
+    with span("prompt.build"):
+        prompts = build_budgeted_recruiter_prep_prompts(
+            model=model,
+            system_prompt_key=system_prompt_key,
+            job_title=job_title,
+            job_desc=job_desc,
+            level=level,
+            company_type=company_type,
+            resume_text=resume_text,
+        )
+        user_prompt = build_recruiter_prep_regenerate_prompt(
+            prompts.user_prompt,
+            category,
+            current=items.get(category),
+            others=[q for c, q in items.items() if c != category],
+        )
+
+    resp = call_open_ai(
+        model=model,
+        system_prompt=prompts.system_prompt,
+        user_prompt=user_prompt,
+        temperature=temperature,
+        use_cache=use_cache,
+        response_format=recruiter_prep_response_format((category,)),
+    )
+    parsed = parse_recruiter_prep_output(response_content(resp), (category,))
+    if parsed.missing:
+        raise ValueError(f"The model returned no valid item for {category!r}.")
+
+    item = parsed.items[category]
+    cost = cost_from_usage(model, resp.usage, cached=is_cached_response(resp))
+    items[category] = item
+
+    item_costs = dict(previous.item_costs)
+    item_costs[category] = combine_costs([c for c in (item_costs.get(category), cost) if c is not None])
+    result = dataclasses.replace(
+        previous,
+        output=merge_items(items),
+        cost=combine_costs([previous.cost, cost]),
+        missing=tuple(c for c in previous.missing if c != category),
+        item_costs=item_costs,
+    )
+
+    # What re-running generate_recruiter_prep would cost: the original prompt (same prefix cache
+    # hit as this call) and a completion the size of all ten items.
+    full_run_cost = estimate_cost(
+        model,
+        prompts.report.prompt_tokens,
+        count_tokens(result.output.model_dump_json(), model),
+        cached_prompt_tokens=cost.cached_prompt_tokens,
+    )
+    return ItemRegeneration(result=result, item=item, cost=cost, full_run_cost=full_run_cost)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from pydantic import ValidationError
+
+from src.app.recruiter_prep.build_prompt import CATEGORIES
+from src.app.recruiter_prep.schema import QAItem, RecruiterPrepOutput
+from src.app.recruiter_prep.stream_parse import QuestionsArrayParser
+
+
+@dataclass(frozen=True)
+class ParsedOutput:
+    items: Mapping[str, QAItem]  # first valid item per category
+    missing: tuple[str, ...]  # categories without a valid item, in category order
+
+
+def response_content(resp: Any) -> Optional[str]:
+    """The completion text; raises when the model refused (Structured Outputs sets refusal instead)."""
+    message = resp.choices[0].message
+    refusal = getattr(message, "refusal", None)
+    if message.content is None and refusal:
+        raise ValueError(f"The model declined to answer: {refusal}")
+    return message.content
+
+
+def parse_recruiter_prep_output(content: Optional[str], categories: Sequence[str] = CATEGORIES) -> ParsedOutput:
+    """
+    Fast path: model_validate_json on the raw string, no intermediate dict. If that fails
+    (truncated JSON, a missing field), salvage every complete item that validates on its own
+    so only the rest has to be re-requested.
+    """
+    try:
+        candidates = RecruiterPrepOutput.model_validate_json(content or "").questions
+    except ValidationError:
+        candidates = _salvage_items(content or "")
+    return collect_items(candidates, categories)
+
+
+def collect_items(candidates: Iterable[QAItem], categories: Sequence[str] = CATEGORIES) -> ParsedOutput:
+    """First item per category, matched ignoring case and spacing and renamed to the canonical category."""
+    canonical = {_category_key(c): c for c in categories}
+    items: dict[str, QAItem] = {}
+    for item in candidates:
+        category = canonical.get(_category_key(item.category))
+        if category is not None and category not in items:
+            items[category] = item if item.category == category else item.model_copy(update={"category": category})
+    return ParsedOutput(items=items, missing=tuple(c for c in categories if c not in items))
+
+
+def merge_items(items: Mapping[str, QAItem], categories: Sequence[str] = CATEGORIES) -> RecruiterPrepOutput:
+    """Items in category order; categories still missing are left out."""
+    return RecruiterPrepOutput(questions=[items[c] for c in categories if c in items])
+
+
+def _salvage_items(content: str) -> list[QAItem]:
+    # The stream scanner yields each closed item, so a cut-off response still gives its complete items.
+    try:
+        raw_items = QuestionsArrayParser().feed(content)
+    except ValueError:  # not JSON at all; everything gets re-requested
+        return []
+    items = []
+    for raw in raw_items:
+        try:
+            items.append(QAItem.model_validate(raw))
+        except ValidationError:
+            continue
+    return items
+
+
+def _category_key(category: str) -> str:
+    return " ".join(category.lower().split())
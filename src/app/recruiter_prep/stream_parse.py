@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class QuestionsArrayParser:
+    """
+    Incremental scanner for {"questions": [ {...}, {...} ]} arriving in arbitrary chunks.
+    feed() returns each item of the top-level "questions" array as soon as its object closes.
+    Only tracks nesting/strings; each completed item is decoded with json.loads.
+    """
+
+    def __init__(self, key: str = "questions") -> None:
+        self.key = key
+        self._pos = 0  # absolute index of the next char to scan
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_key = ""  # last string seen directly inside the top-level object
+        self._array_depth = -1  # stack depth of the target array, -1 until found
+        self._item_start = -1
+        self._text = ""
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        self._text += chunk
+        items: list[dict[str, Any]] = []
+        text = self._text
+
+        while self._pos < len(text):
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        self._last_key = json.loads(text[self._string_start : i + 1])
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if ch == "[" and self._stack == ["{"] and self._last_key == self.key:
+                    self._array_depth = len(self._stack) + 1
+                if ch == "{" and len(self._stack) == self._array_depth:
+                    self._item_start = i
+                self._stack.append(ch)
+            elif ch in "}]":
+                if not self._stack:
+                    raise ValueError(f"Unbalanced {ch!r} at offset {i}")
+                self._stack.pop()
+                if ch == "}" and len(self._stack) == self._array_depth and self._item_start >= 0:
+                    items.append(json.loads(text[self._item_start : i + 1]))
+                    self._item_start = -1
+                elif ch == "]" and len(self._stack) == self._array_depth - 1:
+                    self._array_depth = -1
+
+        return items
+
+    @property
+    def text(self) -> str:
+        return self._text
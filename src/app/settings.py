@@ -1,6 +1,8 @@
 # src/settings.py
 from __future__ import annotations
 
+import os
+
 # -----------------------------
 # UI / Domain enums
 # -----------------------------
@@ -21,6 +23,17 @@ ALLOWED_MODELS = (
     "gpt-3.5-turbo",
 )
 
+# Models that accept response_format={"type": "json_schema"} (Structured Outputs); the rest get JSON mode.
+STRUCTURED_OUTPUT_MODELS = frozenset({"gpt-4o-mini", "gpt-4.1-mini", "gpt-4.1-nano"})
+
+# Tokenizer per model, for local token counting (tiktoken when available, otherwise an approximation).
+MODEL_TOKEN_ENCODINGS = {
+    "gpt-4o-mini": "o200k_base",
+    "gpt-4.1-mini": "o200k_base",
+    "gpt-4.1-nano": "o200k_base",
+    "gpt-3.5-turbo": "cl100k_base",
+}
+
 # -----------------------------
 # Alignment Settings (fixed)
 # -----------------------------
@@ -33,3 +46,97 @@ ALIGNMENT_MAX_ITEMS = 10
 MAX_TITLE_CHARS = 120
 MAX_JD_CHARS = 12_000
 MAX_RESUME_MB = 5
+
+# -----------------------------
+# Caching
+# -----------------------------
+PDF_CACHE_MAX_ENTRIES = 32
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR") or None  # set to enable the on-disk tier
+
+# -----------------------------
+# PDF extraction
+# -----------------------------
+PDF_PARALLEL_MIN_PAGES = 16  # below this, process start-up costs more than it saves
+PDF_PARALLEL_MAX_WORKERS = None  # None = os.cpu_count()
+
+# -----------------------------
+# LLM response cache
+# -----------------------------
+LLM_CACHE_MAX_ENTRIES = 256
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60
+LLM_CACHE_MAX_TEMPERATURE = 0.3  # higher temperatures ask for variation, so never serve a cached answer
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH") or None  # SQLite file for the persistent tier
+REQUIREMENTS_CACHE_MAX_ENTRIES = 128  # extracted JD requirements, reused across resumes
+
+# -----------------------------
+# LLM transport
+# -----------------------------
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))  # per process, across all sessions
+LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "60"))  # per attempt
+
+# -----------------------------
+# LLM resilience (retries, hedging, circuit breaker)
+# -----------------------------
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))  # first try + retries
+LLM_BACKOFF_BASE_SECONDS = 0.5  # full-jitter exponential backoff when there's no Retry-After
+LLM_BACKOFF_MAX_SECONDS = 20.0
+LLM_RETRY_AFTER_MAX_SECONDS = 60.0  # a longer Retry-After fails the call instead of stalling the session
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE", "0") == "1"  # duplicates cost tokens, so off by default
+LLM_HEDGE_MIN_DELAY_SECONDS = 2.0
+LLM_HEDGE_DEFAULT_DELAY_SECONDS = 15.0  # before enough latencies are known for a p95
+LLM_HEDGE_MIN_SAMPLES = 20
+LLM_BREAKER_WINDOW = 50  # recent attempts per model
+LLM_BREAKER_FAILURE_RATIO = 0.5  # open when this share of the window failed...
+LLM_BREAKER_MIN_CALLS = 20  # ...and at least this many attempts are in it
+LLM_BREAKER_RESET_SECONDS = 30.0
+
+# -----------------------------
+# Alignment scoring engines
+# -----------------------------
+ALIGNMENT_SCORING_MODES = ("keyword", "bm25", "embedding")  # keyword = 0/1/2 keyword-hit buckets
+BM25_K1 = 1.5
+BM25_B = 0.75
+BM25_STRONG_THRESHOLD = 0.5  # normalized score at/above which a requirement counts as Strong
+BM25_PARTIAL_THRESHOLD = 0.2
+
+# -----------------------------
+# Embedding alignment
+# -----------------------------
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL") or None  # sentence-transformers model; unset = hashing vectorizer
+EMBEDDING_HASH_DIM = 1024
+EMBEDDING_INDEX_MAX_ENTRIES = 32  # resumes whose chunk vectors stay in memory
+EMBEDDING_INDEX_DIR = os.getenv("EMBEDDING_INDEX_DIR") or None  # set to persist vectors as memory-mapped .npy
+EMBEDDING_STRONG_THRESHOLD = 0.4  # cosine similarity of the best resume line; tuned for the hashing vectorizer
+EMBEDDING_PARTIAL_THRESHOLD = 0.2
+
+# -----------------------------
+# Shortlist heatmap
+# -----------------------------
+MATRIX_HEATMAP_DPI = 120
+MATRIX_HEATMAP_MAX_ROW_LABELS = 40  # beyond this, every k-th candidate is labelled
+MATRIX_HEATMAP_MAX_HEIGHT_IN = 12.0
+
+# -----------------------------
+# Alignment heatmap
+# -----------------------------
+ALIGNMENT_HEATMAP_DPI = 220  # full-resolution export
+ALIGNMENT_HEATMAP_PREVIEW_DPI = 80  # shown inline in the app
+HEATMAP_RENDER_CACHE_MAX_ENTRIES = 64
+
+# -----------------------------
+# Prompt budget (recruiter prep)
+# -----------------------------
+PROMPT_INPUT_TOKEN_BUDGET = int(os.getenv("PROMPT_INPUT_TOKEN_BUDGET", "8000"))  # system + user prompt
+PROMPT_MIN_RESUME_SHARE = 0.4  # the JD is truncated before the resume gets less than this share of the budget
+RECRUITER_PREP_EXPECTED_COMPLETION_TOKENS = 2500  # for pre-send cost estimates
+RECRUITER_PREP_REPAIR_ATTEMPTS = 1  # follow-up requests for items missing or invalid in the first answer
+
+# -----------------------------
+# Prompt strategy evaluation
+# -----------------------------
+PROMPT_EVAL_MAX_PARALLEL = int(os.getenv("PROMPT_EVAL_MAX_PARALLEL", "6"))  # variants in flight at once
+
+# -----------------------------
+# Tracing
+# -----------------------------
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()  # "none" or "otel" (needs opentelemetry-api)
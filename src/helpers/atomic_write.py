@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+
+def write_atomic(path: Path, write: Callable[[BinaryIO], None]) -> bool:
+    """
+    Write a cache file through a temp file in the same directory plus os.replace, so readers
+    (other sessions or processes) see the old file or the new one, never a partial one.
+    Best-effort: returns False, leaving nothing behind, when the file can't be written.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        return False
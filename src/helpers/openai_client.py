@@ -1,18 +1,445 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
-from openai import OpenAI
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Coroutine, Optional, TypeVar
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from src.app.settings import (
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_BREAKER_FAILURE_RATIO,
+    LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_RESET_SECONDS,
+    LLM_BREAKER_WINDOW,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MAX_TEMPERATURE,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_MIN_DELAY_SECONDS,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_MAX_ATTEMPTS,
+    LLM_MAX_IN_FLIGHT,
+    LLM_REQUEST_TIMEOUT_SECONDS,
+    LLM_RETRY_AFTER_MAX_SECONDS,
+)
+from src.helpers.resilience import (
+    AttemptMetric,
+    HedgePolicy,
+    KeyCallStats,
+    ResilienceConfig,
+    ResilientCaller,
+    RetryPolicy,
+)
+from src.helpers.response_cache import (
+    CachedResponse,
+    MemoryResponseCache,
+    ResponseCache,
+    SqliteResponseCache,
+    TieredResponseCache,
+    request_cache_key,
+)
+from src.helpers.structured_output import JSON_OBJECT_RESPONSE_FORMAT, response_format_for_model
+from src.helpers.tracing import traced
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+    from openai.types.chat import ChatCompletion
 
-def call_open_ai(model: str, system_prompt: str, user_prompt: str, temperature: float):
-    return client.chat.completions.create(
+T = TypeVar("T")
+
+
+# The openai package is imported and the client built on first use, not at app start-up.
+@lru_cache(maxsize=1)
+def get_client() -> OpenAI:
+    from openai import OpenAI
+
+    # Retries and timeouts are handled by the resilience layer below, not by the SDK.
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0, timeout=LLM_REQUEST_TIMEOUT_SECONDS)
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `openai_client.client` working for callers that used the old module-level instance.
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_response_cache: Optional[ResponseCache] = TieredResponseCache(
+    memory=MemoryResponseCache(max_entries=LLM_CACHE_MAX_ENTRIES, ttl_seconds=LLM_CACHE_TTL_SECONDS),
+    persistent=(
+        SqliteResponseCache(LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL_SECONDS) if LLM_CACHE_PATH else None
+    ),
+)
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Swap the response cache (None disables caching)."""
+    global _response_cache  # pylint: disable=global-statement
+    _response_cache = cache
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return _response_cache
+
+
+def is_cached_response(resp: Any) -> bool:
+    return bool(getattr(resp, "cache_hit", False))
+
+
+def _messages(system_prompt: str, user_prompt: str) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def _cache_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    use_cache: bool,
+    response_format: dict[str, Any],
+) -> str:
+    """Empty string when this request must not be served from / stored in the cache."""
+    if not use_cache or _response_cache is None or temperature > LLM_CACHE_MAX_TEMPERATURE:
+        return ""
+    return request_cache_key(
         model=model,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
         temperature=temperature,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        response_format={"type": "json_object"},
+        response_format=response_format,
+    )
+
+
+def _cache_lookup(key: str) -> Optional[ChatCompletion]:
+    cache = _response_cache
+    if not key or cache is None:
+        return None
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    from openai.types.chat import ChatCompletion
+
+    return ChatCompletion.model_validate({**json.loads(entry.payload_json), "cache_hit": True})
+
+
+def _cache_store(key: str, model: str, resp: Any) -> None:
+    cache = _response_cache
+    if not key or cache is None:
+        return
+    from openai.types.chat import ChatCompletion
+
+    if not isinstance(resp, ChatCompletion) or not resp.choices:
+        return
+    choice = resp.choices[0]
+    # Truncated, filtered or refused answers are one-offs; replaying them for the whole TTL would pin the failure.
+    if choice.finish_reason != "stop" or getattr(choice.message, "refusal", None):
+        return
+    cache.put(
+        key,
+        CachedResponse(
+            payload_json=resp.model_dump_json(),
+            model=model,
+            prompt_tokens=getattr(resp.usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(resp.usage, "completion_tokens", 0) or 0,
+        ),
+    )
+
+
+# -----------------------------
+# Resilience (sync path)
+# -----------------------------
+def _retry_after_seconds(headers: Any) -> Optional[float]:
+    """Retry-After from retry-after-ms, or retry-after as seconds or an HTTP date."""
+    if headers is None:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _classify_error(exc: BaseException) -> tuple[bool, Optional[float]]:
+    """(retryable, retry_after): timeouts, dropped connections, 408/409/429 and 5xx are retried."""
+    from openai import APIConnectionError, APIStatusError
+
+    if isinstance(exc, APIConnectionError):  # includes APITimeoutError
+        return True, None
+    if isinstance(exc, APIStatusError):
+        if getattr(exc, "code", None) == "insufficient_quota":
+            return False, None  # a 429 that waiting won't fix
+        status = exc.status_code
+        if status in (408, 409, 429) or status >= 500:
+            return True, _retry_after_seconds(getattr(exc.response, "headers", None))
+    return False, None
+
+
+def _usage_tokens(resp: Any) -> tuple[int, int]:
+    usage = getattr(resp, "usage", None)
+    return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+
+
+def _resilience_config() -> ResilienceConfig:
+    return ResilienceConfig(
+        retry=RetryPolicy(
+            max_attempts=LLM_MAX_ATTEMPTS,
+            base_delay=LLM_BACKOFF_BASE_SECONDS,
+            max_delay=LLM_BACKOFF_MAX_SECONDS,
+            max_retry_after=LLM_RETRY_AFTER_MAX_SECONDS,
+        ),
+        hedge=HedgePolicy(
+            enabled=LLM_HEDGE_ENABLED,
+            min_delay=LLM_HEDGE_MIN_DELAY_SECONDS,
+            default_delay=LLM_HEDGE_DEFAULT_DELAY_SECONDS,
+            min_samples=LLM_HEDGE_MIN_SAMPLES,
+        ),
+        timeout_seconds=LLM_REQUEST_TIMEOUT_SECONDS,
+        breaker_window=LLM_BREAKER_WINDOW,
+        breaker_failure_ratio=LLM_BREAKER_FAILURE_RATIO,
+        breaker_min_calls=LLM_BREAKER_MIN_CALLS,
+        breaker_reset_seconds=LLM_BREAKER_RESET_SECONDS,
+    )
+
+
+_caller = ResilientCaller(classify=_classify_error, read_usage=_usage_tokens, config=_resilience_config())
+
+
+def configure_resilience(config: Optional[ResilienceConfig] = None) -> None:
+    """Replace the retry/hedge/breaker settings (None restores the defaults); resets metrics and breakers."""
+    global _caller  # pylint: disable=global-statement
+    _caller = ResilientCaller(
+        classify=_classify_error, read_usage=_usage_tokens, config=config or _resilience_config()
+    )
+
+
+def llm_call_stats() -> dict[str, KeyCallStats]:
+    """Per-model attempts, retries, hedges, tokens and p50/p95 latency."""
+    return _caller.stats()
+
+
+def llm_recent_attempts() -> tuple[AttemptMetric, ...]:
+    return _caller.recent_attempts()
+
+
+def llm_breaker_state(model: str) -> str:
+    return _caller.breaker_state(model)
+
+
+@traced("llm.call")
+def call_open_ai(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    *,
+    use_cache: bool = True,
+    response_format: Optional[dict[str, Any]] = None,
+):
+    """
+    One chat completion in JSON mode, or constrained to a schema when response_format is a
+    json_schema format and the model supports it (see helpers.structured_output). Served from
+    the response cache when possible.
+    """
+    response_format = response_format_for_model(model, response_format or JSON_OBJECT_RESPONSE_FORMAT)
+    key = _cache_key(model, system_prompt, user_prompt, temperature, use_cache, response_format)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return cached
+
+    messages = _messages(system_prompt, user_prompt)
+    resp = _caller.call(
+        model,
+        lambda timeout: get_client().chat.completions.create(
+            model=model,
+            temperature=temperature,
+            messages=messages,
+            response_format=response_format,
+            timeout=timeout,
+        ),
+    )
+
+    _cache_store(key, model, resp)
+    return resp
+
+
+@traced("llm.stream_open")
+def call_open_ai_stream(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    *,
+    response_format: Optional[dict[str, Any]] = None,
+):
+    """
+    Streaming variant of call_open_ai: returns an iterator of ChatCompletionChunk.
+    The final chunk carries usage (stream_options.include_usage). Streams are not cached.
+    Opening the stream is retried like call_open_ai but never hedged; once chunks flow, errors propagate.
+    """
+    messages = _messages(system_prompt, user_prompt)
+    response_format = response_format_for_model(model, response_format or JSON_OBJECT_RESPONSE_FORMAT)
+    return _caller.call(
+        model,
+        lambda timeout: get_client().chat.completions.create(
+            model=model,
+            temperature=temperature,
+            messages=messages,
+            response_format=response_format,
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=timeout,
+        ),
+        hedge=False,
+    )
+
+
+# -----------------------------
+# Async path
+# -----------------------------
+def _async_client() -> AsyncOpenAI:
+    from openai import AsyncOpenAI
+
+    # Same retry policy as the sync client: retries, breaker and metrics come from _caller.acall.
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0, timeout=LLM_REQUEST_TIMEOUT_SECONDS)
+
+
+@dataclass
+class _LoopResources:
+    """AsyncOpenAI (and its pooled HTTP client) plus the in-flight limiter, bound to one event loop."""
+
+    client: AsyncOpenAI = field(default_factory=_async_client)
+    semaphore: asyncio.Semaphore = field(default_factory=lambda: asyncio.Semaphore(LLM_MAX_IN_FLIGHT))
+    closer: Optional[AsyncGenerator[None, None]] = None  # see _close_at_loop_shutdown
+
+
+# asyncio primitives and HTTP pools can't be shared across loops, so keep one set per loop.
+_loop_resources: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources] = (
+    weakref.WeakKeyDictionary()
+)
+_loop_resources_lock = threading.Lock()
+
+
+async def _close_at_loop_shutdown(client: AsyncOpenAI) -> AsyncGenerator[None, None]:
+    # Left suspended at the yield: asyncio.run (via loop.shutdown_asyncgens) closes it while the
+    # loop is still running, the last point where the client's connection pool can be closed.
+    try:
+        yield
+    finally:
+        await client.close()
+
+
+async def _resources() -> _LoopResources:
+    loop = asyncio.get_running_loop()
+    with _loop_resources_lock:
+        res = _loop_resources.get(loop)
+        if res is not None:
+            return res
+        res = _loop_resources[loop] = _LoopResources()
+    res.closer = _close_at_loop_shutdown(res.client)
+    await anext(res.closer)
+    return res
+
+
+@traced("llm.call")
+async def acall_open_ai(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    *,
+    use_cache: bool = True,
+    response_format: Optional[dict[str, Any]] = None,
+):
+    """
+    Async counterpart of call_open_ai: shares the response cache and the retry / circuit-breaker
+    layer (never hedged), and waits for a slot when LLM_MAX_IN_FLIGHT requests are already running.
+    """
+    response_format = response_format_for_model(model, response_format or JSON_OBJECT_RESPONSE_FORMAT)
+    key = _cache_key(model, system_prompt, user_prompt, temperature, use_cache, response_format)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return cached
+
+    res = await _resources()
+    messages = _messages(system_prompt, user_prompt)
+
+    async def send(timeout: float):
+        async with res.semaphore:
+            return await res.client.chat.completions.create(
+                model=model,
+                temperature=temperature,
+                messages=messages,
+                response_format=response_format,
+                timeout=timeout,
+            )
+
+    resp = await _caller.acall(model, send)
+
+    _cache_store(key, model, resp)
+    return resp
+
+
+# Background loop for sync callers (Streamlit script threads have no running loop).
+# Sharing it means every session draws from the same connection pool and in-flight limit.
+_bg_loop: Optional[asyncio.AbstractEventLoop] = None  # pylint: disable=invalid-name
+_bg_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _bg_loop  # pylint: disable=global-statement
+    with _bg_loop_lock:
+        if _bg_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="openai-async-loop", daemon=True).start()
+            _bg_loop = loop
+        return _bg_loop
+
+
+def run_async(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine on the shared background loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result(timeout)
+
+
+def call_open_ai_pooled(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    *,
+    use_cache: bool = True,
+    response_format: Optional[dict[str, Any]] = None,
+):
+    """
+    Drop-in sync replacement for call_open_ai that goes through the async pool. For fan-outs
+    (e.g. the prompt-strategy comparison) where many threads would otherwise each hold an HTTP
+    connection: all of them share one pool and the LLM_MAX_IN_FLIGHT limit.
+    """
+    return run_async(
+        acall_open_ai(
+            model=model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            use_cache=use_cache,
+            response_format=response_format,
+        )
     )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.helpers.atomic_write import write_atomic
+from src.helpers.lru_cache import LRUCache
+
+
+@dataclass
+class PdfCacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    parse_seconds: float = 0.0  # time spent in pypdf on misses
+    saved_seconds: float = 0.0  # parse time avoided by hits (based on the original parse)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    text: str
+    parse_seconds: float
+
+
+class PdfTextCache:
+    """
+    Content-addressed cache for extracted PDF text.
+    Keyed on sha256(pdf bytes) + max_chars; in-process LRU with an optional on-disk tier.
+    """
+
+    def __init__(self, max_entries: int = 32, cache_dir: Optional[str] = None) -> None:
+        self._memory: LRUCache[_Entry] = LRUCache(max_entries=max_entries)
+        self._dir = Path(cache_dir) if cache_dir else None
+        self._lock = threading.Lock()
+        self.stats = PdfCacheStats()
+
+    @staticmethod
+    def key_for(file_bytes: bytes, max_chars: int) -> str:
+        return f"{hashlib.sha256(file_bytes).hexdigest()}-{max_chars}"
+
+    def get_or_extract(
+        self,
+        file_bytes: bytes,
+        max_chars: int,
+        extract: Callable[[bytes, int], str],
+    ) -> str:
+        key = self.key_for(file_bytes, max_chars)
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._record_hit(entry, disk=False)
+            return entry.text
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._memory.put(key, entry)
+            self._record_hit(entry, disk=True)
+            return entry.text
+
+        start = time.perf_counter()
+        text = extract(file_bytes, max_chars)
+        entry = _Entry(text=text, parse_seconds=time.perf_counter() - start)
+
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.parse_seconds += entry.parse_seconds
+
+        self._memory.put(key, entry)
+        self._write_disk(key, entry)
+        return text
+
+    def clear(self) -> None:
+        self._memory.clear()
+        with self._lock:
+            self.stats = PdfCacheStats()
+
+    def _record_hit(self, entry: _Entry, *, disk: bool) -> None:
+        with self._lock:
+            if disk:
+                self.stats.disk_hits += 1
+            else:
+                self.stats.hits += 1
+            self.stats.saved_seconds += entry.parse_seconds
+
+    def _path(self, key: str) -> Path:
+        assert self._dir is not None
+        return self._dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[_Entry]:
+        if self._dir is None:
+            return None
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+            return _Entry(text=data["text"], parse_seconds=float(data.get("parse_seconds", 0.0)))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(self, key: str, entry: _Entry) -> None:
+        # Disk tier is best-effort; the in-memory copy is still valid if the write fails.
+        if self._dir is not None:
+            payload = json.dumps({"text": entry.text, "parse_seconds": entry.parse_seconds}).encode("utf-8")
+            write_atomic(self._path(key), lambda f: f.write(payload))
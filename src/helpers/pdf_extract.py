@@ -1,27 +1,156 @@
 from __future__ import annotations
 
 import io
-from pypdf import PdfReader
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Optional
 
+from src.app.settings import (
+    PDF_CACHE_DIR,
+    PDF_CACHE_MAX_ENTRIES,
+    PDF_PARALLEL_MAX_WORKERS,
+    PDF_PARALLEL_MIN_PAGES,
+)
+from src.helpers.pdf_cache import PdfCacheStats, PdfTextCache
+from src.helpers.tracing import traced
 
-def extract_text_from_pdf(file_bytes: bytes, max_chars: int = 60_000) -> str:
+if TYPE_CHECKING:
+    from pypdf import PdfReader
+
+_PDF_CACHE = PdfTextCache(max_entries=PDF_CACHE_MAX_ENTRIES, cache_dir=PDF_CACHE_DIR)
+
+
+@traced("pdf.extract")
+def extract_text_from_pdf(
+    file_bytes: bytes,
+    max_chars: int = 60_000,
+    *,
+    use_cache: bool = True,
+    parallel: bool = False,
+) -> str:
     """
     Extract raw text from a PDF (good-enough extraction for this project).
     Caps output to avoid huge prompts.
+    Results are cached by content hash, so re-running on the same upload skips pypdf.
+    parallel=True spreads pages across processes for large PDFs (same output as serial).
     """
-    reader = PdfReader(_bytes_to_filelike(file_bytes))
-    parts: list[str] = []
+    def extract(b: bytes, limit: int) -> str:
+        pages = iter_pdf_page_texts_parallel(b) if parallel else iter_pdf_page_texts(b)
+        return _join_pages(pages, limit)
+
+    if not use_cache:
+        return extract(file_bytes, max_chars)
+    return _PDF_CACHE.get_or_extract(file_bytes, max_chars, extract)
+
+
+def pdf_cache_stats() -> PdfCacheStats:
+    return _PDF_CACHE.stats
+
 
+def clear_pdf_cache() -> None:
+    _PDF_CACHE.clear()
+
+
+def _open_reader(file_bytes: bytes) -> PdfReader:
+    # pypdf is imported on first use so app start-up doesn't pay for it.
+    from pypdf import PdfReader
+
+    return PdfReader(_bytes_to_filelike(file_bytes))
+
+
+def iter_pdf_page_texts(file_bytes: bytes) -> Iterator[str]:
+    """
+    Yield the text of each non-blank page, parsing pages lazily.
+    Stop iterating early to skip parsing the remaining pages.
+    """
+    reader = _open_reader(file_bytes)
     for page in reader.pages:
         txt = page.extract_text() or ""
         if txt.strip():
+            yield txt
+
+
+def iter_pdf_page_texts_parallel(
+    file_bytes: bytes,
+    *,
+    min_pages: int = PDF_PARALLEL_MIN_PAGES,
+    max_workers: Optional[int] = PDF_PARALLEL_MAX_WORKERS,
+) -> Iterator[str]:
+    """
+    Same contract as iter_pdf_page_texts, but page ranges are extracted in a process pool.
+    Chunks are yielded in page order; closing the iterator cancels chunks not yet started.
+    Falls back to the serial path below min_pages.
+    """
+    n_pages = len(_open_reader(file_bytes).pages)
+    workers = min(max_workers or os.cpu_count() or 1, n_pages)
+    if n_pages < min_pages or workers < 2:
+        yield from iter_pdf_page_texts(file_bytes)
+        return
+
+    # Small chunks keep early exit cheap; two per worker keeps the pool busy.
+    chunk = max(1, -(-n_pages // (workers * 2)))
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(file_bytes,),
+    )
+    try:
+        futures = [
+            executor.submit(_extract_page_range, start, min(start + chunk, n_pages))
+            for start in range(0, n_pages, chunk)
+        ]
+        for fut in futures:
+            yield from fut.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _join_pages(pages: Iterator[str], max_chars: int) -> str:
+    parts: list[str] = []
+    joined_len = 0  # len("\n\n".join(parts))
+    leading_ws = 0  # stripped off the front of the joined text
+
+    try:
+        for txt in pages:
+            sep = 2 if parts else 0
+            if not parts:
+                leading_ws = len(txt) - len(txt.lstrip())
             parts.append(txt)
 
+            # Length of the stripped text so far. Once it exceeds max_chars the
+            # truncated prefix can no longer change, so later pages are never parsed.
+            if joined_len + sep + len(txt.rstrip()) - leading_ws > max_chars:
+                break
+            joined_len += sep + len(txt)
+    finally:
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+
     text = "\n\n".join(parts).strip()
     if len(text) > max_chars:
         text = text[:max_chars] + "\n\n[TRUNCATED]"
     return text
 
 
+# Per-process reader, opened once by the pool initializer.
+_WORKER_READER: Optional["PdfReader"] = None
+
+
+def _init_worker(file_bytes: bytes) -> None:
+    global _WORKER_READER  # pylint: disable=global-statement
+    _WORKER_READER = _open_reader(file_bytes)
+
+
+def _extract_page_range(start: int, stop: int) -> list[str]:
+    assert _WORKER_READER is not None
+    out: list[str] = []
+    for i in range(start, stop):
+        txt = _WORKER_READER.pages[i].extract_text() or ""
+        if txt.strip():
+            out.append(txt)
+    return out
+
+
 def _bytes_to_filelike(b: bytes) -> io.BytesIO:
     return io.BytesIO(b)
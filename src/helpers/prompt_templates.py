@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from string import Formatter
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    A prompt parsed once into literal segments and named slots. Static fragments passed at
+    compile time are folded into the literals, so render() is a single join over the
+    per-request values. Placeholders are plain str.format names ("{job_title}"); literal
+    braces are written "{{" / "}}" as with str.format.
+    """
+
+    name: str
+    fields: tuple[str, ...]
+    literals: tuple[str, ...]  # len(fields) + 1 segments around the slots
+
+    @classmethod
+    def compile(cls, name: str, text: str, **static: str) -> PromptTemplate:
+        literals: list[str] = [""]
+        fields: list[str] = []
+        seen: set[str] = set()
+        for literal, field, spec, conversion in Formatter().parse(text):
+            literals[-1] += literal
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Template {name!r}: only plain named fields are supported, got {{{field}}}")
+            seen.add(field)
+            if field in static:
+                literals[-1] += static[field]
+            else:
+                fields.append(field)
+                literals.append("")
+
+        unused = set(static) - seen
+        if unused:
+            raise ValueError(f"Template {name!r}: static fragments not in template: {sorted(unused)}")
+        return cls(name=name, fields=tuple(fields), literals=tuple(literals))
+
+    def render(self, **values: object) -> str:
+        try:
+            slots = [str(values[f]) for f in self.fields]
+        except KeyError as e:
+            raise ValueError(f"Template {self.name!r}: missing value for {e.args[0]!r}") from None
+        pieces = [self.literals[0]]
+        for slot, literal in zip(slots, self.literals[1:]):
+            pieces.append(slot)
+            pieces.append(literal)
+        return "".join(pieces)
+
+
+_REGISTRY: dict[str, PromptTemplate] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_template(name: str, text: str, **static: str) -> PromptTemplate:
+    """
+    Compile and register a template. Re-registering the same name with identical content
+    (a module reload) returns the existing template; different content is an error.
+    """
+    template = PromptTemplate.compile(name, text, **static)
+    with _REGISTRY_LOCK:
+        existing = _REGISTRY.get(name)
+        if existing is not None:
+            if existing != template:
+                raise ValueError(f"Prompt template already registered with different content: {name}")
+            return existing
+        _REGISTRY[name] = template
+    return template
+
+
+def get_template(name: str) -> PromptTemplate:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown prompt template: {name}") from None
+
+
+def registered_templates() -> tuple[str, ...]:
+    return tuple(sorted(_REGISTRY))
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# (exception) -> (retryable, retry_after_seconds or None)
+ErrorClassifier = Callable[[BaseException], tuple[bool, Optional[float]]]
+# (response) -> (prompt_tokens, completion_tokens)
+UsageReader = Callable[[Any], tuple[int, int]]
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while a model's circuit breaker is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    max_retry_after: float = 60.0  # a server asking for longer than this fails the call instead
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait after failed attempt `attempt` (1-based): the server's Retry-After when it
+        sent one, otherwise full-jitter exponential backoff (uniform in [0, base * 2^(attempt-1)]).
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_retry_after)
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Send one duplicate when the first attempt is slower than the model's recent p95."""
+
+    enabled: bool = False
+    min_delay: float = 2.0
+    default_delay: float = 15.0  # until min_samples latencies have been seen
+    min_samples: int = 20
+
+
+class CircuitBreaker:
+    """
+    Per-model breaker over the outcomes of the last `window` attempts: once at least `min_calls`
+    are recorded and `failure_ratio` of them are retryable failures, it opens and rejects calls
+    for `reset_seconds`, then lets one probe through (half-open). The probe's outcome closes it
+    (with a fresh window) or restarts the wait. A ratio rather than a run of consecutive
+    failures, so a moderately flaky model under concurrent load doesn't trip it.
+    """
+
+    def __init__(
+        self, *, window: int = 50, failure_ratio: float = 0.5, min_calls: int = 20, reset_seconds: float = 30.0
+    ) -> None:
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=window)  # True = failure
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def before_call(self, name: str) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_seconds - (time.monotonic() - self._opened_at)
+            if remaining > 0 or self._probe_in_flight:
+                raise CircuitOpenError(
+                    f"{name}: too many recent failures, not sending requests for {max(remaining, 0):.0f}s"
+                )
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                self._outcomes.clear()
+                self._opened_at = None
+            self._outcomes.append(False)
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._outcomes.append(True)
+            failures = sum(self._outcomes)
+            tripped = len(self._outcomes) >= self.min_calls and failures >= self.failure_ratio * len(self._outcomes)
+            if self._probe_in_flight or tripped:
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+@dataclass(frozen=True)
+class AttemptMetric:  # pylint: disable=too-many-instance-attributes
+    key: str  # model
+    attempt: int  # 1-based retry number
+    hedge: bool  # the duplicate request of a hedged attempt
+    latency_seconds: float
+    outcome: str  # "ok", "error", "timeout" or "abandoned" (lost the hedge race)
+    error: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+@dataclass
+class KeyCallStats:  # pylint: disable=too-many-instance-attributes
+    attempts: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    p50_seconds: float = 0.0
+    p95_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class ResilienceConfig:  # pylint: disable=too-many-instance-attributes
+    retry: RetryPolicy = RetryPolicy()
+    hedge: HedgePolicy = HedgePolicy()
+    timeout_seconds: float = 60.0  # per attempt
+    breaker_window: int = 50  # recent attempts per key the failure ratio is taken over
+    breaker_failure_ratio: float = 0.5
+    breaker_min_calls: int = 20
+    breaker_reset_seconds: float = 30.0
+    latency_window: int = 200  # successful latencies kept per key for p50/p95 and the hedge delay
+    max_recent_attempts: int = 500
+    hedge_workers: int = 32  # primaries run here too when hedging, plus duplicates and their losers
+
+
+@dataclass
+class _KeyState:
+    breaker: CircuitBreaker
+    latencies: deque[float]
+    stats: KeyCallStats = field(default_factory=KeyCallStats)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ResilientCaller:
+    """
+    Retries, per-attempt timeouts (passed to `send`), optional hedging and a circuit breaker
+    per key, with per-attempt metrics. Transport-agnostic: callers supply `send(timeout)` plus
+    functions that classify errors and read token usage off a response.
+
+    A hedge that loses the race can't be cancelled once its HTTP request is in flight; it runs
+    to completion on the hedge pool and is recorded as "abandoned" (its tokens are still billed).
+    """
+
+    def __init__(
+        self,
+        *,
+        classify: ErrorClassifier,
+        read_usage: UsageReader,
+        config: ResilienceConfig = ResilienceConfig(),
+    ) -> None:
+        self.config = config
+        self._classify = classify
+        self._read_usage = read_usage
+        self._lock = threading.Lock()
+        self._keys: dict[str, _KeyState] = {}
+        self._recent: deque[AttemptMetric] = deque(maxlen=config.max_recent_attempts)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    # ---- public API ----
+    def call(self, key: str, send: Callable[[float], T], *, hedge: Optional[bool] = None) -> T:
+        """Run send(timeout) until it succeeds, a non-retryable error occurs or attempts run out."""
+        state = self._state(key)
+        use_hedge = self.config.hedge.enabled if hedge is None else hedge
+        for attempt in range(1, self.config.retry.max_attempts + 1):
+            state.breaker.before_call(key)
+            try:
+                resp = (
+                    self._hedged_attempt(key, send, attempt)
+                    if use_hedge
+                    else self._timed_attempt(key, send, attempt, hedge=False)
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                time.sleep(self._retry_delay(key, attempt, e))
+                continue
+            state.breaker.record_success()
+            return resp
+        raise AssertionError("unreachable")
+
+    async def acall(self, key: str, send: Callable[[float], Awaitable[T]]) -> T:
+        """call for coroutines: the same retries, breaker and metrics, without hedging."""
+        state = self._state(key)
+        for attempt in range(1, self.config.retry.max_attempts + 1):
+            state.breaker.before_call(key)
+            start = time.perf_counter()
+            try:
+                resp = await send(self.config.timeout_seconds)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._record_error(key, attempt, False, start, e)
+                await asyncio.sleep(self._retry_delay(key, attempt, e))
+                continue
+            self._record_ok(key, attempt, False, start, resp)
+            state.breaker.record_success()
+            return resp
+        raise AssertionError("unreachable")
+
+    def recent_attempts(self) -> tuple[AttemptMetric, ...]:
+        with self._lock:
+            return tuple(self._recent)
+
+    def stats(self) -> dict[str, KeyCallStats]:
+        """Per-key counters with p50/p95 over the latency window (successful attempts only)."""
+        with self._lock:
+            out: dict[str, KeyCallStats] = {}
+            for key, state in self._keys.items():
+                lat = list(state.latencies)
+                out[key] = replace(state.stats, p50_seconds=_percentile(lat, 0.5), p95_seconds=_percentile(lat, 0.95))
+            return out
+
+    def breaker_state(self, key: str) -> str:
+        return self._state(key).breaker.state
+
+    def reset(self) -> None:
+        with self._lock:
+            self._keys.clear()
+            self._recent.clear()
+
+    # ---- internals ----
+    def _state(self, key: str) -> _KeyState:
+        with self._lock:
+            state = self._keys.get(key)
+            if state is None:
+                state = self._keys[key] = _KeyState(
+                    breaker=CircuitBreaker(
+                        window=self.config.breaker_window,
+                        failure_ratio=self.config.breaker_failure_ratio,
+                        min_calls=self.config.breaker_min_calls,
+                        reset_seconds=self.config.breaker_reset_seconds,
+                    ),
+                    latencies=deque(maxlen=self.config.latency_window),
+                )
+            return state
+
+    def _hedge_delay(self, key: str) -> float:
+        state = self._state(key)
+        with self._lock:
+            lat = list(state.latencies)
+        hedge = self.config.hedge
+        if len(lat) < hedge.min_samples:
+            return hedge.default_delay
+        return max(hedge.min_delay, _percentile(lat, 0.95))
+
+    def _record(self, metric: AttemptMetric) -> None:
+        state = self._state(metric.key)
+        with self._lock:
+            self._recent.append(metric)
+            s = state.stats
+            s.attempts += 1
+            s.hedges += int(metric.hedge)
+            s.prompt_tokens += metric.prompt_tokens
+            s.completion_tokens += metric.completion_tokens
+            if metric.outcome in ("ok", "abandoned"):
+                s.successes += int(metric.outcome == "ok")
+                state.latencies.append(metric.latency_seconds)
+            else:
+                s.failures += 1
+
+    def _retry_delay(self, key: str, attempt: int, exc: Exception) -> float:
+        """Seconds to wait before retrying after exc; re-raises exc when the call should fail instead."""
+        state = self._state(key)
+        retry = self.config.retry
+        retryable, retry_after = self._classify(exc)
+        if not retryable:
+            # The request itself is bad; the model is fine, so the breaker isn't told.
+            state.breaker.record_success()
+            raise exc
+        state.breaker.record_failure()
+        too_long = retry_after is not None and retry_after > retry.max_retry_after
+        if attempt == retry.max_attempts or too_long:
+            raise exc
+        with self._lock:
+            state.stats.retries += 1
+        return retry.delay(attempt, retry_after)
+
+    def _record_error(self, key: str, attempt: int, hedge: bool, start: float, exc: BaseException) -> None:
+        self._record(
+            AttemptMetric(
+                key=key,
+                attempt=attempt,
+                hedge=hedge,
+                latency_seconds=time.perf_counter() - start,
+                outcome="timeout" if "timeout" in type(exc).__name__.lower() else "error",
+                error=type(exc).__name__,
+            )
+        )
+
+    def _record_ok(
+        self, key: str, attempt: int, hedge: bool, start: float, resp: Any, *, abandoned: bool = False
+    ) -> None:
+        prompt_tokens, completion_tokens = self._read_usage(resp)
+        self._record(
+            AttemptMetric(
+                key=key,
+                attempt=attempt,
+                hedge=hedge,
+                latency_seconds=time.perf_counter() - start,
+                outcome="abandoned" if abandoned else "ok",
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+            )
+        )
+
+    def _timed_attempt(
+        self,
+        key: str,
+        send: Callable[[float], T],
+        attempt: int,
+        *,
+        hedge: bool,
+        race_over: Optional[threading.Event] = None,
+    ) -> T:
+        start = time.perf_counter()
+        try:
+            resp = send(self.config.timeout_seconds)
+        except Exception as e:
+            self._record_error(key, attempt, hedge, start, e)
+            raise
+        self._record_ok(key, attempt, hedge, start, resp, abandoned=race_over is not None and race_over.is_set())
+        return resp
+
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.config.hedge_workers, thread_name_prefix="llm-hedge")
+            return self._pool
+
+    def _hedged_attempt(self, key: str, send: Callable[[float], T], attempt: int) -> T:
+        pool = self._hedge_pool()
+        race_over = threading.Event()
+        primary = pool.submit(self._timed_attempt, key, send, attempt, hedge=False, race_over=race_over)
+        done, _ = wait([primary], timeout=self._hedge_delay(key))
+        if done:
+            return primary.result()
+
+        secondary = pool.submit(self._timed_attempt, key, send, attempt, hedge=True, race_over=race_over)
+        pending: set[Future[T]] = {primary, secondary}
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                err = fut.exception()
+                if err is None:
+                    race_over.set()  # whichever is still running is recorded as abandoned
+                    if fut is secondary:
+                        state = self._state(key)
+                        with self._lock:
+                            state.stats.hedge_wins += 1
+                    return fut.result()
+                first_error = first_error or err
+        assert first_error is not None
+        raise first_error
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, Protocol
+
+from src.helpers.lru_cache import LRUCache
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    payload_json: str  # ChatCompletion.model_dump_json()
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Tokens that would have been billed without the cache, per model.
+    saved_tokens: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    def record_hit(self, entry: CachedResponse) -> None:
+        self.hits += 1
+        p, c = self.saved_tokens.get(entry.model, (0, 0))
+        self.saved_tokens[entry.model] = (p + entry.prompt_tokens, c + entry.completion_tokens)
+
+
+def _normalize_prompt(text: str) -> str:
+    # Trailing whitespace and line endings never change the completion.
+    return "\n".join(ln.rstrip() for ln in text.strip().splitlines())
+
+
+def request_cache_key(
+    *,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    response_format: Optional[dict[str, Any]] = None,
+) -> str:
+    payload = {
+        "model": model,
+        "temperature": round(float(temperature), 4),
+        "system": _normalize_prompt(system_prompt),
+        "user": _normalize_prompt(user_prompt),
+        "response_format": response_format,
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class ResponseCache(Protocol):
+    """
+    Interface for chat completion caches. Implementations must be thread-safe.
+    """
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """The entry stored under key, or None on a miss or after it expired."""
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """Store entry, evicting whatever the implementation's bounds require."""
+
+    def clear(self) -> None:
+        """Drop every entry."""
+
+
+class MemoryResponseCache:
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None) -> None:
+        self._lru: LRUCache[CachedResponse] = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self._lru.get(key)
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self._lru.put(key, entry)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+
+class SqliteResponseCache:
+    """
+    Persistent tier. Evicts least-recently-used rows past max_entries and drops rows older than ttl_seconds.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5_000, ttl_seconds: Optional[float] = None) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_tokens INTEGER NOT NULL,
+                    completion_tokens INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload, model, prompt_tokens, completion_tokens, created_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            payload, model, prompt_tokens, completion_tokens, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        return CachedResponse(
+            payload_json=payload,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.payload_json, entry.model, entry.prompt_tokens, entry.completion_tokens, now, now),
+            )
+            if self.ttl_seconds is not None:
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "  SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+class TieredResponseCache:
+    """
+    Memory in front of an optional persistent tier; persistent hits are promoted to memory.
+    """
+
+    def __init__(self, memory: ResponseCache, persistent: Optional[ResponseCache] = None) -> None:
+        self.memory = memory
+        self.persistent = persistent
+        self.stats = ResponseCacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.memory.get(key)
+        if entry is None and self.persistent is not None:
+            entry = self.persistent.get(key)
+            if entry is not None:
+                self.memory.put(key, entry)
+
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+            else:
+                self.stats.record_hit(entry)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self.memory.put(key, entry)
+        if self.persistent is not None:
+            self.persistent.put(key, entry)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+        with self._lock:
+            self.stats = ResponseCacheStats()
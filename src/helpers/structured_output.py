@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+from pydantic import BaseModel
+
+from src.app.settings import STRUCTURED_OUTPUT_MODELS
+
+JSON_OBJECT_RESPONSE_FORMAT: dict[str, Any] = {"type": "json_object"}
+
+
+def strict_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """
+    The pydantic model's JSON schema in the subset Structured Outputs accepts with strict=True:
+    every object closed (additionalProperties false) with all properties required, no titles/defaults.
+    """
+    schema = copy.deepcopy(model.model_json_schema())
+    _make_strict(schema)
+    return schema
+
+
+def _make_strict(node: dict[str, Any]) -> None:
+    node.pop("title", None)
+    node.pop("default", None)
+    if node.get("type") == "object":
+        node["additionalProperties"] = False
+        node["required"] = list(node.get("properties", {}))
+    # Recurse by keyword so property names (e.g. a field called "title") are never touched.
+    for key in ("properties", "$defs"):
+        for child in node.get(key, {}).values():
+            _make_strict(child)
+    for key in ("anyOf", "allOf"):
+        for child in node.get(key, []):
+            _make_strict(child)
+    if isinstance(node.get("items"), dict):
+        _make_strict(node["items"])
+
+
+def json_schema_response_format(name: str, schema: dict[str, Any]) -> dict[str, Any]:
+    """response_format for chat.completions that constrains decoding to schema."""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+def response_format_for_model(model: str, response_format: dict[str, Any]) -> dict[str, Any]:
+    """
+    response_format as the model accepts it. Models without Structured Outputs (see
+    STRUCTURED_OUTPUT_MODELS) reject json_schema with a 400, so they get JSON mode instead;
+    the prompts still describe the shape and callers' salvage/repair parsing covers the rest.
+    """
+    if response_format.get("type") == "json_schema" and model not in STRUCTURED_OUTPUT_MODELS:
+        return JSON_OBJECT_RESPONSE_FORMAT
+    return response_format
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+from typing import Any, Optional
+
+from src.app.settings import MODEL_TOKEN_ENCODINGS
+
+_DEFAULT_ENCODING = "o200k_base"
+
+# Rough stand-in for the BPE pre-tokenizer: letter runs, up to 3 digits, punctuation runs, whitespace.
+_PIECE_RE = re.compile(r"[^\W\d_]+|\d{1,3}|[^\w\s]+|_+|\s+")
+
+# Chat formatting overhead (role markers etc.) per message, plus the reply primer.
+_TOKENS_PER_MESSAGE = 3
+_TOKENS_REPLY_PRIMER = 3
+
+
+@lru_cache(maxsize=None)
+def _tiktoken_encoding(name: str) -> Optional[Any]:
+    # Optional dependency; its BPE files may also be unavailable offline, so any failure falls back.
+    try:
+        import tiktoken  # pylint: disable=import-error
+
+        return tiktoken.get_encoding(name)
+    except Exception:
+        return None
+
+
+def _encoding_for(model: str) -> Optional[Any]:
+    return _tiktoken_encoding(MODEL_TOKEN_ENCODINGS.get(model, _DEFAULT_ENCODING))
+
+
+def approx_token_count(text: str) -> int:
+    """
+    Local approximation of BPE token counts (typically within ~15% for English prose and resumes).
+    Short words are one token, longer ones one per ~6 letters; digits go in groups of three.
+    """
+    n = 0
+    for m in _PIECE_RE.finditer(text):
+        piece = m.group()
+        if piece.isspace():
+            # A single space is merged into the next word; newlines and runs cost a token.
+            n += 0 if piece == " " else 1
+        elif piece[0].isalpha():
+            n += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            n += 1
+        else:
+            n += math.ceil(len(piece) / 2)
+    return n
+
+
+def count_tokens(text: str, model: str) -> int:
+    enc = _encoding_for(model)
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return approx_token_count(text)
+
+
+def count_chat_tokens(system_prompt: str, user_prompt: str, model: str) -> int:
+    """Prompt tokens for a system + user chat request, including message framing."""
+    return (
+        count_tokens(system_prompt, model)
+        + count_tokens(user_prompt, model)
+        + 2 * _TOKENS_PER_MESSAGE
+        + _TOKENS_REPLY_PRIMER
+    )
+
+
+def truncate_to_tokens(text: str, model: str, max_tokens: int) -> str:
+    """Longest prefix of text that fits in max_tokens (cut at a whitespace boundary when possible)."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    enc = _encoding_for(model)
+    if enc is not None:
+        prefix = enc.decode(enc.encode(text, disallowed_special=())[:max_tokens])
+    else:
+        # Token counts grow monotonically with the prefix, so binary search on characters.
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if approx_token_count(text[:mid]) <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        prefix = text[:lo]
+
+    cut = prefix.rstrip().rfind(" ")
+    return prefix[:cut] if cut > len(prefix) // 2 else prefix
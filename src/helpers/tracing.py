@@ -0,0 +1,219 @@
+"""
+Lightweight timing spans for the pipeline stages.
+
+    with span("alignment.parse"):
+        ...
+
+    @traced("llm.call")
+    def call_open_ai(...): ...
+
+    with collect_timings() as timings:
+        run_pipeline()
+    timings.breakdown()  # per span name: calls, total and self time
+
+Spans nest (each records its parent) and cost two perf_counter calls when nothing is
+collecting. They are also forwarded to the configured exporter: a no-op by default, or
+OpenTelemetry with TRACING_EXPORTER=otel (opentelemetry-api, with an SDK/exporter set up the
+usual way, e.g. opentelemetry-instrument).
+
+The active collector lives in a ContextVar, so spans in worker threads are collected only when
+the work is submitted through contextvars.copy_context().run. Coroutines handed to
+openai_client.run_async already run in a copy of the caller's context.
+"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import inspect
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Iterator, Mapping, Optional, Protocol, TypeVar, cast
+
+from src.app.settings import TRACING_EXPORTER
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    span_id: int
+    parent_id: Optional[int]
+    name: str
+    start_seconds: float  # time.perf_counter()
+    duration_seconds: float
+    attributes: Mapping[str, Any] = field(default_factory=dict)
+    error: str = ""
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    name: str
+    calls: int
+    total_seconds: float
+    self_seconds: float  # total minus time spent in child spans
+
+
+class Timings:
+    """Thread-safe collector of finished spans for one run."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self._spans: list[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: SpanRecord) -> None:
+        with self._lock:
+            self._spans.append(record)
+
+    @property
+    def wall_seconds(self) -> float:
+        """Since collection started; frozen once it ends."""
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def spans(self) -> tuple[SpanRecord, ...]:
+        with self._lock:
+            return tuple(self._spans)
+
+    def breakdown(self) -> list[StageTiming]:
+        """One row per span name, in order of first start."""
+        spans = sorted(self.spans, key=lambda s: s.start_seconds)
+        child_seconds: dict[int, float] = {}
+        for s in spans:
+            if s.parent_id is not None:
+                child_seconds[s.parent_id] = child_seconds.get(s.parent_id, 0.0) + s.duration_seconds
+
+        rows: dict[str, list[float]] = {}
+        for s in spans:
+            row = rows.setdefault(s.name, [0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += s.duration_seconds
+            row[2] += max(0.0, s.duration_seconds - child_seconds.get(s.span_id, 0.0))
+        return [StageTiming(name, int(calls), total, own) for name, (calls, total, own) in rows.items()]
+
+
+class SpanExporter(Protocol):
+    def span(self, name: str, attributes: Mapping[str, Any]) -> ContextManager[Any]:
+        """Wrap a live span."""
+
+    def record(self, name: str, start_ns: int, end_ns: int, attributes: Mapping[str, Any]) -> None:
+        """Export a span that was timed by hand (wall-clock nanoseconds)."""
+
+
+class NoopExporter:  # pylint: disable=unused-argument
+    def span(self, name: str, attributes: Mapping[str, Any]) -> ContextManager[Any]:
+        return contextlib.nullcontext()
+
+    def record(self, name: str, start_ns: int, end_ns: int, attributes: Mapping[str, Any]) -> None:
+        return None
+
+
+class OpenTelemetryExporter:
+    """Spans become OpenTelemetry spans on the globally configured tracer provider."""
+
+    def __init__(self, tracer_name: str = "tech-recruiter-prep-ai") -> None:
+        from opentelemetry import trace  # pylint: disable=import-error
+
+        self._tracer = trace.get_tracer(tracer_name)
+
+    def span(self, name: str, attributes: Mapping[str, Any]) -> ContextManager[Any]:
+        return self._tracer.start_as_current_span(name, attributes=_otel_attributes(attributes))
+
+    def record(self, name: str, start_ns: int, end_ns: int, attributes: Mapping[str, Any]) -> None:
+        self._tracer.start_span(name, start_time=start_ns, attributes=_otel_attributes(attributes)).end(end_time=end_ns)
+
+
+def _otel_attributes(attributes: Mapping[str, Any]) -> dict[str, Any]:
+    return {k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in attributes.items()}
+
+
+def _default_exporter() -> SpanExporter:
+    if TRACING_EXPORTER == "otel":
+        return OpenTelemetryExporter()
+    return NoopExporter()
+
+
+_exporter: SpanExporter = _default_exporter()
+_collector: ContextVar[Optional[Timings]] = ContextVar("tracing_collector", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("tracing_current_span", default=None)
+_span_ids = itertools.count(1)
+
+
+def set_span_exporter(exporter: Optional[SpanExporter]) -> None:
+    """Swap the exporter (None restores the no-op)."""
+    global _exporter  # pylint: disable=global-statement
+    _exporter = exporter if exporter is not None else NoopExporter()
+
+
+@contextlib.contextmanager
+def collect_timings() -> Iterator[Timings]:
+    """Collect every span finished in this context (and copied contexts) until exit."""
+    timings = Timings()
+    token = _collector.set(timings)
+    try:
+        yield timings
+    finally:
+        timings.finished = time.perf_counter()
+        _collector.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    parent_id = _current_span.get()
+    span_id = next(_span_ids)
+    token = _current_span.set(span_id)
+    error = ""
+    start = time.perf_counter()
+    try:
+        with _exporter.span(name, attributes):
+            yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_span.reset(token)
+        timings = _collector.get()
+        if timings is not None:
+            timings.add(SpanRecord(span_id, parent_id, name, start, duration, attributes, error))
+
+
+def record_span(name: str, start_seconds: float, duration_seconds: float, **attributes: Any) -> None:
+    """
+    Add a span timed by hand (start from time.perf_counter()), as a child of the current span.
+    For work that can't sit inside a with block, e.g. time spent waiting on a stream between yields.
+    """
+    timings = _collector.get()
+    if timings is not None:
+        timings.add(
+            SpanRecord(next(_span_ids), _current_span.get(), name, start_seconds, duration_seconds, attributes)
+        )
+    end_ns = time.time_ns() - int((time.perf_counter() - start_seconds - duration_seconds) * 1e9)
+    _exporter.record(name, end_ns - int(duration_seconds * 1e9), end_ns, attributes)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator: run the function (or coroutine function) inside span(name)."""
+
+    def decorate(fn: F) -> F:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await fn(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorate
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from src.helpers.atomic_write import write_atomic
+from src.helpers.lru_cache import LRUCache
+
+
+@dataclass
+class VectorIndexStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    embed_seconds: float = 0.0  # time spent embedding on misses
+
+
+class VectorIndex:
+    """
+    Chunk-vector store keyed by content hash (the caller's key), with an in-process LRU
+    and an optional on-disk tier of .npy files that are opened memory-mapped, so a known
+    resume is never re-embedded and only the pages a query touches are read.
+    """
+
+    def __init__(self, max_entries: int = 32, index_dir: Optional[str] = None) -> None:
+        self._memory: LRUCache[np.ndarray] = LRUCache(max_entries=max_entries)
+        self._dir = Path(index_dir) if index_dir else None
+        self._lock = threading.Lock()
+        self.stats = VectorIndexStats()
+
+    def get_or_embed(self, key: str, embed: Callable[[], np.ndarray]) -> np.ndarray:
+        vectors = self._memory.get(key)
+        if vectors is not None:
+            with self._lock:
+                self.stats.hits += 1
+            return vectors
+
+        vectors = self._read_disk(key)
+        if vectors is not None:
+            self._memory.put(key, vectors)
+            with self._lock:
+                self.stats.disk_hits += 1
+            return vectors
+
+        start = time.perf_counter()
+        vectors = np.ascontiguousarray(embed(), dtype=np.float32)
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.embed_seconds += time.perf_counter() - start
+
+        self._memory.put(key, vectors)
+        self._write_disk(key, vectors)
+        return vectors
+
+    def clear(self) -> None:
+        self._memory.clear()
+        with self._lock:
+            self.stats = VectorIndexStats()
+
+    def _path(self, key: str) -> Path:
+        assert self._dir is not None
+        return self._dir / f"{key}.npy"
+
+    def _read_disk(self, key: str) -> Optional[np.ndarray]:
+        if self._dir is None:
+            return None
+        try:
+            return np.load(self._path(key), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, vectors: np.ndarray) -> None:
+        # Empty matrices can't be memory-mapped; they're cheap to recompute anyway.
+        if self._dir is not None and vectors.size > 0:
+            write_atomic(self._path(key), lambda f: np.save(f, vectors))
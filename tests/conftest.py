@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from src.helpers import openai_client
+from src.helpers.response_cache import MemoryResponseCache, TieredResponseCache
+
+# generate_recruiter_prep arguments other than model.
+PREP_INPUTS = {
+    "system_prompt_key": "zero_shot_structured",
+    "temperature": 0.2,
+    "job_title": "ML Engineer",
+    "job_desc": "Python and PyTorch.",
+    "level": "Mid",
+    "company_type": "Startup",
+    "resume_text": "Built PyTorch models in Python.",
+}
+
+
+def chat_completion(
+    content: str = "{}",
+    *,
+    model: str = "gpt-4o-mini",
+    prompt_tokens: int = 100,
+    completion_tokens: int = 20,
+    finish_reason: str = "stop",
+    refusal: str | None = None,
+) -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": finish_reason,
+                    "message": {"role": "assistant", "content": content, "refusal": refusal},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+    )
+
+
+class StubClient:  # pylint: disable=too-few-public-methods
+    """Stands in for OpenAI(): records each create() call and answers with the queued responses."""
+
+    def __init__(self, *responses: ChatCompletion) -> None:
+        self.responses = list(responses)
+        self.requests: list[dict[str, Any]] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs: Any) -> ChatCompletion:
+        self.requests.append(kwargs)
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0] if self.responses else chat_completion()
+
+
+@pytest.fixture
+def llm_cache():
+    """A fresh in-memory response cache, restored afterwards."""
+    previous = openai_client.get_response_cache()
+    cache = TieredResponseCache(memory=MemoryResponseCache(max_entries=16))
+    openai_client.set_response_cache(cache)
+    yield cache
+    openai_client.set_response_cache(previous)
+
+
+@pytest.fixture
+def stub_client(monkeypatch, llm_cache):  # pylint: disable=unused-argument,redefined-outer-name
+    """Routes call_open_ai to a StubClient; queue responses with stub_client.responses."""
+    client = StubClient()
+    monkeypatch.setattr(openai_client, "get_client", lambda: client)
+    return client
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+
+from src.app.alignment import generate
+from src.app.alignment.generate import score_requirements_against_resume, score_requirements_against_resumes
+
+REQUIREMENTS = [
+    {"requirement": "Python services", "keywords": ["Python", "FastAPI"]},
+    {"requirement": "Streaming data", "keywords": ["Kafka"]},
+    {"requirement": "Cloud", "keywords": ["AWS", "Terraform"]},
+]
+RESUMES = [
+    "Built FastAPI services in Python.\nRan Kafka consumers on AWS.",
+    "Java developer.\nSome Terraform.",
+    "",
+]
+
+
+@pytest.mark.parametrize("mode", ["keyword", "bm25"])
+def test_batch_matches_scoring_each_resume(mode):
+    batch = score_requirements_against_resumes(REQUIREMENTS, RESUMES, mode=mode)
+
+    assert batch == [score_requirements_against_resume(REQUIREMENTS, text, mode=mode) for text in RESUMES]
+
+
+def test_keyword_batch_compiles_the_keywords_once(monkeypatch):
+    calls = []
+    real = generate.keyword_matcher
+    monkeypatch.setattr(generate, "keyword_matcher", lambda keywords: calls.append(1) or real(keywords))
+
+    batch = score_requirements_against_resumes(REQUIREMENTS, RESUMES, mode="keyword")
+
+    assert len(calls) == 1
+    assert [[m.strength for m in matches] for matches in batch] == [[2, 1, 1], [0, 0, 1], [0, 0, 0]]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from openai import InternalServerError
+
+from benchmarks.fake_openai import FakeOpenAIServer, FaultProfile
+from src.helpers import openai_client
+from src.helpers.resilience import ResilienceConfig, RetryPolicy
+from src.helpers.tracing import collect_timings
+
+MODEL = "gpt-4o-mini"
+
+
+@pytest.fixture(scope="module")
+def server():
+    # One server for the module: the pooled path keeps its client on the shared background loop.
+    fake = FakeOpenAIServer().start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture(autouse=True)
+def _fake_openai(monkeypatch, server):  # pylint: disable=redefined-outer-name
+    server.profile = FaultProfile(content='{"ok": true}')
+    server.requests = 0
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-fake")
+    previous_cache = openai_client.get_response_cache()
+    openai_client.set_response_cache(None)
+    openai_client.configure_resilience(ResilienceConfig(retry=RetryPolicy(max_attempts=3, base_delay=0.0)))
+    yield
+    openai_client.configure_resilience(None)
+    openai_client.set_response_cache(previous_cache)
+
+
+def test_pooled_call_returns_the_completion_and_is_traced(server):  # pylint: disable=redefined-outer-name
+    with collect_timings() as timings:
+        resp = openai_client.call_open_ai_pooled(MODEL, "system", "user", 0.0)
+
+    assert resp.choices[0].message.content == '{"ok": true}'
+    assert server.requests == 1
+    assert [s.name for s in timings.spans] == ["llm.call"]
+    assert openai_client.llm_call_stats()[MODEL].successes == 1
+
+
+def test_async_retries_come_from_the_resilience_layer_only(server):  # pylint: disable=redefined-outer-name
+    server.profile = FaultProfile(server_error_rate=1.0)
+
+    with pytest.raises(InternalServerError):
+        asyncio.run(openai_client.acall_open_ai(MODEL, "system", "user", 0.0))
+
+    # Three attempts from RetryPolicy; the SDK adds none of its own.
+    assert server.requests == 3
+    stats = openai_client.llm_call_stats()[MODEL]
+    assert (stats.attempts, stats.failures, stats.retries) == (3, 3, 2)
+
+
+def test_async_recovers_from_rate_limits(server):  # pylint: disable=redefined-outer-name
+    server.profile = FaultProfile(rate_limit_rate=0.3, retry_after_seconds=0.01, content='{"ok": true}', seed=3)
+    openai_client.configure_resilience(ResilienceConfig(retry=RetryPolicy(max_attempts=6, base_delay=0.0)))
+
+    async def many() -> list:
+        return await asyncio.gather(
+            *(openai_client.acall_open_ai(MODEL, "system", f"user {i}", 0.0) for i in range(8))
+        )
+
+    responses = asyncio.run(many())
+
+    assert all(r.choices[0].message.content == '{"ok": true}' for r in responses)
+    assert server.requests > 8
+
+
+def test_in_flight_limit_queues_requests(monkeypatch, server):  # pylint: disable=redefined-outer-name
+    server.profile = FaultProfile(latency_seconds=0.1)
+    monkeypatch.setattr(openai_client, "LLM_MAX_IN_FLIGHT", 2)
+
+    async def many() -> None:
+        await asyncio.gather(*(openai_client.acall_open_ai(MODEL, "system", f"user {i}", 0.0) for i in range(6)))
+
+    start = time.perf_counter()
+    asyncio.run(many())  # a new loop, so it gets its own limiter sized from LLM_MAX_IN_FLIGHT
+
+    assert time.perf_counter() - start >= 0.3  # 6 requests, 2 at a time, 0.1s each
+
+
+def test_each_loops_client_is_closed_when_the_loop_shuts_down():
+    async def call_and_get_client():
+        await openai_client.acall_open_ai(MODEL, "system", "user", 0.0)
+        return (await openai_client._resources()).client  # pylint: disable=protected-access
+
+    clients = [asyncio.run(call_and_get_client()) for _ in range(2)]
+
+    assert clients[0] is not clients[1]  # one per loop
+    assert all(c.is_closed() for c in clients)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.helpers.atomic_write import write_atomic
+from src.helpers.pdf_cache import PdfTextCache
+from src.helpers.vector_index import VectorIndex
+
+
+def test_write_replaces_the_file(tmp_path):
+    path = tmp_path / "nested" / "entry.json"
+
+    assert write_atomic(path, lambda f: f.write(b"old"))
+    assert write_atomic(path, lambda f: f.write(b"new"))
+
+    assert path.read_bytes() == b"new"
+    assert [p.name for p in path.parent.iterdir()] == ["entry.json"]
+
+
+def test_failed_write_keeps_the_old_file_and_no_temp_file(tmp_path):
+    path = tmp_path / "entry.json"
+    write_atomic(path, lambda f: f.write(b"old"))
+
+    def fail(f):
+        f.write(b"partial")
+        raise OSError("disk full")
+
+    assert not write_atomic(path, fail)
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["entry.json"]
+
+
+def test_disk_tiers_are_read_back_by_a_new_instance(tmp_path):
+    PdfTextCache(cache_dir=str(tmp_path)).get_or_extract(b"%PDF", 100, lambda b, n: "resume text")
+    VectorIndex(index_dir=str(tmp_path)).get_or_embed("resume", lambda: np.ones((2, 3)))
+
+    pdf_cache = PdfTextCache(cache_dir=str(tmp_path))
+    index = VectorIndex(index_dir=str(tmp_path))
+
+    assert pdf_cache.get_or_extract(b"%PDF", 100, lambda b, n: "re-parsed") == "resume text"
+    assert np.array_equal(index.get_or_embed("resume", lambda: np.zeros((2, 3))), np.ones((2, 3)))
+    assert (pdf_cache.stats.disk_hits, index.stats.disk_hits) == (1, 1)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from benchmarks.synthetic import synthetic_resume_lines
+from src.helpers import pdf_extract
+from src.helpers.pdf_extract import extract_text_from_pdf, iter_pdf_page_texts, iter_pdf_page_texts_parallel
+
+N_PAGES = 9
+BLANK_PAGE = 4
+
+
+def _pdf(n_pages: int) -> bytes:
+    """Numbered pages of resume-like lines, one of them blank."""
+    buf = io.BytesIO()
+    with PdfPages(buf) as pdf:
+        for p in range(n_pages):
+            fig = Figure(figsize=(8.5, 11))
+            if p != BLANK_PAGE:
+                fig.text(0.05, 0.97, f"Page {p}", fontsize=7)
+                for i, line in enumerate(synthetic_resume_lines(8, seed=p)):
+                    fig.text(0.05, 0.9 - i * 0.1, line, fontsize=7)
+            pdf.savefig(fig)
+    return buf.getvalue()
+
+
+@pytest.fixture(name="pdf_bytes", scope="module")
+def _pdf_bytes() -> bytes:
+    return _pdf(N_PAGES)
+
+
+def _page_numbers(pages: list[str]) -> list[int]:
+    return [int(p.split("Page ", 1)[1].split(None, 1)[0]) for p in pages]
+
+
+def test_parallel_pages_match_serial_in_page_order(pdf_bytes):
+    serial = list(iter_pdf_page_texts(pdf_bytes))
+    parallel = list(iter_pdf_page_texts_parallel(pdf_bytes, min_pages=2, max_workers=3))
+
+    assert parallel == serial
+    assert _page_numbers(parallel) == [p for p in range(N_PAGES) if p != BLANK_PAGE]
+
+
+@pytest.mark.parametrize("max_chars", [50, 700, 2_000, 60_000])
+def test_parallel_extraction_truncates_like_serial(monkeypatch, pdf_bytes, max_chars):
+    serial = extract_text_from_pdf(pdf_bytes, max_chars, use_cache=False)
+    monkeypatch.setattr(
+        pdf_extract,
+        "iter_pdf_page_texts_parallel",
+        lambda b: iter_pdf_page_texts_parallel(b, min_pages=2, max_workers=3),
+    )
+
+    assert extract_text_from_pdf(pdf_bytes, max_chars, use_cache=False, parallel=True) == serial
+    assert serial.endswith("[TRUNCATED]") == (max_chars < 60_000)
+
+
+def test_closing_the_parallel_iterator_early_shuts_the_pool_down(pdf_bytes):
+    pages = iter_pdf_page_texts_parallel(pdf_bytes, min_pages=2, max_workers=2)
+
+    assert _page_numbers([next(pages)]) == [0]
+    pages.close()
+
+
+@pytest.mark.parametrize(("min_pages", "max_workers"), [(N_PAGES + 1, 4), (2, 1)])
+def test_falls_back_to_serial_without_a_process_pool(monkeypatch, pdf_bytes, min_pages, max_workers):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool should not be started")
+
+    monkeypatch.setattr(pdf_extract, "ProcessPoolExecutor", no_pool)
+
+    pages = list(iter_pdf_page_texts_parallel(pdf_bytes, min_pages=min_pages, max_workers=max_workers))
+
+    assert pages == list(iter_pdf_page_texts(pdf_bytes))
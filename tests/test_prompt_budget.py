@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from src.app.recruiter_prep.prompt_budget import clean_resume_text, fit_prompt_to_budget
+
+MODEL = "gpt-4o-mini"
+PAGE_1 = """Jane Doe | jane@example.com
+EXPERIENCE
+Acme Corp
+Software Engineer
+- Python
+- Built the billing service
+Jane Doe - Resume
+1"""
+PAGE_2 = """Jane Doe | jane@example.com
+Beta Inc
+Software Engineer
+- Python
+- Ran the data platform
+Jane Doe - Resume
+Page 2 of 2"""
+RESUME = f"{PAGE_1}\n\n{PAGE_2}"  # pdf_extract joins pages with a blank line
+
+
+def _render(job_desc: str, resume: str) -> tuple[str, str]:
+    return "You are a recruiter.", f"JD:\n{job_desc}\n\nRESUME:\n{resume}"
+
+
+def test_running_headers_footers_and_page_numbers_are_dropped_after_the_first_page():
+    cleaned = clean_resume_text(RESUME).splitlines()
+
+    assert cleaned.count("Jane Doe | jane@example.com") == 1
+    assert cleaned.count("Jane Doe - Resume") == 1
+    assert "1" not in cleaned and "Page 2 of 2" not in cleaned
+
+
+def test_repeated_content_lines_are_kept():
+    cleaned = clean_resume_text(RESUME).splitlines()
+
+    assert cleaned.count("Software Engineer") == 2
+    assert cleaned.count("- Python") == 2
+
+
+def test_repeated_bullet_at_a_block_edge_is_kept():
+    text = "Acme\n- Python\n\nBeta\n- Python"
+
+    assert clean_resume_text(text) == text
+
+
+def test_prompt_within_budget_is_sent_unchanged():
+    budgeted = fit_prompt_to_budget(model=MODEL, render=_render, job_desc="Python", resume_text=RESUME)
+
+    assert budgeted.user_prompt == _render("Python", RESUME)[1]
+    assert not budgeted.report.resume_compressed
+    assert budgeted.report.sections_kept == budgeted.report.sections_total
+
+
+def test_prompt_over_budget_is_cleaned_and_fits():
+    resume = RESUME + "\n\nPROJECTS\n" + "\n".join(f"- Side project {i} with Rust and Go" for i in range(400))
+    budgeted = fit_prompt_to_budget(
+        model=MODEL, render=_render, job_desc="Python data platform", resume_text=resume, budget_tokens=600
+    )
+
+    assert budgeted.report.prompt_tokens <= 600
+    assert budgeted.report.resume_compressed
+    assert "Page 2 of 2" not in budgeted.user_prompt
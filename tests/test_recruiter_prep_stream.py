@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import random
+from typing import Iterator
+
+import pytest
+from openai.types.chat import ChatCompletionChunk
+
+from src.app.pricing.calculate import estimate_cost
+from src.app.recruiter_prep.build_prompt import CATEGORIES
+from src.app.recruiter_prep.generate import RecruiterPrepStream
+from src.app.recruiter_prep.schema import QAItem
+
+MODEL = "gpt-4o-mini"
+
+
+def _item(category: str) -> dict[str, str]:
+    return {
+        "category": category,
+        "question": f'About "{category}" {{?}}',
+        "intent": "Intent.",
+        "answer": "Answer [with] brackets.",
+        "follow_up": "And then?",
+    }
+
+
+def _chunk(content: str | None = None, usage: dict | None = None) -> ChatCompletionChunk:
+    choices = [] if content is None else [{"index": 0, "delta": {"content": content}, "finish_reason": None}]
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": MODEL,
+            "choices": choices,
+            "usage": usage,
+        }
+    )
+
+
+def _chunks(items: list[dict], seed: int = 0) -> list[ChatCompletionChunk]:
+    """The JSON split at random points, then the usage-only chunk stream_options.include_usage adds."""
+    text = json.dumps({"questions": items})
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(text)), k=60))
+    pieces = [text[a:b] for a, b in zip([0, *cuts], [*cuts, len(text)])]
+    usage = {"prompt_tokens": 1_500, "completion_tokens": 900, "total_tokens": 2_400}
+    return [_chunk(p) for p in pieces] + [_chunk(usage=usage)]
+
+
+def _counting(chunks: list[ChatCompletionChunk], consumed: list[int]) -> Iterator[ChatCompletionChunk]:
+    for i, chunk in enumerate(chunks, start=1):
+        consumed[0] = i
+        yield chunk
+
+
+def test_items_are_yielded_while_the_stream_is_still_open():
+    chunks = _chunks([_item(c) for c in CATEGORIES])
+    consumed = [0]
+    stream = RecruiterPrepStream(MODEL, _counting(chunks, consumed))
+
+    consumed_at_yield = []
+    items = []
+    for item in stream:
+        consumed_at_yield.append(consumed[0])
+        items.append(item)
+
+    assert [i.category for i in items] == list(CATEGORIES)
+    assert consumed_at_yield[0] < len(chunks) // 2
+    assert consumed_at_yield == sorted(consumed_at_yield)
+
+
+def test_result_and_cost_come_from_the_final_usage_chunk():
+    stream = RecruiterPrepStream(MODEL, _chunks([_item(c) for c in CATEGORIES], seed=1))
+    assert stream.result is None
+
+    list(stream)
+
+    result = stream.result
+    assert result is not None
+    assert [q.category for q in result.output.questions] == list(CATEGORIES)
+    assert result.cost == estimate_cost(MODEL, 1_500, 900)
+    assert not result.missing
+    assert set(result.item_costs) == set(CATEGORIES)
+    # Split by each item's share of the output, rounded per item.
+    assert sum(c.completion_tokens for c in result.item_costs.values()) == pytest.approx(900, abs=len(CATEGORIES))
+
+
+def test_invalid_and_missing_items_are_repaired_and_yielded_last():
+    broken, dropped = CATEGORIES[2], CATEGORIES[5]
+    items = [_item(c) for c in CATEGORIES if c != dropped]
+    del items[2]["answer"]
+    requested = []
+
+    def repair(categories):
+        requested.append(categories)
+        return {c: QAItem.model_validate(_item(c)) for c in categories}, estimate_cost(MODEL, 1_000, 100)
+
+    stream = RecruiterPrepStream(MODEL, _chunks(items, seed=2), repair=repair)
+    yielded = [i.category for i in stream]
+
+    assert requested == [(broken, dropped)]
+    assert yielded[-2:] == [broken, dropped]
+    assert sorted(yielded) == sorted(CATEGORIES)
+    result = stream.result
+    assert [q.category for q in result.output.questions] == list(CATEGORIES)
+    assert result.repaired == (broken, dropped)
+    assert result.cost.total_cost_usd == pytest.approx(estimate_cost(MODEL, 2_500, 1_000).total_cost_usd)
+
+
+@pytest.mark.parametrize("corruption", ['{"category": "Bad", "question": tru}', "}]}"])
+def test_corrupt_json_midway_falls_back_to_salvage_and_repair(corruption):
+    good = [json.dumps(_item(c)) for c in CATEGORIES]
+    text = '{"questions": [' + ", ".join(good[:4]) + ", " + corruption + ", " + ", ".join(good[4:]) + "]}"
+    pieces = [text[i : i + 25] for i in range(0, len(text), 25)]
+    usage = {"prompt_tokens": 1_500, "completion_tokens": 900, "total_tokens": 2_400}
+    requested = []
+
+    def repair(categories):
+        requested.append(categories)
+        return {c: QAItem.model_validate(_item(c)) for c in categories}, estimate_cost(MODEL, 1_000, 100)
+
+    stream = RecruiterPrepStream(MODEL, [_chunk(p) for p in pieces] + [_chunk(usage=usage)], repair=repair)
+    yielded = [i.category for i in stream]
+
+    # Items before the corruption were streamed (one sharing its chunk may be lost); the rest
+    # are re-requested and arrive repaired, so every category is yielded exactly once.
+    assert len(requested) == 1 and requested[0] == tuple(CATEGORIES[-len(requested[0]) :])
+    assert len(requested[0]) <= len(CATEGORIES) - 3
+    assert yielded == list(CATEGORIES)
+    assert [q.category for q in stream.result.output.questions] == list(CATEGORIES)
+    assert stream.result.repaired == requested[0]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.app.recruiter_prep.build_prompt import CATEGORIES
+from src.app.recruiter_prep.generate import generate_recruiter_prep
+from src.app.recruiter_prep.regenerate import regenerate_recruiter_prep_item
+from tests.conftest import PREP_INPUTS, chat_completion
+
+MODEL = "gpt-4o-mini"
+
+
+def _item(category: str, answer: str = "A.") -> dict[str, str]:
+    return {"category": category, "question": "Q?", "intent": "I.", "answer": answer, "follow_up": "F?"}
+
+
+def _questions(*categories: str, answer: str = "A.") -> str:
+    return json.dumps({"questions": [_item(c, answer) for c in categories]})
+
+
+def _previous(stub_client, categories=tuple(CATEGORIES)):
+    # A failed repair (invalid JSON) leaves categories outside `categories` missing.
+    stub_client.responses = [
+        chat_completion(_questions(*categories), prompt_tokens=2_000, completion_tokens=1_000),
+        chat_completion("not json"),
+    ]
+    previous = generate_recruiter_prep(model=MODEL, use_cache=False, **PREP_INPUTS)
+    stub_client.requests.clear()
+    return previous
+
+
+def _regenerate(previous, category):
+    return regenerate_recruiter_prep_item(previous=previous, category=category, model=MODEL, **PREP_INPUTS)
+
+
+def test_replaced_item_keeps_its_position(stub_client):
+    previous = _previous(stub_client)
+    category = CATEGORIES[4]
+    stub_client.responses = [chat_completion(_questions(category, answer="new"), completion_tokens=90)]
+
+    regen = _regenerate(previous, category)
+
+    questions = regen.result.output.questions
+    assert [q.category for q in questions] == list(CATEGORIES)
+    assert questions[4].answer == "new" and regen.item is questions[4]
+    assert questions[:4] == previous.output.questions[:4]
+    assert questions[5:] == previous.output.questions[5:]
+    assert len(stub_client.requests) == 1
+    assert stub_client.requests[0]["response_format"]["json_schema"]["schema"]["properties"]["questions"][
+        "maxItems"
+    ] == 1
+
+
+def test_costs_are_added_to_the_item_and_the_total(stub_client):
+    previous = _previous(stub_client)
+    category = CATEGORIES[0]
+    stub_client.responses = [chat_completion(_questions(category), completion_tokens=90)]
+
+    regen = _regenerate(previous, category)
+
+    costs = regen.result.item_costs
+    assert regen.cost.completion_tokens == 90
+    assert costs[category].completion_tokens == previous.item_costs[category].completion_tokens + 90
+    assert regen.result.cost.total_cost_usd == pytest.approx(previous.cost.total_cost_usd + regen.cost.total_cost_usd)
+    assert sum(c.total_cost_usd for c in costs.values()) == pytest.approx(
+        sum(c.total_cost_usd for c in previous.item_costs.values()) + regen.cost.total_cost_usd
+    )
+    assert all(costs[c] == previous.item_costs[c] for c in CATEGORIES[1:])
+    assert regen.saved_usd > 0
+
+
+def test_missing_category_is_resolved(stub_client):
+    previous = _previous(stub_client, categories=tuple(CATEGORIES[:-1]))
+    assert previous.missing == (CATEGORIES[-1],)
+    stub_client.responses = [chat_completion(_questions(CATEGORIES[-1]))]
+
+    regen = _regenerate(previous, CATEGORIES[-1])
+
+    assert not regen.result.missing
+    assert [q.category for q in regen.result.output.questions] == list(CATEGORIES)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        json.dumps({"questions": [{"category": CATEGORIES[2], "question": "Q?"}]}),  # fields missing
+        _questions(CATEGORIES[3]),  # another category
+        "not json",
+    ],
+)
+def test_invalid_item_raises_and_leaves_the_previous_result_alone(stub_client, content):
+    previous = _previous(stub_client)
+    before = previous.output.model_dump()
+    stub_client.responses = [chat_completion(content)]
+
+    with pytest.raises(ValueError, match="no valid item"):
+        _regenerate(previous, CATEGORIES[2])
+
+    assert previous.output.model_dump() == before
+
+
+def test_unknown_category_is_rejected_before_any_request(stub_client):
+    previous = _previous(stub_client)
+
+    with pytest.raises(ValueError, match="Unknown category"):
+        _regenerate(previous, "Favourite colour")
+
+    assert not stub_client.requests
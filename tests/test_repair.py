@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.app.alignment.generate import parse_requirements_content
+from src.app.recruiter_prep.build_prompt import CATEGORIES
+from src.app.recruiter_prep.generate import generate_recruiter_prep
+from tests.conftest import PREP_INPUTS, chat_completion
+
+
+def _item(category: str, answer: str = "A.") -> dict[str, str]:
+    return {"category": category, "question": "Q?", "intent": "I.", "answer": answer, "follow_up": "F?"}
+
+
+def _questions(items: list[dict]) -> str:
+    return json.dumps({"questions": items})
+
+
+def _schema_categories(response_format: dict) -> list[str]:
+    schema = response_format["json_schema"]["schema"]
+    return schema["$defs"]["QAItem"]["properties"]["category"]["enum"]
+
+
+@pytest.fixture(name="broken_then_repaired")
+def _broken_then_repaired(stub_client):
+    """First answer: one category missing, one invalid. Second answer: just those two."""
+    missing, invalid = CATEGORIES[1], CATEGORIES[6]
+    first = [_item(c) for c in CATEGORIES if c != missing]
+    del first[5]["answer"]  # CATEGORIES[6] once CATEGORIES[1] is gone
+    stub_client.responses = [
+        chat_completion(_questions(first), prompt_tokens=1_000, completion_tokens=500),
+        chat_completion(_questions([_item(missing, "fixed"), _item(invalid, "fixed")]), completion_tokens=80),
+    ]
+    return stub_client, (missing, invalid)
+
+
+def test_only_missing_and_invalid_categories_are_re_requested(broken_then_repaired):
+    client, repaired = broken_then_repaired
+
+    generate_recruiter_prep(model="gpt-4o-mini", use_cache=False, **PREP_INPUTS)
+
+    assert len(client.requests) == 2
+    assert _schema_categories(client.requests[1]["response_format"]) == list(repaired)
+    repair_prompt = client.requests[1]["messages"][1]["content"]
+    assert all(json.dumps(c) in repair_prompt for c in repaired)
+    assert json.dumps(CATEGORIES[0]) not in repair_prompt.split("## Repair")[1]
+    # The system prompt (and its cached prefix) is unchanged.
+    assert client.requests[1]["messages"][0] == client.requests[0]["messages"][0]
+
+
+def test_repaired_items_are_merged_back_in_category_order(broken_then_repaired):
+    _, repaired = broken_then_repaired
+
+    result = generate_recruiter_prep(model="gpt-4o-mini", use_cache=False, **PREP_INPUTS)
+
+    assert [q.category for q in result.output.questions] == list(CATEGORIES)
+    assert [q.answer for q in result.output.questions if q.category in repaired] == ["fixed", "fixed"]
+    assert result.repaired == repaired
+    assert not result.missing
+    assert (result.cost.prompt_tokens, result.cost.completion_tokens) == (1_100, 580)
+
+
+def test_json_mode_model_gets_json_object_for_the_first_call_and_the_repair(broken_then_repaired):
+    client, _ = broken_then_repaired
+
+    result = generate_recruiter_prep(model="gpt-3.5-turbo", use_cache=False, **PREP_INPUTS)
+
+    assert [r["response_format"] for r in client.requests] == [{"type": "json_object"}] * 2
+    assert [q.category for q in result.output.questions] == list(CATEGORIES)
+
+
+def test_categories_still_missing_after_repair_are_reported(stub_client):
+    stub_client.responses = [
+        chat_completion(_questions([_item(c) for c in CATEGORIES[:-1]])),
+        chat_completion("not json"),
+    ]
+
+    result = generate_recruiter_prep(model="gpt-4o-mini", use_cache=False, **PREP_INPUTS)
+
+    assert result.missing == (CATEGORIES[-1],)
+    assert not result.repaired
+    assert len(result.output.questions) == len(CATEGORIES) - 1
+
+
+def test_requirements_salvage_keeps_complete_valid_items():
+    good = {"requirement": "Python", "keywords": ["python"]}
+    bad = {"requirement": "No keywords field"}
+    content = json.dumps({"requirements": [good, bad, good]})
+
+    assert parse_requirements_content(content) == [good, good]
+    assert parse_requirements_content(content[: content.rindex("{") + 10]) == [good]  # truncated
+    assert not parse_requirements_content("Sorry, I can't do that.")
+    assert not parse_requirements_content(None)
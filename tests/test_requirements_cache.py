@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.app.alignment.generate import clear_requirements_cache, extract_requirements_with_cost
+from tests.conftest import chat_completion
+
+JD = {"model": "gpt-4o-mini", "temperature": 0.2, "job_title": "ML Engineer", "job_desc": "Python, PyTorch"}
+REQUIREMENTS = {"requirements": [{"requirement": "Python", "keywords": ["python"]}]}
+
+
+@pytest.fixture(autouse=True)
+def _empty_requirements_cache():
+    clear_requirements_cache()
+    yield
+    clear_requirements_cache()
+
+
+def test_requirements_are_reused_across_resumes(stub_client):
+    stub_client.responses = [chat_completion(json.dumps(REQUIREMENTS))]
+
+    first = extract_requirements_with_cost(**JD)
+    second = extract_requirements_with_cost(**{**JD, "job_desc": "  python,   PYTORCH "})
+
+    assert len(stub_client.requests) == 1
+    assert first.requirements == second.requirements == REQUIREMENTS["requirements"]
+    assert second.cost.total_cost_usd == 0.0
+
+
+def test_empty_extraction_replayed_from_response_cache_is_retried(stub_client):
+    stub_client.responses = [chat_completion('{"requirements": []}'), chat_completion(json.dumps(REQUIREMENTS))]
+
+    assert not extract_requirements_with_cost(**JD).requirements
+    # Next run: the response cache still holds the empty answer, so the model is asked again.
+    retried = extract_requirements_with_cost(**JD)
+
+    assert len(stub_client.requests) == 2
+    assert retried.requirements == REQUIREMENTS["requirements"]
+    assert retried.cost.total_cost_usd > 0
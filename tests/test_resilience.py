@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+from openai import APIConnectionError, BadRequestError, InternalServerError, RateLimitError
+
+from src.helpers import openai_client, resilience
+from src.helpers.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgePolicy,
+    ResilienceConfig,
+    ResilientCaller,
+    RetryPolicy,
+)
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class Retryable(Exception):
+    def __init__(self, retry_after: Optional[float] = None) -> None:
+        super().__init__("retryable")
+        self.retry_after = retry_after
+
+
+def _classify(exc: BaseException) -> tuple[bool, Optional[float]]:
+    if isinstance(exc, Retryable):
+        return True, exc.retry_after
+    return False, None
+
+
+def _caller(**config) -> ResilientCaller:
+    return ResilientCaller(classify=_classify, read_usage=lambda resp: (0, 0), config=ResilienceConfig(**config))
+
+
+def _failing(calls: list[float], exc: Exception):
+    def send(timeout: float):
+        calls.append(timeout)
+        raise exc
+
+    return send
+
+
+def _status_error(cls, status: int, headers: Optional[dict[str, str]] = None, code: Optional[str] = None):
+    # Duck-typed: the exceptions only read status_code, headers and request off the response.
+    response = SimpleNamespace(status_code=status, headers=headers or {}, request=None)
+    return cls("error", response=response, body={"code": code} if code else None)
+
+
+@pytest.fixture(name="clock")
+def _clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture(name="sleeps")
+def _sleeps(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(resilience.time, "sleep", sleeps.append)
+    return sleeps
+
+
+# ---- circuit breaker ----
+def test_breaker_opens_on_the_failure_ratio_not_before_min_calls(clock):
+    breaker = CircuitBreaker(window=10, failure_ratio=0.5, min_calls=4, reset_seconds=30.0)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == "closed"  # 3/3 failed, but fewer than min_calls
+
+    breaker.record_success()
+    assert breaker.state == "closed"  # 3/4 recorded, tripped only on a failure
+
+    breaker.record_failure()
+    assert breaker.state == "open"  # 4/5 >= 0.5
+    with pytest.raises(CircuitOpenError, match="gpt-4o"):
+        breaker.before_call("gpt-4o")
+
+    clock.advance(29.0)
+    assert breaker.state == "open"
+
+
+def test_breaker_stays_closed_below_the_failure_ratio(clock):  # pylint: disable=unused-argument
+    breaker = CircuitBreaker(window=10, failure_ratio=0.5, min_calls=4, reset_seconds=30.0)
+    for _ in range(6):
+        breaker.record_success()
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == "closed"  # 4/10
+    breaker.before_call("gpt-4o")
+
+
+@pytest.fixture(name="open_breaker")
+def _open_breaker(clock):
+    breaker = CircuitBreaker(window=4, failure_ratio=0.75, min_calls=2, reset_seconds=30.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.advance(30.0)
+    assert breaker.state == "half-open"
+    return breaker
+
+
+def test_half_open_breaker_lets_a_single_probe_through(open_breaker):
+    open_breaker.before_call("gpt-4o")
+    with pytest.raises(CircuitOpenError):
+        open_breaker.before_call("gpt-4o")
+
+
+def test_successful_probe_closes_the_breaker_with_a_fresh_window(open_breaker):
+    open_breaker.before_call("gpt-4o")
+    open_breaker.record_success()
+    assert open_breaker.state == "closed"
+
+    open_breaker.record_failure()
+    assert open_breaker.state == "closed"  # 1/2; with the old failures kept it would be 3/4
+    open_breaker.before_call("gpt-4o")
+
+
+def test_failed_probe_reopens_the_breaker(open_breaker, clock):
+    open_breaker.before_call("gpt-4o")
+    open_breaker.record_failure()
+    assert open_breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        open_breaker.before_call("gpt-4o")
+
+    clock.advance(30.0)
+    open_breaker.before_call("gpt-4o")  # the wait restarted from the failed probe
+
+
+def test_caller_stops_sending_once_the_breaker_opens(clock, sleeps):  # pylint: disable=unused-argument
+    caller = _caller(
+        retry=RetryPolicy(max_attempts=5, base_delay=0.0), breaker_min_calls=3, breaker_failure_ratio=0.5
+    )
+    calls: list[float] = []
+
+    with pytest.raises(CircuitOpenError):
+        caller.call("gpt-4o", _failing(calls, Retryable()))
+
+    assert len(calls) == 3
+    assert caller.breaker_state("gpt-4o") == "open"
+    assert caller.breaker_state("gpt-4o-mini") == "closed"
+
+
+# ---- retries ----
+def test_retry_after_is_used_as_the_delay(sleeps):
+    caller = _caller(retry=RetryPolicy(max_attempts=3, max_retry_after=60.0))
+    outcomes = iter([Retryable(retry_after=7.0), Retryable(retry_after=0.25), "ok"])
+
+    def send(timeout: float):  # pylint: disable=unused-argument
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert caller.call("gpt-4o", send) == "ok"
+    assert sleeps == [7.0, 0.25]
+    assert caller.stats()["gpt-4o"].retries == 2
+
+
+def test_retry_after_above_the_cap_fails_the_call_without_waiting(sleeps):
+    caller = _caller(retry=RetryPolicy(max_attempts=4, max_retry_after=60.0))
+    calls: list[float] = []
+
+    with pytest.raises(Retryable):
+        caller.call("gpt-4o", _failing(calls, Retryable(retry_after=120.0)))
+
+    assert len(calls) == 1
+    assert not sleeps
+    assert caller.stats()["gpt-4o"].retries == 0
+
+
+def test_non_retryable_errors_are_raised_at_once_and_spare_the_breaker(sleeps):
+    caller = _caller(retry=RetryPolicy(max_attempts=4), breaker_min_calls=1)
+    calls: list[float] = []
+
+    with pytest.raises(ValueError):
+        caller.call("gpt-4o", _failing(calls, ValueError("bad request")))
+
+    assert len(calls) == 1
+    assert not sleeps
+    assert caller.breaker_state("gpt-4o") == "closed"
+
+
+# ---- hedging ----
+def _slow_then_fast(primary_seconds: float):
+    lock = threading.Lock()
+    calls: list[str] = []
+
+    def send(timeout: float):  # pylint: disable=unused-argument
+        with lock:
+            name = "primary" if not calls else "hedge"
+            calls.append(name)
+        if name == "primary":
+            time.sleep(primary_seconds)
+        return name
+
+    return send, calls
+
+
+def _wait_for_attempts(caller: ResilientCaller, n: int) -> None:
+    deadline = time.monotonic() + 5.0
+    while len(caller.recent_attempts()) < n and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_hedge_wins_the_race_against_a_slow_primary():
+    caller = _caller(hedge=HedgePolicy(enabled=True, min_delay=0.0, default_delay=0.05, min_samples=20))
+    send, calls = _slow_then_fast(primary_seconds=0.5)
+
+    assert caller.call("gpt-4o", send) == "hedge"
+    assert calls == ["primary", "hedge"]
+
+    _wait_for_attempts(caller, 2)
+    stats = caller.stats()["gpt-4o"]
+    assert (stats.attempts, stats.successes, stats.hedges, stats.hedge_wins) == (2, 1, 1, 1)
+    outcomes = {(m.hedge, m.outcome) for m in caller.recent_attempts()}
+    assert outcomes == {(True, "ok"), (False, "abandoned")}
+
+
+def test_fast_primary_is_not_hedged():
+    caller = _caller(hedge=HedgePolicy(enabled=True, min_delay=0.0, default_delay=1.0, min_samples=20))
+    send, calls = _slow_then_fast(primary_seconds=0.0)
+
+    assert caller.call("gpt-4o", send) == "primary"
+    assert calls == ["primary"]
+    stats = caller.stats()["gpt-4o"]
+    assert (stats.hedges, stats.hedge_wins) == (0, 0)
+
+
+def test_hedge_delay_follows_p95_once_enough_samples_exist():
+    caller = _caller(hedge=HedgePolicy(enabled=True, min_delay=0.5, default_delay=15.0, min_samples=3))
+    assert caller._hedge_delay("gpt-4o") == 15.0  # pylint: disable=protected-access
+    state = caller._state("gpt-4o")  # pylint: disable=protected-access
+    state.latencies.extend([0.1, 0.2, 0.3])
+    assert caller._hedge_delay("gpt-4o") == 0.5  # pylint: disable=protected-access
+    state.latencies.extend([4.0])
+    assert caller._hedge_delay("gpt-4o") == 4.0  # pylint: disable=protected-access
+
+
+# ---- OpenAI error classification ----
+def test_retry_after_seconds_parses_all_header_forms():
+    parse = openai_client._retry_after_seconds  # pylint: disable=protected-access
+    in_30s = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    an_hour_ago = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+
+    assert parse({"retry-after": "7"}) == 7.0
+    assert parse({"retry-after": "1.5"}) == 1.5
+    assert parse({"retry-after-ms": "250", "retry-after": "7"}) == 0.25
+    assert parse({"retry-after": in_30s}) == pytest.approx(30.0, abs=2.0)
+    assert parse({"retry-after": an_hour_ago}) == 0.0
+    assert parse({"retry-after": "soon"}) is None
+    assert parse({}) is None
+    assert parse(None) is None
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (_status_error(RateLimitError, 429, {"retry-after": "3"}), (True, 3.0)),
+        (_status_error(InternalServerError, 503), (True, None)),
+        (APIConnectionError(request=None), (True, None)),
+        (_status_error(RateLimitError, 429, {"retry-after": "3"}, code="insufficient_quota"), (False, None)),
+        (_status_error(BadRequestError, 400), (False, None)),
+        (ValueError("not an API error"), (False, None)),
+    ],
+)
+def test_classify_error(exc, expected):
+    assert openai_client._classify_error(exc) == expected  # pylint: disable=protected-access
+
+
+def test_insufficient_quota_is_not_retried(sleeps):
+    caller = ResilientCaller(
+        classify=openai_client._classify_error,  # pylint: disable=protected-access
+        read_usage=lambda resp: (0, 0),
+        config=ResilienceConfig(retry=RetryPolicy(max_attempts=4)),
+    )
+    calls: list[float] = []
+
+    with pytest.raises(RateLimitError):
+        caller.call("gpt-4o", _failing(calls, _status_error(RateLimitError, 429, code="insufficient_quota")))
+
+    assert len(calls) == 1
+    assert not sleeps
+    assert caller.stats()["gpt-4o"].retries == 0
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import pytest
+
+from src.app.pricing.calculate import estimate_cost
+from src.helpers import lru_cache, openai_client, response_cache
+from src.helpers.response_cache import (
+    CachedResponse,
+    MemoryResponseCache,
+    SqliteResponseCache,
+    TieredResponseCache,
+)
+from tests.conftest import chat_completion
+
+ARGS = ("gpt-4o-mini", "system", "user", 0.0)
+
+
+def _entry(tokens: int = 10) -> CachedResponse:
+    return CachedResponse(payload_json="{}", model="gpt-4o-mini", prompt_tokens=tokens, completion_tokens=1)
+
+
+def test_memory_tier_serves_repeat_requests(stub_client, llm_cache):
+    stub_client.responses = [chat_completion('{"a": 1}')]
+
+    first = openai_client.call_open_ai(*ARGS)
+    second = openai_client.call_open_ai(*ARGS)
+
+    assert len(stub_client.requests) == 1
+    assert not openai_client.is_cached_response(first)
+    assert openai_client.is_cached_response(second)
+    assert second.choices[0].message.content == '{"a": 1}'
+    assert llm_cache.stats.hits == 1
+    assert llm_cache.stats.saved_tokens == {"gpt-4o-mini": (100, 20)}
+
+
+def test_whitespace_only_prompt_changes_share_a_key(stub_client):
+    openai_client.call_open_ai("gpt-4o-mini", "system", "line one\nline two", 0.0)
+    openai_client.call_open_ai("gpt-4o-mini", "system  \r\n", "line one  \r\nline two\n", 0.0)
+
+    assert len(stub_client.requests) == 1
+
+
+def test_sqlite_tier_survives_a_new_memory_tier(stub_client, tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    openai_client.set_response_cache(
+        TieredResponseCache(memory=MemoryResponseCache(), persistent=SqliteResponseCache(path))
+    )
+    openai_client.call_open_ai(*ARGS)
+
+    # A new process: empty memory, same SQLite file.
+    restarted = TieredResponseCache(memory=MemoryResponseCache(), persistent=SqliteResponseCache(path))
+    openai_client.set_response_cache(restarted)
+    resp = openai_client.call_open_ai(*ARGS)
+
+    assert len(stub_client.requests) == 1
+    assert openai_client.is_cached_response(resp)
+    key = response_cache.request_cache_key(
+        model="gpt-4o-mini", system_prompt="system", user_prompt="user", temperature=0.0,
+        response_format={"type": "json_object"},
+    )
+    assert restarted.memory.get(key) is not None  # promoted to the memory tier
+
+
+def test_temperature_above_threshold_is_never_cached(stub_client, llm_cache):
+    hot = ("gpt-4o-mini", "system", "user", openai_client.LLM_CACHE_MAX_TEMPERATURE + 0.1)
+
+    openai_client.call_open_ai(*hot)
+    resp = openai_client.call_open_ai(*hot)
+
+    assert len(stub_client.requests) == 2
+    assert not openai_client.is_cached_response(resp)
+    assert llm_cache.stats.hits == llm_cache.stats.misses == 0
+
+
+def test_use_cache_false_bypasses_lookup_and_store(stub_client):
+    openai_client.call_open_ai(*ARGS, use_cache=False)
+    openai_client.call_open_ai(*ARGS)
+    openai_client.call_open_ai(*ARGS, use_cache=False)
+
+    assert len(stub_client.requests) == 3
+
+
+def test_memory_tier_ttl_and_size(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(lru_cache.time, "monotonic", lambda: now[0])
+    cache = MemoryResponseCache(max_entries=2, ttl_seconds=60)
+
+    cache.put("a", _entry())
+    cache.put("b", _entry())
+    cache.get("a")  # b is now least recently used
+    cache.put("c", _entry())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    now[0] += 61
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+
+def test_sqlite_tier_ttl_and_size(monkeypatch, tmp_path):
+    now = [1_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = SqliteResponseCache(str(tmp_path / "r.sqlite"), max_entries=2, ttl_seconds=60)
+
+    cache.put("a", _entry(1))
+    now[0] += 1
+    cache.put("b", _entry(2))
+    now[0] += 1
+    assert cache.get("a") == _entry(1)  # refreshes last_access
+    now[0] += 1
+    cache.put("c", _entry(3))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    now[0] += 61
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+
+def test_cached_cost_is_free_and_reports_savings():
+    billed = estimate_cost("gpt-4o-mini", 1_000, 500)
+    cached = estimate_cost("gpt-4o-mini", 1_000, 500, cached=True)
+
+    assert cached.total_cost_usd == 0.0
+    assert cached.saved_cost_usd == pytest.approx(billed.total_cost_usd)
+    assert (cached.prompt_tokens, cached.completion_tokens) == (1_000, 500)
+
+
+@pytest.mark.parametrize(
+    "resp",
+    [
+        chat_completion('{"a": ', finish_reason="length"),
+        chat_completion("", finish_reason="content_filter"),
+        chat_completion(None, refusal="I can't help with that."),
+    ],
+)
+def test_truncated_filtered_and_refused_answers_are_not_stored(stub_client, resp):
+    stub_client.responses = [resp, chat_completion('{"a": 1}')]
+
+    openai_client.call_open_ai(*ARGS)
+    retried = openai_client.call_open_ai(*ARGS)
+
+    assert len(stub_client.requests) == 2
+    assert retried.choices[0].message.content == '{"a": 1}'
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.resume_index import REQUIREMENTS, indexed_score, legacy_score, legacy_snippet
+from benchmarks.synthetic import synthetic_resume_text
+from src.app.alignment.generate import extract_evidence_snippet
+from src.app.alignment.resume_index import ResumeIndex
+
+EDGE_CASES = [
+    # keyword inside a longer token: \b-scored, but the snippet is a plain substring match
+    ("PostgreSQL migrations\nWrote SQL by hand", [{"requirement": "SQL", "keywords": ["sql"]}]),
+    # multi-word keyword split across two lines matches the full text but no single line
+    ("Reduced\nlatency by 40%", [{"requirement": "Perf", "keywords": ["reduced latency"]}]),
+    # whitespace and case differences between keyword, lines and full text
+    (
+        "  AWS\t and   GCP  \n\n\nOwned   Terraform modules",
+        [{"requirement": "Cloud", "keywords": ["aws  and gcp", "TERRAFORM"]}],
+    ),
+    # the later keyword appears on an earlier line
+    ("Kafka only\nPython and Kafka", [{"requirement": "Streams", "keywords": ["python", "kafka"]}]),
+    # long lines are clipped, an empty resume has no evidence
+    ("x" * 200 + " python", [{"requirement": "Python", "keywords": ["python"]}]),
+    ("", [{"requirement": "Python", "keywords": ["python"]}]),
+    ("No match here", [{"requirement": "Rust", "keywords": ["rust"]}, {"requirement": "", "keywords": ["x"]}]),
+]
+
+
+@pytest.mark.parametrize(("text", "requirements"), EDGE_CASES)
+def test_scores_and_snippets_match_the_per_line_scan(text, requirements):
+    assert indexed_score(requirements, text) == legacy_score(requirements, text)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_synthetic_resumes_match_the_per_line_scan(seed):
+    text = synthetic_resume_text(n_lines=300, seed=seed) + "\nGolang, Rust, GraphQL, Kafka and Snowflake/dbt."
+
+    assert indexed_score(REQUIREMENTS, text) == legacy_score(REQUIREMENTS, text)
+
+
+@pytest.mark.parametrize(
+    "hits",
+    [["sql"], ["Reduced Latency"], ["mysql", "python"], ["nothing", "ml"], ["-"], ["not present"], []],
+)
+def test_evidence_snippet_matches_the_per_line_scan(hits):
+    text = "Led ML infra\n\n  - Python,  MySQL\nReduced\tLATENCY 2x\nPostgreSQL"
+
+    assert extract_evidence_snippet(text, hits, index=ResumeIndex.build(text)) == legacy_snippet(text, hits)
+
+
+def test_first_line_containing_skips_matches_that_straddle_lines():
+    index = ResumeIndex.build("alpha beta\ngamma\nbeta gamma")
+
+    assert index.norm == "alpha beta gamma beta gamma"
+    assert index.first_line_containing(["beta gamma"]) == 2
+    assert index.first_line_containing(["gamma", "alpha"]) == 0
+    assert index.first_line_containing(["delta"]) is None
+    assert ResumeIndex.build("").first_line_containing(["alpha"]) is None
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+from src.app.recruiter_prep.stream_parse import QuestionsArrayParser
+
+TRICKY_ITEMS = [
+    {"category": "Role alignment", "question": 'Why "this" role?', "answer": "Braces {like} these and [brackets]"},
+    {"category": "Impact", "question": "Escapes: \\\" \\\\ \\n", "answer": "A } inside { a string ]["},
+    {"category": "Nested", "question": "Q", "answer": {"parts": [{"a": 1}, {"b": [2, 3]}]}},
+    {"category": "Unicode", "question": "Qué tal? ☃", "answer": "tab\tand newline\n"},
+]
+
+
+def _document(items: list[dict]) -> str:
+    # A decoy "questions" key inside another object must not be mistaken for the top-level array.
+    return json.dumps({"meta": {"questions": [{"decoy": True}]}, "questions": items, "note": "{ ]"})
+
+
+def _split(text: str, rng: random.Random) -> list[str]:
+    cuts = sorted(rng.sample(range(1, len(text)), k=min(len(text) - 1, rng.randint(1, 40))))
+    return [text[a:b] for a, b in zip([0, *cuts], [*cuts, len(text)])]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_chunk_splits_yield_every_item_once_in_order(seed):
+    text = _document(TRICKY_ITEMS)
+    parser = QuestionsArrayParser()
+
+    items = [item for chunk in _split(text, random.Random(seed)) for item in parser.feed(chunk)]
+
+    assert items == TRICKY_ITEMS
+    assert parser.text == text
+
+
+def test_single_character_chunks():
+    text = _document(TRICKY_ITEMS)
+    parser = QuestionsArrayParser()
+
+    assert [item for ch in text for item in parser.feed(ch)] == TRICKY_ITEMS
+
+
+def test_items_are_returned_as_soon_as_they_close():
+    parser = QuestionsArrayParser()
+    first = json.dumps(TRICKY_ITEMS[0])
+
+    assert not parser.feed('{"questions": [' + first[:-1])
+    assert parser.feed(first[-1] + ", {") == [TRICKY_ITEMS[0]]
+
+
+def test_truncated_stream_keeps_the_complete_items():
+    text = _document(TRICKY_ITEMS)
+    cut = text.index(json.dumps(TRICKY_ITEMS[-1])) + 10
+
+    assert QuestionsArrayParser().feed(text[:cut]) == TRICKY_ITEMS[:-1]
+
+
+def test_other_key():
+    parser = QuestionsArrayParser(key="requirements")
+
+    assert parser.feed('{"questions": [{"a": 1}], "requirements": [{"b": 2}]}') == [{"b": 2}]
+
+
+def test_unbalanced_close_raises():
+    with pytest.raises(ValueError):
+        QuestionsArrayParser().feed('{"questions": []}}')
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.app.recruiter_prep.build_prompt import CATEGORIES, recruiter_prep_response_format
+from src.app.recruiter_prep.generate import generate_recruiter_prep
+from src.app.settings import ALLOWED_MODELS, STRUCTURED_OUTPUT_MODELS
+from src.helpers import openai_client
+from tests.conftest import PREP_INPUTS, chat_completion
+
+
+def _output() -> str:
+    item = {"question": "Q?", "intent": "I.", "answer": "A.", "follow_up": "F?"}
+    return json.dumps({"questions": [{"category": c, **item} for c in CATEGORIES]})
+
+
+@pytest.mark.parametrize("model", ALLOWED_MODELS)
+def test_schema_is_only_sent_to_models_with_structured_outputs(stub_client, model):
+    openai_client.call_open_ai(model, "Reply in JSON.", "user", 0.0, response_format=recruiter_prep_response_format())
+
+    sent = stub_client.requests[0]["response_format"]
+    expected = "json_schema" if model in STRUCTURED_OUTPUT_MODELS else "json_object"
+    assert sent["type"] == expected
+
+
+def test_generation_works_in_json_mode(stub_client):
+    stub_client.responses = [chat_completion(_output(), model="gpt-3.5-turbo")]
+
+    result = generate_recruiter_prep(model="gpt-3.5-turbo", **PREP_INPUTS)
+
+    assert stub_client.requests[0]["response_format"] == {"type": "json_object"}
+    assert [q.category for q in result.output.questions] == list(CATEGORIES)
+    assert not result.missing